@@ -20,19 +20,19 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     # Add TV metadata columns to tv_content_mappings table
-    # Using batch mode for SQLite compatibility
-    with op.batch_alter_table('tv_content_mappings') as batch_op:
-        batch_op.add_column(sa.Column('category_id', sa.String(), nullable=True))
-        batch_op.add_column(sa.Column('width', sa.Integer(), nullable=True))
-        batch_op.add_column(sa.Column('height', sa.Integer(), nullable=True))
-        batch_op.add_column(sa.Column('matte_id', sa.String(), nullable=True))
-        batch_op.add_column(sa.Column('portrait_matte_id', sa.String(), nullable=True))
-        batch_op.add_column(sa.Column('image_date', sa.String(), nullable=True))
-        batch_op.add_column(sa.Column('content_type', sa.String(), nullable=True))
+    # SQLite supports ALTER TABLE ADD COLUMN natively, so no table rebuild is needed
+    op.add_column('tv_content_mappings', sa.Column('category_id', sa.String(), nullable=True))
+    op.add_column('tv_content_mappings', sa.Column('width', sa.Integer(), nullable=True))
+    op.add_column('tv_content_mappings', sa.Column('height', sa.Integer(), nullable=True))
+    op.add_column('tv_content_mappings', sa.Column('matte_id', sa.String(), nullable=True))
+    op.add_column('tv_content_mappings', sa.Column('portrait_matte_id', sa.String(), nullable=True))
+    op.add_column('tv_content_mappings', sa.Column('image_date', sa.String(), nullable=True))
+    op.add_column('tv_content_mappings', sa.Column('content_type', sa.String(), nullable=True))
 
 
 def downgrade() -> None:
     # Remove TV metadata columns from tv_content_mappings table
+    # DROP COLUMN still needs batch mode; all drops share a single table rebuild
     with op.batch_alter_table('tv_content_mappings') as batch_op:
         batch_op.drop_column('content_type')
         batch_op.drop_column('image_date')
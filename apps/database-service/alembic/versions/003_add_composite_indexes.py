@@ -0,0 +1,34 @@
+"""Add composite indexes for source image and image slot lookups
+
+Revision ID: 003_add_composite_indexes
+Revises: 002_add_metadata_snapshot
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_add_composite_indexes'
+down_revision: Union[str, None] = '002_add_metadata_snapshot'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Composite indexes for "not-deleted images by usage" and "slots of a gallery image"
+    op.create_index('ix_source_active_usage', 'source_images', ['is_deleted', 'usage_count'], if_not_exists=True)
+    op.create_index('ix_slot_gallery_num', 'image_slots', ['gallery_image_id', 'slot_number'], if_not_exists=True)
+
+    # The single-column indexes are prefixes of the composite ones and only add write cost
+    op.drop_index('ix_source_images_is_deleted', table_name='source_images', if_exists=True)
+    op.drop_index('ix_image_slots_gallery_image_id', table_name='image_slots', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index('ix_image_slots_gallery_image_id', 'image_slots', ['gallery_image_id'], if_not_exists=True)
+    op.create_index('ix_source_images_is_deleted', 'source_images', ['is_deleted'], if_not_exists=True)
+    op.drop_index('ix_slot_gallery_num', table_name='image_slots', if_exists=True)
+    op.drop_index('ix_source_active_usage', table_name='source_images', if_exists=True)
@@ -0,0 +1,58 @@
+"""Add database-side defaults for timestamp columns
+
+Revision ID: 004_add_timestamp_server_defaults
+Revises: 003_add_composite_indexes
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004_add_timestamp_server_defaults'
+down_revision: Union[str, None] = '003_add_composite_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Timestamp columns that are now filled in by the database instead of the models
+TIMESTAMP_COLUMNS = {
+    'source_images': ['created_at', 'updated_at'],
+    'gallery_images': ['created_at', 'updated_at'],
+    'image_slots': ['created_at', 'updated_at'],
+    'settings': ['updated_at'],
+    'tags': ['created_at'],
+    'tv_content_mappings': ['uploaded_at'],
+}
+
+
+# Same text format as SQLAlchemy's DATETIME storage (see database.SQLITE_NOW)
+SQLITE_NOW = sa.text("(strftime('%Y-%m-%d %H:%M:%f000', 'now'))")
+
+
+def upgrade() -> None:
+    # SQLite cannot change a column default in place, so each table is rebuilt once here
+    for table_name, columns in TIMESTAMP_COLUMNS.items():
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.DateTime(),
+                    existing_nullable=False,
+                    server_default=SQLITE_NOW,
+                )
+
+
+def downgrade() -> None:
+    for table_name, columns in TIMESTAMP_COLUMNS.items():
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.DateTime(),
+                    existing_nullable=False,
+                    server_default=None,
+                )
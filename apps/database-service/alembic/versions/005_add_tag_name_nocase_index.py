@@ -0,0 +1,27 @@
+"""Add case-insensitive index on tag names for prefix search
+
+Revision ID: 005_add_tag_name_nocase_index
+Revises: 004_add_timestamp_server_defaults
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005_add_tag_name_nocase_index'
+down_revision: Union[str, None] = '004_add_timestamp_server_defaults'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Autocomplete searches by NOCASE range on the name
+    op.create_index('ix_tag_name_nocase', 'tags', [sa.text('name COLLATE NOCASE')], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tag_name_nocase', table_name='tags', if_exists=True)
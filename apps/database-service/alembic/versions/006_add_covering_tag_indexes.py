@@ -0,0 +1,40 @@
+"""Add covering indexes for tag lookups and date-ordered source listings
+
+Revision ID: 006_add_covering_tag_indexes
+Revises: 005_add_tag_name_nocase_index
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006_add_covering_tag_indexes'
+down_revision: Union[str, None] = '005_add_tag_name_nocase_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (tag_id, image_id) answers "images with tag X" from the index alone
+    op.create_index('ix_gallery_tag_image', 'gallery_image_tags', ['tag_id', 'gallery_image_id'], if_not_exists=True)
+    op.create_index('ix_source_tag_image', 'source_image_tags', ['tag_id', 'source_image_id'], if_not_exists=True)
+    op.create_index('ix_source_active_date', 'source_images', ['is_deleted', 'date_taken'], if_not_exists=True)
+
+    # Single-column indexes are prefixes of the new index or of the unique constraints
+    op.drop_index('ix_gallery_image_tags_tag_id', table_name='gallery_image_tags', if_exists=True)
+    op.drop_index('ix_gallery_image_tags_gallery_image_id', table_name='gallery_image_tags', if_exists=True)
+    op.drop_index('ix_source_image_tags_tag_id', table_name='source_image_tags', if_exists=True)
+    op.drop_index('ix_source_image_tags_source_image_id', table_name='source_image_tags', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index('ix_source_image_tags_source_image_id', 'source_image_tags', ['source_image_id'], if_not_exists=True)
+    op.create_index('ix_source_image_tags_tag_id', 'source_image_tags', ['tag_id'], if_not_exists=True)
+    op.create_index('ix_gallery_image_tags_gallery_image_id', 'gallery_image_tags', ['gallery_image_id'], if_not_exists=True)
+    op.create_index('ix_gallery_image_tags_tag_id', 'gallery_image_tags', ['tag_id'], if_not_exists=True)
+    op.drop_index('ix_source_active_date', table_name='source_images', if_exists=True)
+    op.drop_index('ix_source_tag_image', table_name='source_image_tags', if_exists=True)
+    op.drop_index('ix_gallery_tag_image', table_name='gallery_image_tags', if_exists=True)
@@ -0,0 +1,33 @@
+"""Add partial index on app-managed TV content mappings
+
+Revision ID: 007_add_tv_content_app_managed_index
+Revises: 006_add_covering_tag_indexes
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007_add_tv_content_app_managed_index'
+down_revision: Union[str, None] = '006_add_covering_tag_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Only rows linked to a gallery image are indexed
+    op.create_index(
+        'ix_tv_content_app_managed',
+        'tv_content_mappings',
+        ['id'],
+        sqlite_where=sa.text('gallery_image_id IS NOT NULL'),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tv_content_app_managed', table_name='tv_content_mappings', if_exists=True)
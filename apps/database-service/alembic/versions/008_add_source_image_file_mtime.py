@@ -0,0 +1,32 @@
+"""Add file_mtime to source_images
+
+Revision ID: 008_add_source_image_file_mtime
+Revises: 007_add_tv_content_app_managed_index
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008_add_source_image_file_mtime'
+down_revision: Union[str, None] = '007_add_tv_content_app_managed_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Skipped when the table was created from the current models (create_all runs
+    # before the migrations on startup)
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('source_images')}
+    if 'file_mtime' not in columns:
+        # NULL for existing rows, so the next scan reads their EXIF once more
+        op.add_column('source_images', sa.Column('file_mtime', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('source_images') as batch_op:
+        batch_op.drop_column('file_mtime')
@@ -0,0 +1,32 @@
+"""Add composite indexes for source image sort options and album filter
+
+Revision ID: 009_add_source_sort_indexes
+Revises: 008_add_source_image_file_mtime
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009_add_source_sort_indexes'
+down_revision: Union[str, None] = '008_add_source_image_file_mtime'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # "Not deleted, ordered by filename/created_at" read in index order, and the
+    # album filter as a filepath range within the active rows
+    op.create_index('ix_source_active_filename', 'source_images', ['is_deleted', 'filename'], if_not_exists=True)
+    op.create_index('ix_source_active_created', 'source_images', ['is_deleted', 'created_at'], if_not_exists=True)
+    op.create_index('ix_source_active_filepath', 'source_images', ['is_deleted', 'filepath'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_source_active_filepath', table_name='source_images', if_exists=True)
+    op.drop_index('ix_source_active_created', table_name='source_images', if_exists=True)
+    op.drop_index('ix_source_active_filename', table_name='source_images', if_exists=True)
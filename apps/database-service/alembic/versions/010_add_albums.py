@@ -0,0 +1,66 @@
+"""Add albums table and source_images.album_id
+
+Revision ID: 010_add_albums
+Revises: 009_add_source_sort_indexes
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010_add_albums'
+down_revision: Union[str, None] = '009_add_source_sort_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Filepaths of the form "albums/<name>/...", and the <name> part of them
+IN_ALBUM_SQL = "substr(filepath, 1, 7) = 'albums/' AND instr(substr(filepath, 8), '/') > 1"
+ALBUM_NAME_SQL = "substr(filepath, 8, instr(substr(filepath, 8), '/') - 1)"
+
+
+def upgrade() -> None:
+    # The service runs create_all before migrating, which creates the new albums
+    # table (and its index) on an existing database, but not the new column
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('albums'):
+        op.create_table(
+            'albums',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    op.create_index('ix_albums_name', 'albums', ['name'], unique=True, if_not_exists=True)
+
+    if 'album_id' not in {column['name'] for column in inspector.get_columns('source_images')}:
+        # SQLite cannot add a foreign key with ALTER TABLE, so the table is rebuilt
+        with op.batch_alter_table('source_images') as batch_op:
+            batch_op.add_column(sa.Column('album_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_source_images_album_id', 'albums', ['album_id'], ['id'])
+
+    # Backfill from the existing filepaths
+    op.execute(
+        f"INSERT OR IGNORE INTO albums (name) SELECT DISTINCT {ALBUM_NAME_SQL} "
+        f"FROM source_images WHERE {IN_ALBUM_SQL}"
+    )
+    op.execute(
+        f"UPDATE source_images SET album_id = "
+        f"(SELECT id FROM albums WHERE albums.name = {ALBUM_NAME_SQL}) "
+        f"WHERE {IN_ALBUM_SQL}"
+    )
+
+    # The album filter is now an equality seek, so the filepath range index is unused
+    op.create_index('ix_source_album_date', 'source_images', ['album_id', 'is_deleted', 'date_taken'], if_not_exists=True)
+    op.drop_index('ix_source_active_filepath', table_name='source_images', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index('ix_source_active_filepath', 'source_images', ['is_deleted', 'filepath'], if_not_exists=True)
+    op.drop_index('ix_source_album_date', table_name='source_images', if_exists=True)
+    with op.batch_alter_table('source_images') as batch_op:
+        batch_op.drop_column('album_id')
+    op.drop_index('ix_albums_name', table_name='albums')
+    op.drop_table('albums')
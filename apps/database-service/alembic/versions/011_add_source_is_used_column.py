@@ -0,0 +1,37 @@
+"""Add generated is_used column to source_images
+
+Revision ID: 011_add_source_is_used_column
+Revises: 010_add_albums
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '011_add_source_is_used_column'
+down_revision: Union[str, None] = '010_add_albums'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Skipped when the table was created from the current models (create_all runs
+    # before the migrations on startup)
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('source_images')}
+    if 'is_used' not in columns:
+        # SQLite can only add VIRTUAL generated columns with ALTER TABLE; the index
+        # stores the computed value, so filtering on it never evaluates the expression
+        op.add_column('source_images', sa.Column('is_used', sa.Boolean(), sa.Computed('usage_count > 0')))
+    op.create_index('ix_source_active_used_date', 'source_images', ['is_deleted', 'is_used', 'date_taken'], if_not_exists=True)
+    op.drop_index('ix_source_active_usage', table_name='source_images', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index('ix_source_active_usage', 'source_images', ['is_deleted', 'usage_count'], if_not_exists=True)
+    op.drop_index('ix_source_active_used_date', table_name='source_images', if_exists=True)
+    with op.batch_alter_table('source_images') as batch_op:
+        batch_op.drop_column('is_used')
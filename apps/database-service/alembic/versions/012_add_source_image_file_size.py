@@ -0,0 +1,33 @@
+"""Add file_size to source_images
+
+Revision ID: 012_add_source_image_file_size
+Revises: 011_add_source_is_used_column
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '012_add_source_image_file_size'
+down_revision: Union[str, None] = '011_add_source_is_used_column'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Skipped when the table was created from the current models (create_all runs
+    # before the migrations on startup)
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('source_images')}
+    if 'file_size' not in columns:
+        # NULL for existing rows, so the next scan reads their EXIF once more
+        op.add_column('source_images', sa.Column('file_size', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    # A batch (copy-table) rebuild cannot copy the generated is_used column, so
+    # this relies on SQLite's native DROP COLUMN (3.35+)
+    op.drop_column('source_images', 'file_size')
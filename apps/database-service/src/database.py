@@ -4,17 +4,17 @@ Database connection and session management.
 
 import os
 from pathlib import Path
+import orjson
+from sqlalchemy import event, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import now
+from sqlalchemy.pool import QueuePool, StaticPool
 from sqlmodel import create_engine, SQLModel, Session
-from typing import Generator
-
-# Import all models to register them with SQLModel
-from models import (  # noqa: F401
-    SourceImage,
-    GalleryImage,
-    ImageSlot,
-    TVContentMapping,
-    Settings,
-)
+from typing import Generator, Optional
+
+# Import the models package once; models/__init__.py is the single list of tables
+# registered with SQLModel.metadata
+import models  # noqa: F401
 
 # Get database URL from environment or use default
 DATABASE_URL = os.getenv(
@@ -36,8 +36,114 @@ if DATABASE_URL.startswith("sqlite:///"):
         db_path.parent.mkdir(parents=True, exist_ok=True)
         DATABASE_URL = f"sqlite:///{db_path}"
 
+# Connection pool: an in-memory database only exists on a single connection, so it
+# must be shared; file databases keep a sized pool so each request reuses an open
+# connection (and its PRAGMAs) instead of reconnecting. Endpoints run on FastAPI's
+# threadpool (40 threads by default), so the pool is sized near that concurrency:
+# checkouts past pool_size + max_overflow wait for a connection, and overflow
+# connections are closed on return and reopened with their PRAGMAs next time.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+if DATABASE_URL.startswith("sqlite") and ":memory:" in DATABASE_URL:
+    pool_kwargs = {"poolclass": StaticPool}
+else:
+    pool_kwargs = {
+        "poolclass": QueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_recycle": 3600,
+    }
+    if not DATABASE_URL.startswith("sqlite"):
+        # A local SQLite file connection cannot go stale, so only network
+        # databases pay for a ping on every checkout
+        pool_kwargs["pool_pre_ping"] = True
+
+
+def _json_serializer(value) -> str:
+    """Serialize JSON column values with orjson (SQLite stores JSON as text)."""
+    return orjson.dumps(value).decode()
+
+
+# SQLite's CURRENT_TIMESTAMP has no fractional seconds, while SQLAlchemy stores DATETIME
+# as 'YYYY-MM-DD HH:MM:SS.ffffff'. Render now() in the same format so timestamps filled
+# in by the database and by Python compare and sort consistently as text.
+SQLITE_NOW = "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+@compiles(now, "sqlite")
+def _compile_sqlite_now(element, compiler, **kw) -> str:
+    """Compile func.now() (defaults, onupdate, UPSERT sets) to SQLITE_NOW."""
+    return SQLITE_NOW
+
+
 # Create engine
-engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    connect_args={"check_same_thread": False},
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    **pool_kwargs,
+)
+
+# PRAGMAs applied to every new SQLite connection. WAL lets readers proceed while a
+# writer commits, and synchronous=NORMAL is durable in WAL mode while avoiding an
+# fsync on every commit.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MiB page cache (negative value is KiB)
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA wal_autocheckpoint=1000",  # pages
+)
+
+# Size of the -wal file above which the periodic checkpoint truncates it. Readers
+# that are active during autocheckpoints can stop the WAL from being reset, so a
+# long-running service also checkpoints explicitly.
+WAL_CHECKPOINT_THRESHOLD_BYTES = 64 * 1024 * 1024
+
+
+if DATABASE_URL.startswith("sqlite"):
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        """Apply SQLite PRAGMAs when a new DBAPI connection is opened."""
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def get_wal_path() -> Optional[Path]:
+    """Return the path of the SQLite -wal file, or None for non-file databases."""
+    if not DATABASE_URL.startswith("sqlite"):
+        return None
+    database = engine.url.database
+    if not database or database == ":memory:":
+        return None
+    return Path(f"{database}-wal")
+
+
+def checkpoint_wal_if_large(threshold_bytes: int = WAL_CHECKPOINT_THRESHOLD_BYTES) -> bool:
+    """Run wal_checkpoint(TRUNCATE) when the -wal file exceeds threshold_bytes.
+
+    Returns True if a checkpoint was run.
+    """
+    wal_path = get_wal_path()
+    if wal_path is None:
+        return False
+    try:
+        wal_size = os.path.getsize(wal_path)
+    except OSError:
+        return False
+    if wal_size <= threshold_bytes:
+        return False
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    return True
 
 
 def create_db_and_tables():
@@ -46,7 +152,18 @@ def create_db_and_tables():
 
 
 def get_session() -> Generator[Session, None, None]:
-    """Get database session."""
+    """Get database session.
+
+    Each request runs in one transaction: repositories only flush, and the session is
+    committed once after the endpoint returns, or rolled back if it raised. Declare it
+    as Depends(get_session, scope="function") so the commit happens before the
+    response is sent; a failed commit then fails the request.
+    """
     with Session(engine) as session:
-        yield session
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
 
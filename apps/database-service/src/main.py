@@ -3,14 +3,17 @@ FastAPI database service for FrameTV.
 Provides REST API for data persistence using SQLModel and SQLite.
 """
 
+import asyncio
 import os
 import logging
-from fastapi import FastAPI
+import time
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from sqlalchemy import text
+from sqlmodel import Session
 
-from database import create_db_and_tables, engine
-from models import Base
+from database import checkpoint_wal_if_large, create_db_and_tables, engine, get_wal_path
 from routers import (
     source_images_router,
     gallery_images_router,
@@ -18,11 +21,8 @@ from routers import (
     settings_router,
     tags_router,
 )
-from routers.scanner import router as scanner_router
-from scanner import scan_albums_directory
+from routers.scanner import router as scanner_router, run_scan_now
 from repositories import SourceImageRepository
-from pathlib import Path
-import os
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -31,80 +31,135 @@ logger = logging.getLogger(__name__)
 # Get port from environment variable or use default
 PORT = int(os.getenv("DATABASE_SERVICE_PORT", "8001"))
 
+# How to run Alembic migrations on startup: "sync" (default) runs them before
+# serving requests, "async" runs them in a background thread, "skip" disables them
+MIGRATION_MODE = os.getenv("MIGRATION_MODE", "sync").lower()
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Lifespan context manager for startup/shutdown."""
-    # Startup
-    logger.info("Creating database tables...")
-    create_db_and_tables()
-    logger.info("Database tables created")
-    
-    # Run migrations
+# Seconds between checks of the SQLite WAL size (see database.checkpoint_wal_if_large)
+WAL_CHECKPOINT_INTERVAL = float(os.getenv("WAL_CHECKPOINT_INTERVAL", "60"))
+
+# Seconds a successful database health check is reused before probing again
+HEALTH_CHECK_TTL = float(os.getenv("HEALTH_CHECK_TTL", "5"))
+
+# time.monotonic() of the last successful database probe
+_last_healthy_at: float | None = None
+
+
+def run_migrations() -> str:
+    """Run Alembic migrations up to head. Returns the resulting migration status."""
     try:
         from alembic.config import Config
         from alembic import command
-        
+
         alembic_cfg = Config("alembic.ini")
         command.upgrade(alembic_cfg, "head")
         logger.info("Database migrations completed")
+        return "completed"
     except Exception as e:
         logger.warning(f"Migration check failed (this is OK on first run): {e}")
-    
-    # Run startup album scan
-    try:
-        from database import get_session
-        
-        data_path = Path(os.getenv("DATA_PATH", "../../data")).resolve()
-        albums_path = data_path / "albums"
-        
-        # Ensure absolute paths
-        script_dir = Path(__file__).parent.parent.absolute()
-        if not data_path.is_absolute():
-            data_path = script_dir.parent.parent / data_path
-        if not albums_path.is_absolute():
-            albums_path = script_dir.parent.parent / albums_path
-        
-        # Get session and run scan
-        session_gen = get_session()
-        session = next(session_gen)
-        try:
-            result = scan_albums_directory(albums_path, data_path, session)
-            logger.info(
-                f"Startup album scan: {result['scanned']} scanned, "
-                f"{result['added']} added, {result['updated']} updated"
-            )
-        finally:
-            session.close()
-    except Exception as e:
-        logger.warning(f"Startup album scan failed: {e}")
-    
+        return "failed"
+
+
+def run_startup_maintenance() -> None:
+    """Scan the albums directory and reconcile usage counts (needs the migrated schema)."""
+    # Run startup album scan. It is tracked like POST /source-images/scan, so a
+    # scan requested meanwhile (e.g. once async migrations have finished) reports
+    # this one instead of inserting the same new files a second time.
+    status = run_scan_now()
+    if status is None:
+        logger.info("Startup album scan skipped: another scan is already running")
+    elif status.state == "failed":
+        logger.warning(f"Startup album scan failed: {status.error}")
+    else:
+        logger.info(
+            f"Startup album scan: {status.scanned} scanned, "
+            f"{status.added} added, {status.updated} updated"
+        )
+
     # Run usage count reconciliation on startup
     try:
-        from database import get_session
-        
-        session_gen = get_session()
-        session = next(session_gen)
-        try:
+        with Session(engine) as session:
             repo = SourceImageRepository(session)
             result = repo.recalculate_all_usage_counts()
+            session.commit()
             logger.info(
                 f"Usage count reconciliation: {result['total_images']} images, "
                 f"{result['updated_count']} updated, "
                 f"{result['negative_counts_corrected']} negative counts corrected"
             )
-        finally:
-            session.close()
     except Exception as e:
         logger.warning(f"Usage count reconciliation failed: {e}")
+
+
+async def _run_migrations_in_background(app: FastAPI) -> None:
+    """
+    Run migrations off the event loop and release requests waiting on them, then
+    run the startup scan and usage reconciliation against the migrated schema.
+    """
+    app.state.migration_status = "running"
+    app.state.migration_status = await asyncio.to_thread(run_migrations)
+    app.state.migrations_ready.set()
+    await asyncio.to_thread(run_startup_maintenance)
+
+
+async def _checkpoint_wal_periodically() -> None:
+    """Keep the SQLite WAL file bounded while the service runs."""
+    while True:
+        await asyncio.sleep(WAL_CHECKPOINT_INTERVAL)
+        try:
+            if await asyncio.to_thread(checkpoint_wal_if_large):
+                logger.info("Checkpointed and truncated SQLite WAL")
+        except Exception as e:
+            logger.warning(f"WAL checkpoint failed: {e}")
+
+
+async def wait_for_migrations(request: Request) -> None:
+    """Dependency that holds data requests until startup migrations have finished."""
+    await request.app.state.migrations_ready.wait()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Lifespan context manager for startup/shutdown."""
+    # Startup
+    logger.info("Creating database tables...")
+    create_db_and_tables()
+    logger.info("Database tables created")
+    
+    # Run migrations
+    app.state.migrations_ready = asyncio.Event()
+    migration_task = None
+    if MIGRATION_MODE == "async":
+        app.state.migration_status = "pending"
+        migration_task = asyncio.create_task(_run_migrations_in_background(app))
+    elif MIGRATION_MODE == "skip":
+        app.state.migration_status = "skipped"
+        app.state.migrations_ready.set()
+    else:
+        app.state.migration_status = run_migrations()
+        app.state.migrations_ready.set()
+    
+    if MIGRATION_MODE != "async":
+        run_startup_maintenance()
+    
+    checkpoint_task = None
+    if get_wal_path() is not None:
+        checkpoint_task = asyncio.create_task(_checkpoint_wal_periodically())
     
     yield
     
     # Shutdown
+    if checkpoint_task is not None:
+        checkpoint_task.cancel()
+    if migration_task is not None and not migration_task.done():
+        logger.info("Waiting for background migrations to finish")
+        await migration_task
     logger.info("Shutting down database service")
 
 
-# Create FastAPI app
+# Create FastAPI app. No default_response_class is set: every router endpoint declares a
+# response_model, so FastAPI serializes responses straight to JSON bytes in pydantic-core.
+# A custom class such as ORJSONResponse would opt out of that path.
 app = FastAPI(
     title="FrameTV Database Service",
     version="1.0.0",
@@ -126,13 +181,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routers
-app.include_router(source_images_router)
-app.include_router(scanner_router)  # Scanner endpoints (POST /source-images/scan)
-app.include_router(gallery_images_router)
-app.include_router(tv_content_router)
-app.include_router(settings_router)
-app.include_router(tags_router)
+# Include routers (data endpoints wait for startup migrations to finish)
+migration_gate = [Depends(wait_for_migrations)]
+app.include_router(source_images_router, dependencies=migration_gate)
+app.include_router(scanner_router, dependencies=migration_gate)  # Scanner endpoints (POST /source-images/scan)
+app.include_router(gallery_images_router, dependencies=migration_gate)
+app.include_router(tv_content_router, dependencies=migration_gate)
+app.include_router(settings_router, dependencies=migration_gate)
+app.include_router(tags_router, dependencies=migration_gate)
 
 
 @app.get("/")
@@ -142,16 +198,27 @@ async def root():
 
 
 @app.get("/health")
-async def health():
+async def health(request: Request):
     """Health check endpoint."""
+    global _last_healthy_at
+    migration_status = getattr(request.app.state, "migration_status", "pending")
     try:
-        # Test database connection
-        with engine.connect() as conn:
-            conn.execute("SELECT 1")
-        return {"status": "healthy", "database": "connected"}
+        # Test database connection, unless it succeeded within the last HEALTH_CHECK_TTL seconds
+        now = time.monotonic()
+        if _last_healthy_at is None or now - _last_healthy_at >= HEALTH_CHECK_TTL:
+            _last_healthy_at = None
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            _last_healthy_at = now
+        return {"status": "healthy", "database": "connected", "migration_status": migration_status}
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return {"status": "unhealthy", "database": "disconnected", "detail": str(e)}
+        return {
+            "status": "unhealthy",
+            "database": "disconnected",
+            "migration_status": migration_status,
+            "detail": str(e),
+        }
 
 
 @app.get("/openapi.json")
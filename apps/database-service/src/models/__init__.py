@@ -2,21 +2,23 @@
 Database models for FrameTV database service.
 """
 
+from importlib import import_module
+
 from .base import Base
+from .album import Album
 from .source_image import SourceImage
 from .gallery_image import GalleryImage
 from .image_slot import ImageSlot
 from .slot_transform import SlotTransform
 from .tv_content_mapping import TVContentMapping
 from .settings import Settings
-from .exif_metadata import EXIFMetadata
-from .metadata_snapshot import MetadataSnapshot
 from .tag import Tag
 from .gallery_image_tag import GalleryImageTag
 from .source_image_tag import SourceImageTag
 
 __all__ = [
     "Base",
+    "Album",
     "SourceImage",
     "GalleryImage",
     "ImageSlot",
@@ -29,3 +31,19 @@ __all__ = [
     "GalleryImageTag",
     "SourceImageTag",
 ]
+
+# Plain pydantic models that are not tables are imported on first access (PEP 562),
+# so importing the package only builds what create_all needs.
+_LAZY_IMPORTS = {
+    "EXIFMetadata": ".exif_metadata",
+    "MetadataSnapshot": ".metadata_snapshot",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,15 @@
+"""
+Album model for the top-level folders under the albums directory.
+"""
+
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+
+class Album(SQLModel, table=True):
+    """Model for an album (a directory directly under albums/)."""
+
+    __tablename__ = "albums"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(unique=True, index=True)
@@ -3,12 +3,18 @@ Pydantic model for EXIF metadata.
 Type-safe model for EXIF data extracted from images.
 """
 
-from pydantic import BaseModel
+from typing import Any, Dict
+
+from pydantic import BaseModel, ConfigDict
 
 
 class EXIFMetadata(BaseModel):
     """Type-safe Pydantic model for EXIF metadata. All fields optional."""
 
+    # Unknown keys (e.g. from older stored blobs) are dropped, which keeps
+    # model_construct safe for data read back from the database.
+    model_config = ConfigDict(extra="ignore")
+
     # Camera/Device Information
     make: str | None = None
     model: str | None = None
@@ -68,3 +74,31 @@ class EXIFMetadata(BaseModel):
     copyright: str | None = None
     user_comment: str | None = None
 
+    def to_stored_dict(self) -> Dict[str, Any]:
+        """Dump for persistence: None fields dropped, floats rounded per EXIF_FLOAT_PRECISION."""
+        # Every field holds a plain str/int/float, so reading __dict__ gives what
+        # model_dump(exclude_none=True) would without the serializer pass
+        data = {field: value for field, value in self.__dict__.items() if value is not None}
+        for field, digits in EXIF_FLOAT_PRECISION.items():
+            value = data.get(field)
+            if value is not None:
+                data[field] = round(value, digits)
+        return data
+
+
+# Decimal places kept for float fields when persisting EXIF metadata. Rational
+# EXIF values otherwise serialize as 17-digit floats. exposure_time is left out
+# because short exposures (e.g. 1/8000 s) need their full precision.
+EXIF_FLOAT_PRECISION = {
+    "f_number": 2,
+    "exposure_bias": 2,
+    "focal_length": 2,
+    "max_aperture": 4,
+    "subject_distance": 3,
+    "x_resolution": 2,
+    "y_resolution": 2,
+    "gps_latitude": 7,  # ~1 cm
+    "gps_longitude": 7,
+    "gps_altitude": 2,
+    "gps_img_direction": 2,
+}
@@ -3,20 +3,31 @@ GalleryImage model for tracking saved gallery compositions.
 """
 
 from datetime import datetime
-from typing import Optional
-from sqlmodel import Field, SQLModel
+from typing import List, Optional, TYPE_CHECKING
+from sqlmodel import Field, Relationship, SQLModel, func
+
+if TYPE_CHECKING:
+    from .image_slot import ImageSlot
 
 
 class GalleryImage(SQLModel, table=True):
     """Model for gallery images (saved compositions)."""
 
     __tablename__ = "gallery_images"
+    # Fetch server-filled timestamps with RETURNING instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Optional[int] = Field(default=None, primary_key=True)
     filename: str = Field(index=True)
     filepath: str = Field(index=True)  # Relative to data directory
     template_id: str  # Reference to template/layout identifier
     notes: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()})
 
+    # Slots are deleted explicitly before their gallery image, so SQLAlchemy does not
+    # need to load the collection on delete (passive_deletes).
+    slots: List["ImageSlot"] = Relationship(
+        back_populates="gallery_image",
+        sa_relationship_kwargs={"passive_deletes": True, "order_by": "ImageSlot.slot_number"},
+    )
@@ -3,7 +3,7 @@ GalleryImageTag junction model for many-to-many relationship between GalleryImag
 """
 
 from typing import Optional
-from sqlmodel import Field, SQLModel, UniqueConstraint
+from sqlmodel import Field, SQLModel, Index, UniqueConstraint
 
 
 class GalleryImageTag(SQLModel, table=True):
@@ -11,10 +11,13 @@ class GalleryImageTag(SQLModel, table=True):
 
     __tablename__ = "gallery_image_tags"
     __table_args__ = (
+        # Also serves lookups by gallery_image_id alone (leading column)
         UniqueConstraint("gallery_image_id", "tag_id", name="unique_gallery_image_tag"),
+        # Covers "images with tag X" without touching the table rows
+        Index("ix_gallery_tag_image", "tag_id", "gallery_image_id"),
     )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    gallery_image_id: int = Field(foreign_key="gallery_images.id", index=True)
-    tag_id: int = Field(foreign_key="tags.id", index=True)
+    gallery_image_id: int = Field(foreign_key="gallery_images.id")
+    tag_id: int = Field(foreign_key="tags.id")
 
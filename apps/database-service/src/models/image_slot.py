@@ -2,50 +2,76 @@
 ImageSlot model for tracking slots within gallery images.
 """
 
+from dataclasses import asdict
 from datetime import datetime
-from typing import Optional, Dict, Any
-from sqlmodel import Field, SQLModel, Column, JSON
+from typing import Optional, Dict, Any, TYPE_CHECKING
+from sqlmodel import Field, Relationship, SQLModel, Column, Index, func
 from sqlalchemy import JSON as SA_JSON
 
-from .slot_transform import SlotTransform
-from .metadata_snapshot import MetadataSnapshot
+from .slot_transform import SlotTransform, slot_transform_adapter
+
+if TYPE_CHECKING:
+    # Imported on first use (see models/__init__.py)
+    from .metadata_snapshot import MetadataSnapshot
+    from .gallery_image import GalleryImage
+    from .source_image import SourceImage
 
 
 class ImageSlot(SQLModel, table=True):
     """Model for image slots within gallery compositions."""
 
     __tablename__ = "image_slots"
+    __table_args__ = (
+        # Slots for a gallery image in slot order
+        Index("ix_slot_gallery_num", "gallery_image_id", "slot_number"),
+    )
+    # Fetch server-filled timestamps with INSERT ... RETURNING instead of a refresh per row
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    gallery_image_id: int = Field(foreign_key="gallery_images.id", index=True)
+    gallery_image_id: int = Field(foreign_key="gallery_images.id")
     slot_number: int  # Slot position (0, 1, 2, etc.)
     source_image_id: Optional[int] = Field(default=None, foreign_key="source_images.id", index=True)
     transform_data: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(SA_JSON))
     metadata_snapshot: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(SA_JSON))
 
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()})
+
+    # Lazy by default; queries that walk slots -> source images opt into selectinload
+    gallery_image: Optional["GalleryImage"] = Relationship(back_populates="slots")
+    source_image: Optional["SourceImage"] = Relationship()
 
     def get_transform(self) -> Optional[SlotTransform]:
-        """Get transform_data as SlotTransform object."""
+        """Get transform_data as SlotTransform object (parsed once per stored value)."""
         if self.transform_data is None:
             return None
-        return SlotTransform(**self.transform_data)
+        cached = self.__dict__.get("_transform_cache")
+        if cached is not None and cached[0] is self.transform_data:
+            return cached[1]
+        # transform_data can be stored straight from API requests, so it is validated
+        transform = slot_transform_adapter.validate_python(self.transform_data)
+        self.__dict__["_transform_cache"] = (self.transform_data, transform)
+        return transform
 
     def set_transform(self, transform: Optional[SlotTransform]) -> None:
         """Set transform_data from SlotTransform object."""
         if transform is None:
             self.transform_data = None
         else:
-            self.transform_data = transform.model_dump()
+            self.transform_data = asdict(transform)
+            # SlotTransform is immutable, so the instance itself can be cached
+            self.__dict__["_transform_cache"] = (self.transform_data, transform)
 
-    def get_metadata_snapshot(self) -> Optional[MetadataSnapshot]:
+    def get_metadata_snapshot(self) -> Optional["MetadataSnapshot"]:
         """Get metadata_snapshot as MetadataSnapshot object."""
         if self.metadata_snapshot is None:
             return None
+        from .metadata_snapshot import MetadataSnapshot
+
         return MetadataSnapshot(**self.metadata_snapshot)
 
-    def set_metadata_snapshot(self, snapshot: Optional[MetadataSnapshot]) -> None:
+    def set_metadata_snapshot(self, snapshot: Optional["MetadataSnapshot"]) -> None:
         """Set metadata_snapshot from MetadataSnapshot object."""
         if snapshot is None:
             self.metadata_snapshot = None
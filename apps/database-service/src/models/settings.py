@@ -4,7 +4,7 @@ Settings model for storing application settings.
 
 from datetime import datetime
 from typing import Optional, Any
-from sqlmodel import Field, SQLModel, Column
+from sqlmodel import Field, SQLModel, Column, func
 from sqlalchemy import JSON as SA_JSON
 
 
@@ -16,5 +16,5 @@ class Settings(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     key: str = Field(unique=True, index=True)
     value: Any = Field(sa_column=Column(SA_JSON))  # JSON field to support various data types
-    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()})
 
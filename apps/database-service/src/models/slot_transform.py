@@ -1,13 +1,15 @@
 """
-Pydantic model for image slot transformations.
+Dataclass for image slot transformations.
 """
 
+from dataclasses import dataclass
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import TypeAdapter
 
 
-class SlotTransform(BaseModel):
-    """Type-safe model for image slot transformations."""
+@dataclass(slots=True, frozen=True)
+class SlotTransform:
+    """Type-safe, immutable model for image slot transformations."""
 
     x: float  # Position X coordinate
     y: float  # Position Y coordinate
@@ -27,3 +29,6 @@ class SlotTransform(BaseModel):
     # Rotation for crop tool (separate from position rotation, supports arbitrary angles)
     crop_rotation: Optional[float] = None  # Rotation angle in degrees (supports decimal precision)
 
+
+# Validates untrusted dicts (e.g. transform_data stored from API requests) into SlotTransform
+slot_transform_adapter = TypeAdapter(SlotTransform)
@@ -3,43 +3,73 @@ SourceImage model for tracking source images from albums directory.
 """
 
 from datetime import datetime
-from typing import Optional, Dict, Any
-from sqlmodel import Field, SQLModel, Column
-from sqlalchemy import JSON as SA_JSON
+from typing import Optional, Dict, Any, TYPE_CHECKING
+from sqlmodel import Field, SQLModel, Column, Index, func
+from sqlalchemy import JSON as SA_JSON, Boolean, Computed
 
-from .exif_metadata import EXIFMetadata
+if TYPE_CHECKING:
+    # Imported on first use (see models/__init__.py)
+    from .exif_metadata import EXIFMetadata
 
 
 class SourceImage(SQLModel, table=True):
     """Model for source images from albums directory."""
 
     __tablename__ = "source_images"
+    __table_args__ = (
+        # The used/unused filter as an equality seek that also reads in date order
+        Index("ix_source_active_used_date", "is_deleted", "is_used", "date_taken"),
+        # Lets the default "not deleted, newest first" listing read in index order
+        Index("ix_source_active_date", "is_deleted", "date_taken"),
+        # Same for the filename and created_at sort options (rowid breaks ties in index order)
+        Index("ix_source_active_filename", "is_deleted", "filename"),
+        Index("ix_source_active_created", "is_deleted", "created_at"),
+        # Album filter is an equality seek that also reads in the default date order
+        Index("ix_source_album_date", "album_id", "is_deleted", "date_taken"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     filename: str = Field(index=True)
     filepath: str = Field(index=True)  # Relative to data directory
+    album_id: Optional[int] = Field(default=None, foreign_key="albums.id")  # None outside albums/<name>/
     date_taken: Optional[datetime] = None  # Extracted from EXIF
-    is_deleted: bool = Field(default=False, index=True)
+    is_deleted: bool = Field(default=False)
     usage_count: int = Field(default=0, index=True)  # Track how many ImageSlots reference this image
+    # Generated by the database from usage_count (True if any ImageSlot uses the image)
+    is_used: Optional[bool] = Field(default=None, sa_column=Column(Boolean, Computed("usage_count > 0")))
     exif_metadata: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(SA_JSON))
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
+    # File mtime and size when EXIF was last read; the scanner skips files where both match
+    file_mtime: Optional[float] = None
+    file_size: Optional[int] = None
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
+    updated_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()})
 
-    @property
-    def is_used(self) -> bool:
-        """Computed property: True if this image is used in any GalleryImage."""
-        return self.usage_count > 0
-
-    def get_exif_metadata(self) -> Optional[EXIFMetadata]:
-        """Get exif_metadata as EXIFMetadata object."""
+    def get_exif_metadata(self) -> Optional["EXIFMetadata"]:
+        """Get exif_metadata as EXIFMetadata object (parsed once per stored value)."""
         if self.exif_metadata is None:
             return None
-        return EXIFMetadata(**self.exif_metadata)
+        cached = self.__dict__.get("_exif_cache")
+        if cached is not None and cached[0] is self.exif_metadata:
+            return cached[1]
+        from .exif_metadata import EXIFMetadata
+
+        # Stored blobs are written by set_exif_metadata from a validated model,
+        # so they are trusted and skip per-field validation.
+        metadata = EXIFMetadata.model_construct(**self.exif_metadata)
+        self.__dict__["_exif_cache"] = (self.exif_metadata, metadata)
+        return metadata
 
-    def set_exif_metadata(self, metadata: Optional[EXIFMetadata]) -> None:
-        """Set exif_metadata from EXIFMetadata object."""
+    def set_exif_metadata(self, metadata: Optional["EXIFMetadata"]) -> None:
+        """Set exif_metadata from EXIFMetadata object, rounding floats to a compact precision."""
         if metadata is None:
             self.exif_metadata = None
         else:
-            self.exif_metadata = metadata.model_dump(exclude_none=True)
+            self.exif_metadata = metadata.to_stored_dict()
+            # The dict is the rounded output of to_stored_dict() on an already validated
+            # model, so it is trusted without re-validation; the cached model is built
+            # from it so it matches what a reload of the stored blob would give
+            self.__dict__["_exif_cache"] = (
+                self.exif_metadata,
+                type(metadata).model_construct(**self.exif_metadata),
+            )
 
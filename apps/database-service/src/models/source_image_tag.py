@@ -3,7 +3,7 @@ SourceImageTag junction model for many-to-many relationship between SourceImages
 """
 
 from typing import Optional
-from sqlmodel import Field, SQLModel, UniqueConstraint
+from sqlmodel import Field, SQLModel, Index, UniqueConstraint
 
 
 class SourceImageTag(SQLModel, table=True):
@@ -11,10 +11,13 @@ class SourceImageTag(SQLModel, table=True):
 
     __tablename__ = "source_image_tags"
     __table_args__ = (
+        # Also serves lookups by source_image_id alone (leading column)
         UniqueConstraint("source_image_id", "tag_id", name="unique_source_image_tag"),
+        # Covers "images with tag X" without touching the table rows
+        Index("ix_source_tag_image", "tag_id", "source_image_id"),
     )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    source_image_id: int = Field(foreign_key="source_images.id", index=True)
-    tag_id: int = Field(foreign_key="tags.id", index=True)
+    source_image_id: int = Field(foreign_key="source_images.id")
+    tag_id: int = Field(foreign_key="tags.id")
 
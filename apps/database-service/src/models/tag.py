@@ -4,16 +4,20 @@ Tag model for organizing images.
 
 from datetime import datetime
 from typing import Optional
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, SQLModel, Index, func, text
 
 
 class Tag(SQLModel, table=True):
     """Model for tags used to organize images."""
 
     __tablename__ = "tags"
+    __table_args__ = (
+        # Case-insensitive copy of the name ordering, used for prefix autocomplete
+        Index("ix_tag_name_nocase", text("name COLLATE NOCASE")),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True, index=True)
     color: Optional[str] = None  # Optional color for UI display (e.g., "#ff5733")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
 
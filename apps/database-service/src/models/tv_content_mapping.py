@@ -4,18 +4,23 @@ TVContentMapping model for bidirectional mapping between gallery images and TV c
 
 from datetime import datetime
 from typing import Optional
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, SQLModel, Index, func, text
 
 
 class TVContentMapping(SQLModel, table=True):
     """Model for mapping gallery images to TV content IDs."""
 
     __tablename__ = "tv_content_mappings"
+    __table_args__ = (
+        # Holds only app-managed rows, so listing them no longer scans manual uploads.
+        # Manual rows (gallery_image_id IS NULL) are already an equality seek on the FK index.
+        Index("ix_tv_content_app_managed", "id", sqlite_where=text("gallery_image_id IS NOT NULL")),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     gallery_image_id: Optional[int] = Field(default=None, foreign_key="gallery_images.id", index=True)
     tv_content_id: str = Field(unique=True, index=True)  # TV-assigned content ID
-    uploaded_at: datetime = Field(default_factory=datetime.utcnow)
+    uploaded_at: Optional[datetime] = Field(default=None, nullable=False, sa_column_kwargs={"server_default": func.now()})
     last_verified_at: Optional[datetime] = None
     sync_status: str = Field(default="pending", index=True)  # "synced", "pending", "failed", "manual"
     
@@ -3,6 +3,7 @@ Repository implementations.
 """
 
 from .base import Repository
+from .album_repository import AlbumRepository
 from .source_image_repository import SourceImageRepository
 from .gallery_image_repository import GalleryImageRepository
 from .tv_content_repository import TVContentRepository
@@ -13,6 +14,7 @@ from .source_image_tag_repository import SourceImageTagRepository
 
 __all__ = [
     "Repository",
+    "AlbumRepository",
     "SourceImageRepository",
     "GalleryImageRepository",
     "TVContentRepository",
@@ -0,0 +1,52 @@
+"""
+Repository for Album operations.
+"""
+
+from typing import Dict, Iterable, Optional
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+from models import Album
+from .base import Repository, chunked
+
+ALBUMS_PREFIX = "albums/"
+
+
+def album_name_from_filepath(filepath: str) -> Optional[str]:
+    """Return the album of a data-relative filepath (albums/<name>/...), or None."""
+    if not filepath.startswith(ALBUMS_PREFIX):
+        return None
+    name, separator, _ = filepath[len(ALBUMS_PREFIX):].partition("/")
+    return name if separator and name else None
+
+
+class AlbumRepository(Repository[Album]):
+    """Repository for Album CRUD operations."""
+
+    def __init__(self, session: Session):
+        """Initialize repository."""
+        super().__init__(Album, session)
+
+    def get_id_by_name(self, name: str) -> Optional[int]:
+        """Get the ID of an album by name, or None if no image has been scanned into it."""
+        statement = select(Album.id).where(Album.name == name)
+        return self.session.exec(statement).first()
+
+    def get_or_create_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """Map each album name to its ID, inserting the albums that do not exist yet."""
+        ids: Dict[str, int] = {}
+        for name_chunk in chunked(list(dict.fromkeys(names))):
+            self.session.exec(
+                sqlite_insert(Album)
+                .values([{"name": name} for name in name_chunk])
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            statement = select(Album.name, Album.id).where(Album.name.in_(name_chunk))
+            ids.update(self.session.exec(statement).all())
+        return ids
+
+    def get_id_for_filepath(self, filepath: str) -> Optional[int]:
+        """Get (creating if needed) the album ID for a filepath; None outside an album."""
+        name = album_name_from_filepath(filepath)
+        if name is None:
+            return None
+        return self.get_or_create_ids([name])[name]
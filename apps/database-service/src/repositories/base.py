@@ -2,10 +2,38 @@
 Base repository pattern for CRUD operations.
 """
 
-from typing import Generic, TypeVar, Type, Optional, List
-from sqlmodel import Session, select
+from functools import lru_cache
+from typing import Generic, Iterator, Sequence, TypeVar, Type, Optional, List
+from sqlmodel import Session, delete, exists, func, select
+from .count_cache import cached_count
 
 ModelType = TypeVar("ModelType")
+T = TypeVar("T")
+
+# Largest id list bound into a single ``IN (...)``; SQLite caps bound parameters
+# (999 on older builds) and planning cost grows with the list length.
+IN_CHUNK_SIZE = 500
+
+# Rows fetched per round trip when a result is streamed instead of materialized
+STREAM_BATCH_SIZE = 1000
+
+
+def chunked(items: Sequence[T], size: int = IN_CHUNK_SIZE) -> Iterator[Sequence[T]]:
+    """Yield consecutive slices of ``items`` with at most ``size`` elements."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+@lru_cache(maxsize=None)
+def _base_select(model: type):
+    """Build ``SELECT model`` once per model; callers derive clauses from it."""
+    return select(model)
+
+
+@lru_cache(maxsize=None)
+def _count_select(model: type):
+    """Build ``SELECT count(*) FROM model`` once per model."""
+    return select(func.count()).select_from(model)
 
 
 class Repository(Generic[ModelType]):
@@ -15,41 +43,59 @@ class Repository(Generic[ModelType]):
         """Initialize repository with model and session."""
         self.model = model
         self.session = session
+        # Repositories are created per request, so the statements are memoized per model
+        self._base_select = _base_select(model)
+        self._count_select = _count_select(model)
 
     def create(self, obj: ModelType) -> ModelType:
-        """Create a new record."""
+        """Create a new record (flushed; committed with the caller's transaction)."""
         self.session.add(obj)
-        self.session.commit()
+        self.session.flush()
         self.session.refresh(obj)
         return obj
 
+    def bulk_create(self, objs: List[ModelType]) -> List[ModelType]:
+        """Create multiple records in a single flush.
+
+        Objects are not refreshed individually; attributes load lazily on access.
+        """
+        self.session.add_all(objs)
+        self.session.flush()
+        return objs
+
     def get(self, id: int) -> Optional[ModelType]:
         """Get a record by ID."""
         return self.session.get(self.model, id)
 
+    def exists(self, id: int) -> bool:
+        """Check whether a record exists without loading it."""
+        statement = select(exists().where(self.model.id == id))
+        return self.session.exec(statement).one()
+
     def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """Get all records with pagination."""
-        statement = select(self.model).offset(skip).limit(limit)
+        statement = self._base_select.offset(skip).limit(limit)
         return list(self.session.exec(statement).all())
 
     def count(self) -> int:
-        """Count all records."""
-        statement = select(self.model)
-        return len(list(self.session.exec(statement).all()))
+        """Count all records (cached briefly; see count_cache)."""
+        return cached_count(
+            self.session,
+            self.model.__tablename__,
+            None,
+            lambda: self.session.exec(self._count_select).one(),
+        )
 
     def update(self, obj: ModelType) -> ModelType:
-        """Update a record."""
+        """Update a record (flushed; committed with the caller's transaction)."""
         self.session.add(obj)
-        self.session.commit()
+        self.session.flush()
         self.session.refresh(obj)
         return obj
 
     def delete(self, id: int) -> bool:
-        """Delete a record by ID."""
-        obj = self.get(id)
-        if obj:
-            self.session.delete(obj)
-            self.session.commit()
-            return True
-        return False
+        """Delete a record by ID without loading it first."""
+        statement = delete(self.model).where(self.model.id == id)
+        result = self.session.exec(statement)
+        return result.rowcount > 0
 
@@ -0,0 +1,119 @@
+"""
+Short-lived in-process cache for COUNT(*) results used by paginated listings.
+
+Entries are keyed by table name plus the caller's filter key. Any committed write
+to a table drops that table's entries; the TTL bounds staleness otherwise. The
+per-table write versions kept for this also back the listing ETags.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState
+from sqlmodel import Session
+
+# Seconds a cached count is served before it is recomputed
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "15"))
+
+# Distinct filter keys kept per process before the cache is cleared
+COUNT_CACHE_MAX_ENTRIES = 256
+
+# Session.info key collecting the tables written by the current transaction
+_CHANGED_TABLES = "count_cache_changed_tables"
+
+_lock = threading.Lock()
+_counts: Dict[Tuple[str, Hashable], Tuple[float, int]] = {}
+# Bumped per table on invalidation so a count that raced with a write is not stored
+_versions: Dict[str, int] = {}
+# Bumped when every table is invalidated at once (see invalidate_all_counts)
+_generation = 0
+
+
+def cached_count(session: Session, table: str, key: Hashable, compute: Callable[[], int]) -> int:
+    """Return the cached count for (table, key), computing and storing it on a miss."""
+    # A session must see its own uncommitted writes, which are never cached
+    if table in session.info.get(_CHANGED_TABLES, ()):
+        return compute()
+
+    now = time.monotonic()
+    with _lock:
+        entry = _counts.get((table, key))
+        if entry is not None and now - entry[0] < COUNT_CACHE_TTL:
+            return entry[1]
+        version = (_generation, _versions.get(table, 0))
+
+    value = compute()
+
+    with _lock:
+        if (_generation, _versions.get(table, 0)) == version:
+            if len(_counts) >= COUNT_CACHE_MAX_ENTRIES:
+                _counts.clear()
+            _counts[(table, key)] = (time.monotonic(), value)
+    return value
+
+
+def table_version(table: str) -> int:
+    """Return a counter that changes whenever a write to the table is flushed or committed."""
+    with _lock:
+        return _versions.get(table, 0)
+
+
+def invalidate_counts(tables: Set[str]) -> None:
+    """Drop cached counts for the given tables."""
+    with _lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+        for cache_key in [cache_key for cache_key in _counts if cache_key[0] in tables]:
+            del _counts[cache_key]
+
+
+def invalidate_all_counts() -> None:
+    """Drop every cached count, e.g. once a commit from another process has been seen."""
+    global _generation
+    with _lock:
+        _generation += 1
+        _counts.clear()
+
+
+def _record_tables(session: Session, tables: Set[str]) -> None:
+    """Remember written tables on the session, and drop their counts right away."""
+    if tables:
+        session.info.setdefault(_CHANGED_TABLES, set()).update(tables)
+        invalidate_counts(tables)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session: Session, flush_context: Any) -> None:
+    """Collect tables touched by ORM unit-of-work inserts, updates and deletes."""
+    tables = {
+        obj.__table__.name
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if hasattr(obj, "__table__")
+    }
+    _record_tables(session, tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement_tables(orm_execute_state: ORMExecuteState) -> None:
+    """Collect tables written by INSERT/UPDATE/DELETE statements run through the session."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and hasattr(table, "name"):
+            _record_tables(orm_execute_state.session, {table.name})
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    """Invalidate again once the writes are visible to other sessions."""
+    tables = session.info.pop(_CHANGED_TABLES, None)
+    if tables:
+        invalidate_counts(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_after_rollback(session: Session) -> None:
+    """Rolled-back writes never became visible; only forget them."""
+    session.info.pop(_CHANGED_TABLES, None)
@@ -2,10 +2,27 @@
 Repository for GalleryImage operations.
 """
 
-from typing import List, Optional
-from sqlmodel import Session, select
-from models import GalleryImage, ImageSlot
-from .base import Repository
+from typing import Collection, Dict, List, Optional
+from sqlalchemy import bindparam, delete
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, func, select
+from models import GalleryImage, GalleryImageTag, ImageSlot
+from .base import IN_CHUNK_SIZE, Repository, chunked
+
+
+# Built once; only the bound filepath changes between calls
+_SELECT_BY_FILEPATH = select(GalleryImage).where(GalleryImage.filepath == bindparam("filepath"))
+
+
+def _ids_with_all_tags(tag_ids: Collection[int], after_id: Optional[int] = None):
+    """Subquery of gallery image IDs tagged with every tag in tag_ids (AND logic)."""
+    statement = select(GalleryImageTag.gallery_image_id).where(GalleryImageTag.tag_id.in_(tag_ids))
+    if after_id is not None:
+        # Narrows each tag's (tag_id, gallery_image_id) index range instead of filtering later
+        statement = statement.where(GalleryImageTag.gallery_image_id > after_id)
+    return statement.group_by(GalleryImageTag.gallery_image_id).having(
+        func.count(func.distinct(GalleryImageTag.tag_id)) == len(tag_ids)
+    )
 
 
 class GalleryImageRepository(Repository[GalleryImage]):
@@ -17,22 +34,123 @@ class GalleryImageRepository(Repository[GalleryImage]):
 
     def get_by_filepath(self, filepath: str) -> Optional[GalleryImage]:
         """Get gallery image by filepath."""
-        statement = select(GalleryImage).where(GalleryImage.filepath == filepath)
-        return self.session.exec(statement).first()
+        return self.session.exec(_SELECT_BY_FILEPATH, params={"filepath": filepath}).first()
+
+    def get_page(self, skip: int, limit: int) -> List[GalleryImage]:
+        """Get an offset page of gallery images in id order, the order of get_page_after."""
+        statement = self._base_select.order_by(GalleryImage.id).offset(skip).limit(limit)
+        return list(self.session.exec(statement).all())
+
+    def get_page_after(
+        self,
+        after_id: Optional[int],
+        limit: int,
+        ids: Optional[List[int]] = None,
+    ) -> List[GalleryImage]:
+        """
+        Get up to limit gallery images in id order, starting after after_id.
+        Keyset pagination: each page is a primary-key range seek, however deep.
+        ids optionally restricts the result (e.g. to images matching a tag filter).
+        """
+        def build(id_chunk: Optional[List[int]]):
+            statement = self._base_select
+            if after_id is not None:
+                statement = statement.where(GalleryImage.id > after_id)
+            if id_chunk is not None:
+                statement = statement.where(GalleryImage.id.in_(id_chunk))
+            return statement.order_by(GalleryImage.id).limit(limit)
+        
+        if ids is None or len(ids) <= IN_CHUNK_SIZE:
+            return list(self.session.exec(build(ids)).all())
+        
+        # Chunks of sorted ids come back in id order, so stop once the page is full
+        rows: List[GalleryImage] = []
+        for id_chunk in chunked(sorted(set(ids))):
+            rows.extend(self.session.exec(build(list(id_chunk))).all())
+            if len(rows) >= limit:
+                break
+        return rows[:limit]
+
+    def get_page_with_all_tags(
+        self,
+        tag_ids: List[int],
+        limit: int,
+        skip: int = 0,
+        after_id: Optional[int] = None,
+    ) -> List[GalleryImage]:
+        """
+        Get a page of gallery images that have ALL specified tags, in id order.
+        The tag match, ordering and paging all run in one SQL statement, so only
+        the page is materialized; pass after_id for keyset paging instead of skip.
+        """
+        unique_tag_ids = set(tag_ids)
+        if not unique_tag_ids:
+            return []
+        statement = self._base_select.where(
+            GalleryImage.id.in_(_ids_with_all_tags(unique_tag_ids, after_id))
+        )
+        statement = statement.order_by(GalleryImage.id).offset(skip).limit(limit)
+        return list(self.session.exec(statement).all())
+
+    def count_with_all_tags(self, tag_ids: List[int]) -> int:
+        """Count gallery images that have ALL specified tags."""
+        unique_tag_ids = set(tag_ids)
+        if not unique_tag_ids:
+            return 0
+        statement = self._count_select.where(
+            GalleryImage.id.in_(_ids_with_all_tags(unique_tag_ids))
+        )
+        return self.session.exec(statement).one()
 
     def get_with_slots(self, id: int) -> Optional[GalleryImage]:
-        """Get gallery image with its slots."""
-        image = self.get(id)
-        if image:
-            # Load slots
-            statement = select(ImageSlot).where(ImageSlot.gallery_image_id == id)
-            slots = list(self.session.exec(statement).all())
-            # Attach slots to image (not a real relationship, but useful)
-            image.slots = slots  # type: ignore
-        return image
+        """Get gallery image with its slots loaded (one query for the image, one for slots)."""
+        statement = (
+            select(GalleryImage)
+            .where(GalleryImage.id == id)
+            .options(selectinload(GalleryImage.slots))
+        )
+        return self.session.exec(statement).first()
+
+    def get_many_with_slots(self, ids: List[int]) -> List[GalleryImage]:
+        """Get several gallery images with their slots loaded in a single IN query."""
+        if not ids:
+            return []
+        statement = (
+            select(GalleryImage)
+            .where(GalleryImage.id.in_(ids))
+            .options(selectinload(GalleryImage.slots))
+        )
+        return list(self.session.exec(statement).all())
 
     def get_slots(self, gallery_image_id: int) -> List[ImageSlot]:
         """Get all slots for a gallery image."""
         statement = select(ImageSlot).where(ImageSlot.gallery_image_id == gallery_image_id)
         return list(self.session.exec(statement).all())
 
+
+    def get_filepaths(self, ids: List[int]) -> Dict[int, str]:
+        """Get the filepath of each existing gallery image, keyed by ID (missing IDs are absent)."""
+        filepaths: Dict[int, str] = {}
+        for id_chunk in chunked(list(dict.fromkeys(ids))):
+            statement = select(GalleryImage.id, GalleryImage.filepath).where(
+                GalleryImage.id.in_(id_chunk)
+            )
+            filepaths.update(self.session.exec(statement).all())
+        return filepaths
+
+    def delete_many_with_slots(self, ids: List[int]) -> List[int]:
+        """
+        Delete gallery images and their slots with bulk DELETE statements.
+        Returns the source image IDs the deleted slots referenced (one entry
+        per slot), so the caller can decrement their usage counts.
+        """
+        source_image_ids: List[int] = []
+        for id_chunk in chunked(list(dict.fromkeys(ids))):
+            slot_statement = select(ImageSlot.source_image_id).where(
+                ImageSlot.gallery_image_id.in_(id_chunk),
+                ImageSlot.source_image_id.isnot(None),
+            )
+            source_image_ids.extend(self.session.exec(slot_statement).all())
+            self.session.exec(delete(ImageSlot).where(ImageSlot.gallery_image_id.in_(id_chunk)))
+            self.session.exec(delete(GalleryImage).where(GalleryImage.id.in_(id_chunk)))
+        return source_image_ids
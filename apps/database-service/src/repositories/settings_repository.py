@@ -2,11 +2,56 @@
 Repository for Settings operations.
 """
 
+import copy
+import os
+import threading
+import time
 from typing import Optional, Dict, Any
-from sqlmodel import Session, select
+from sqlalchemy import bindparam, event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, func, select
 from models import Settings
 from .base import Repository
 
+# Seconds the in-process copy of the settings table is served before it is reloaded.
+# Writes through this repository invalidate it when they commit; the TTL bounds
+# staleness for writes made by other processes.
+SETTINGS_CACHE_TTL = float(os.getenv("SETTINGS_CACHE_TTL", "30"))
+
+# Session.info flag for a session holding settings writes that are not committed yet
+_SETTINGS_CHANGED = "settings_changed"
+
+_cache_lock = threading.Lock()
+_cached_settings: Optional[Dict[str, Any]] = None
+_cached_at = 0.0
+# Bumped on every invalidation so a load that raced with a write is not stored
+_cache_version = 0
+
+
+# Built once; only the bound key changes between calls
+_SELECT_BY_KEY = select(Settings).where(Settings.key == bindparam("key"))
+
+
+def invalidate_settings_cache() -> None:
+    """Drop the cached settings so the next read queries the database."""
+    global _cached_settings, _cache_version
+    with _cache_lock:
+        _cache_version += 1
+        _cached_settings = None
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_settings_after_commit(session: Session) -> None:
+    """Invalidate the cache once a session that wrote settings has committed."""
+    if session.info.pop(_SETTINGS_CHANGED, False):
+        invalidate_settings_cache()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_settings_flag_after_rollback(session: Session) -> None:
+    """Rolled-back writes never became visible, so only the flag is cleared."""
+    session.info.pop(_SETTINGS_CHANGED, None)
+
 
 class SettingsRepository(Repository[Settings]):
     """Repository for Settings CRUD operations."""
@@ -15,34 +60,78 @@ class SettingsRepository(Repository[Settings]):
         """Initialize repository."""
         super().__init__(Settings, session)
 
+    def _mark_changed(self) -> None:
+        """Record a settings write so the cache is invalidated on commit."""
+        self.session.info[_SETTINGS_CHANGED] = True
+        invalidate_settings_cache()
+
+    def create(self, obj: Settings) -> Settings:
+        """Create a new setting."""
+        self._mark_changed()
+        return super().create(obj)
+
+    def update(self, obj: Settings) -> Settings:
+        """Update a setting."""
+        self._mark_changed()
+        return super().update(obj)
+
+    def delete(self, id: int) -> bool:
+        """Delete a setting by ID."""
+        self._mark_changed()
+        return super().delete(id)
+
     def get_by_key(self, key: str) -> Optional[Settings]:
         """Get setting by key."""
-        statement = select(Settings).where(Settings.key == key)
-        return self.session.exec(statement).first()
+        return self.session.exec(_SELECT_BY_KEY, params={"key": key}).first()
 
     def get_value(self, key: str, default: Any = None) -> Any:
-        """Get setting value by key."""
-        setting = self.get_by_key(key)
-        if setting:
-            return setting.value
+        """Get setting value by key (served from the settings cache)."""
+        settings = self._shared_dict()
+        if key in settings:
+            # A stored JSON null is returned as None, as for any existing row
+            return copy.deepcopy(settings[key])
         return default
 
     def set_value(self, key: str, value: Any) -> Settings:
-        """Set or update setting value."""
-        setting = self.get_by_key(key)
-        if setting:
-            setting.value = value
-            self.session.add(setting)
-            self.session.commit()
-            self.session.refresh(setting)
-            return setting
-        else:
-            # Create new setting
-            new_setting = Settings(key=key, value=value)
-            return self.create(new_setting)
+        """Set or update setting value with a single UPSERT on the unique key."""
+        self._mark_changed()
+        statement = sqlite_insert(Settings).values(key=key, value=value)
+        statement = statement.on_conflict_do_update(
+            index_elements=["key"],
+            set_={"value": statement.excluded.value, "updated_at": func.now()},
+        ).returning(Settings)
+        setting = self.session.exec(
+            statement, execution_options={"populate_existing": True}
+        ).scalars().one()
+        return setting
+
+    def _load_all_dict(self) -> Dict[str, Any]:
+        """Read every setting from the database."""
+        statement = select(Settings.key, Settings.value)
+        return {key: value for key, value in self.session.exec(statement)}
 
     def get_all_dict(self) -> Dict[str, Any]:
-        """Get all settings as a dictionary."""
-        settings = self.get_all(skip=0, limit=1000)  # Get all settings
-        return {s.key: s.value for s in settings}
+        """Get all settings as a dictionary, cached for SETTINGS_CACHE_TTL seconds."""
+        # A deep copy, so callers that change nested values leave the cache intact
+        return copy.deepcopy(self._shared_dict())
+
+    def _shared_dict(self) -> Dict[str, Any]:
+        """All settings, possibly the cached dict itself; callers must not modify it."""
+        global _cached_settings, _cached_at
+
+        # A session must see its own uncommitted writes, which are never cached
+        if self.session.info.get(_SETTINGS_CHANGED):
+            return self._load_all_dict()
+
+        with _cache_lock:
+            if _cached_settings is not None and time.monotonic() - _cached_at < SETTINGS_CACHE_TTL:
+                return _cached_settings
+            version = _cache_version
+
+        settings = self._load_all_dict()
 
+        with _cache_lock:
+            if version == _cache_version:
+                _cached_settings = settings
+                _cached_at = time.monotonic()
+        return settings
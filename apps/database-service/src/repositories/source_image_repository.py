@@ -3,14 +3,56 @@ Repository for SourceImage operations.
 """
 
 import logging
-from typing import List, Optional
-from sqlmodel import Session, select, text
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, bindparam, case, literal, tuple_
+from sqlmodel import Session, func, select, update
 from models import SourceImage, ImageSlot
-from .base import Repository
+from .base import IN_CHUNK_SIZE, Repository, chunked
+from .count_cache import cached_count
 
 logger = logging.getLogger(__name__)
 
 
+# Built once; only the bound filepath changes between calls
+_SELECT_BY_FILEPATH = select(SourceImage).where(SourceImage.filepath == bindparam("filepath"))
+
+
+def _after_cursor(order_column, descending: bool, cursor: Tuple[Any, int]) -> list:
+    """
+    Keyset conditions for the rows after cursor in (order_column, id) order.
+
+    Non-NULL values use a row-value comparison, (order_column, id) < (value, id),
+    which SQLite turns into a range seek on the index. SQLite sorts NULLs first
+    ascending and last descending. OR-ing the NULL rows into one condition would
+    stop SQLite from seeking the index range, so the conditions are returned as
+    segments, to be read one after the other.
+    """
+    value, last_id = cursor
+    nullable = SourceImage.__table__.c[order_column.key].nullable
+    key = tuple_(order_column, SourceImage.id)
+    after = tuple_(literal(value, order_column.type), literal(last_id, SourceImage.id.type))
+    if descending:
+        if value is None:
+            return [and_(order_column.is_(None), SourceImage.id < last_id)]
+        segments = [key < after]
+        if nullable:
+            segments.append(order_column.is_(None))
+        return segments
+    if value is None:
+        return [and_(order_column.is_(None), SourceImage.id > last_id), order_column.isnot(None)]
+    return [key > after]
+
+
+def _group_by_occurrences(ids: List[int]) -> Dict[int, List[int]]:
+    """Group ids by how many times they appear, so each group is one UPDATE."""
+    groups: Dict[int, List[int]] = {}
+    for id, times in Counter(ids).items():
+        groups.setdefault(times, []).append(id)
+    return groups
+
+
 class SourceImageRepository(Repository[SourceImage]):
     """Repository for SourceImage CRUD operations."""
 
@@ -20,8 +62,36 @@ class SourceImageRepository(Repository[SourceImage]):
 
     def get_by_filepath(self, filepath: str) -> Optional[SourceImage]:
         """Get source image by filepath."""
-        statement = select(SourceImage).where(SourceImage.filepath == filepath)
-        return self.session.exec(statement).first()
+        return self.session.exec(_SELECT_BY_FILEPATH, params={"filepath": filepath}).first()
+
+    def get_many(self, ids: List[int]) -> Dict[int, SourceImage]:
+        """Get several source images by ID in bounded IN queries, keyed by ID (missing IDs are absent)."""
+        images: Dict[int, SourceImage] = {}
+        for chunk in chunked(list(dict.fromkeys(ids))):
+            statement = self._base_select.where(SourceImage.id.in_(chunk))
+            for image in self.session.exec(statement):
+                images[image.id] = image
+        return images
+
+    def get_snapshot_data(
+        self, ids: List[int]
+    ) -> Dict[int, Tuple[str, str, Optional[datetime], Optional[Dict[str, Any]]]]:
+        """
+        Get (filename, filepath, date_taken, exif_metadata) for several source images,
+        keyed by ID. Only the snapshot columns are selected; no ORM objects are built.
+        """
+        rows: Dict[int, Tuple[str, str, Optional[datetime], Optional[Dict[str, Any]]]] = {}
+        for chunk in chunked(list(dict.fromkeys(ids))):
+            statement = select(
+                SourceImage.id,
+                SourceImage.filename,
+                SourceImage.filepath,
+                SourceImage.date_taken,
+                SourceImage.exif_metadata,
+            ).where(SourceImage.id.in_(chunk))
+            for id, filename, filepath, date_taken, exif_metadata in self.session.exec(statement):
+                rows[id] = (filename, filepath, date_taken, exif_metadata)
+        return rows
 
     def get_all_not_deleted(self, skip: int = 0, limit: int = 100) -> List[SourceImage]:
         """Get all non-deleted source images."""
@@ -33,73 +103,148 @@ class SourceImageRepository(Repository[SourceImage]):
         )
         return list(self.session.exec(statement).all())
 
+    def _apply_not_deleted_filters(
+        self,
+        statement,
+        used: Optional[bool] = None,
+        source_image_ids: Optional[List[int]] = None,
+        album_id: Optional[int] = None,
+    ):
+        """Apply the shared non-deleted/used/id/album filters to a statement."""
+        statement = statement.where(SourceImage.is_deleted == False)
+        
+        if used is not None:
+            statement = statement.where(SourceImage.is_used == used)
+        
+        if source_image_ids is not None:
+            statement = statement.where(SourceImage.id.in_(source_image_ids))
+        
+        if album_id is not None:
+            # Equality on ix_source_album_date, which also holds the default date order
+            statement = statement.where(SourceImage.album_id == album_id)
+        
+        return statement
+
     def get_all_not_deleted_filtered(
         self, 
         skip: int = 0, 
         limit: int = 100, 
         used: Optional[bool] = None,
         source_image_ids: Optional[List[int]] = None,
-        filepath_prefix: Optional[str] = None,
+        album_id: Optional[int] = None,
         order_by: str = "date_taken",
         order_direction: str = "desc",
+        cursor: Optional[Tuple[Any, int]] = None,
     ) -> List[SourceImage]:
-        """Get all non-deleted source images with optional filtering and sorting."""
-        statement = select(SourceImage).where(SourceImage.is_deleted == False)
+        """
+        Get all non-deleted source images with optional filtering and sorting.
+        Rows are ordered by (order_by, id). Passing the previous page's last
+        (value, id) as cursor (see page_cursor) seeks past it instead of
+        using OFFSET, so deep pages cost the same as the first.
+        """
+        order_column = getattr(SourceImage, order_by, SourceImage.date_taken)
+        descending = order_direction != "asc"
         
-        if used is not None:
-            if used:
-                statement = statement.where(SourceImage.usage_count > 0)
+        segments = [None] if cursor is None else _after_cursor(order_column, descending, cursor)
+        
+        def build(ids: Optional[List[int]], condition, offset: int, row_limit: int):
+            statement = self._apply_not_deleted_filters(
+                self._base_select, used, ids, album_id
+            )
+            if condition is not None:
+                statement = statement.where(condition)
+            if descending:
+                statement = statement.order_by(order_column.desc(), SourceImage.id.desc())
             else:
-                statement = statement.where(SourceImage.usage_count == 0)
+                statement = statement.order_by(order_column.asc(), SourceImage.id.asc())
+            return statement.offset(offset).limit(row_limit)
         
-        if source_image_ids is not None:
-            statement = statement.where(SourceImage.id.in_(source_image_ids))
+        def fetch(ids: Optional[List[int]], offset: int, row_limit: int) -> List[SourceImage]:
+            if len(segments) == 1:
+                return list(self.session.exec(build(ids, segments[0], offset, row_limit)).all())
+            rows: List[SourceImage] = []
+            for condition in segments:
+                wanted = offset + row_limit - len(rows)
+                rows.extend(self.session.exec(build(ids, condition, 0, wanted)).all())
+                if len(rows) >= offset + row_limit:
+                    break
+            return rows[offset:offset + row_limit]
         
-        if filepath_prefix is not None:
-            statement = statement.where(SourceImage.filepath.startswith(filepath_prefix))
+        if source_image_ids is None or len(source_image_ids) <= IN_CHUNK_SIZE:
+            return fetch(source_image_ids, skip, limit)
         
-        # Apply ordering
-        order_column = getattr(SourceImage, order_by, SourceImage.date_taken)
-        if order_direction == "asc":
-            statement = statement.order_by(order_column.asc())
-        else:
-            statement = statement.order_by(order_column.desc())
+        # Too many ids for one IN list: take each chunk's first skip+limit rows,
+        # then merge them in the same order SQLite uses (NULLs first ascending).
+        rows: List[SourceImage] = []
+        for ids in chunked(list(dict.fromkeys(source_image_ids))):
+            rows.extend(fetch(list(ids), 0, skip + limit))
         
-        statement = statement.offset(skip).limit(limit)
-        return list(self.session.exec(statement).all())
+        attribute = order_column.key
+        
+        def sort_key(image: SourceImage):
+            value = getattr(image, attribute)
+            return (value is not None, value if value is not None else 0, image.id)
+        
+        rows.sort(key=sort_key, reverse=descending)
+        return rows[skip:skip + limit]
+
+    @staticmethod
+    def page_cursor(
+        items: List[SourceImage], order_by: str = "date_taken"
+    ) -> Optional[Tuple[Any, int]]:
+        """Return the (order_by value, id) cursor after the last item of a page."""
+        if not items:
+            return None
+        order_column = getattr(SourceImage, order_by, SourceImage.date_taken)
+        last = items[-1]
+        return (getattr(last, order_column.key), last.id)
 
     def count_not_deleted_filtered(
         self, 
         used: Optional[bool] = None,
         source_image_ids: Optional[List[int]] = None,
-        filepath_prefix: Optional[str] = None,
+        album_id: Optional[int] = None,
     ) -> int:
-        """Count all non-deleted source images with optional filtering."""
-        statement = select(SourceImage).where(SourceImage.is_deleted == False)
-        
-        if used is not None:
-            if used:
-                statement = statement.where(SourceImage.usage_count > 0)
-            else:
-                statement = statement.where(SourceImage.usage_count == 0)
-        
-        if source_image_ids is not None:
-            statement = statement.where(SourceImage.id.in_(source_image_ids))
-        
-        if filepath_prefix is not None:
-            statement = statement.where(SourceImage.filepath.startswith(filepath_prefix))
+        """Count all non-deleted source images with optional filtering (cached briefly)."""
+        ids_key = frozenset(source_image_ids) if source_image_ids is not None else None
+        return cached_count(
+            self.session,
+            SourceImage.__tablename__,
+            ("not_deleted", used, ids_key, album_id),
+            lambda: self._count_not_deleted_filtered(used, source_image_ids, album_id),
+        )
+
+    def _count_not_deleted_filtered(
+        self,
+        used: Optional[bool],
+        source_image_ids: Optional[List[int]],
+        album_id: Optional[int],
+    ) -> int:
+        """Run the filtered count, in bounded IN chunks for long id lists."""
+        if source_image_ids is None or len(source_image_ids) <= IN_CHUNK_SIZE:
+            statement = self._apply_not_deleted_filters(
+                self._count_select, used, source_image_ids, album_id
+            )
+            return self.session.exec(statement).one()
         
-        return len(list(self.session.exec(statement).all()))
+        # Chunks are disjoint once duplicates are dropped, so their counts add up
+        total = 0
+        for ids in chunked(list(dict.fromkeys(source_image_ids))):
+            statement = self._apply_not_deleted_filters(
+                self._count_select, used, list(ids), album_id
+            )
+            total += self.session.exec(statement).one()
+        return total
 
     def mark_deleted(self, filepath: str) -> bool:
         """Mark source image as deleted."""
-        image = self.get_by_filepath(filepath)
-        if image:
-            image.is_deleted = True
-            self.session.add(image)
-            self.session.commit()
-            return True
-        return False
+        statement = (
+            update(SourceImage)
+            .where(SourceImage.filepath == filepath)
+            .values(is_deleted=True)
+        )
+        result = self.session.exec(statement)
+        return result.rowcount > 0
 
     def increment_usage(self, source_image_id: int) -> bool:
         """Increment usage_count by 1 for a source image."""
@@ -107,7 +252,6 @@ class SourceImageRepository(Repository[SourceImage]):
         if image:
             image.usage_count += 1
             self.session.add(image)
-            self.session.commit()
             return True
         return False
 
@@ -127,82 +271,105 @@ class SourceImageRepository(Repository[SourceImage]):
             else:
                 image.usage_count -= 1
             self.session.add(image)
-            self.session.commit()
             return True
         return False
 
     def batch_increment_usage(self, source_image_ids: List[int]) -> int:
         """
         Increment usage_count by 1 for multiple source images.
+        An id listed more than once is incremented once per occurrence.
+        The UPDATEs run in the caller's transaction; nothing is committed here.
         Returns count of successfully updated images.
         """
         if not source_image_ids:
             return 0
         
         count = 0
-        for source_image_id in source_image_ids:
-            if self.increment_usage(source_image_id):
-                count += 1
+        for times, ids in _group_by_occurrences(source_image_ids).items():
+            for id_chunk in chunked(ids):
+                statement = (
+                    update(SourceImage)
+                    .where(SourceImage.id.in_(id_chunk))
+                    .values(usage_count=SourceImage.usage_count + times)
+                )
+                count += self.session.exec(statement).rowcount * times
         return count
 
     def batch_decrement_usage(self, source_image_ids: List[int]) -> int:
         """
         Decrement usage_count by 1 for multiple source images.
+        An id listed more than once is decremented once per occurrence.
+        If a count would go negative, logs error and sets it to 0.
+        The UPDATEs run in the caller's transaction; nothing is committed here.
         Returns count of successfully updated images.
         """
         if not source_image_ids:
             return 0
         
         count = 0
-        for source_image_id in source_image_ids:
-            if self.decrement_usage(source_image_id):
-                count += 1
+        for times, ids in _group_by_occurrences(source_image_ids).items():
+            for id_chunk in chunked(ids):
+                underflow_statement = (
+                    select(SourceImage.id, SourceImage.usage_count)
+                    .where(SourceImage.id.in_(id_chunk))
+                    .where(SourceImage.usage_count < times)
+                )
+                underflows = list(self.session.exec(underflow_statement).all())
+                if underflows:
+                    logger.error(
+                        f"Attempted to decrement usage_count below 0 for {len(underflows)} source images "
+                        f"(source_image_id, usage_count): {underflows}. Setting to 0."
+                    )
+                
+                statement = (
+                    update(SourceImage)
+                    .where(SourceImage.id.in_(id_chunk))
+                    .values(
+                        usage_count=case(
+                            (SourceImage.usage_count > times, SourceImage.usage_count - times),
+                            else_=0,
+                        )
+                    )
+                )
+                count += self.session.exec(statement).rowcount * times
         return count
 
     def recalculate_all_usage_counts(self) -> dict:
         """
         Recalculate all usage_counts from actual ImageSlot references.
+        Runs as a single correlated UPDATE that only rewrites rows whose count changed.
         Returns summary of changes made.
         """
-        # First, set all usage counts to 0
-        all_images = list(self.session.exec(select(SourceImage)).all())
-        for image in all_images:
-            image.usage_count = 0
-            self.session.add(image)
-        
-        # Query actual usage counts from ImageSlots
-        statement = text("""
-            SELECT source_image_id, COUNT(*) as count 
-            FROM image_slots 
-            WHERE source_image_id IS NOT NULL 
-            GROUP BY source_image_id
-        """)
+        # Counted in this transaction, not served from the count cache, so the
+        # report matches the rows the UPDATE below sees
+        total_images = self.session.exec(self._count_select).one()
+
+        # Audit negative counts before they are overwritten
+        negative_statement = (
+            select(SourceImage.id, SourceImage.usage_count)
+            .where(SourceImage.usage_count < 0)
+        )
+        negative_counts = list(self.session.exec(negative_statement).all())
+        for source_image_id, usage_count in negative_counts:
+            logger.error(
+                f"Negative usage_count found for source_image_id={source_image_id} "
+                f"(count: {usage_count}). Correcting from image_slots."
+            )
+
+        actual_count = (
+            select(func.count(ImageSlot.id))
+            .where(ImageSlot.source_image_id == SourceImage.id)
+            .scalar_subquery()
+        )
+        statement = (
+            update(SourceImage)
+            .where(SourceImage.usage_count != actual_count)
+            .values(usage_count=actual_count)
+        )
         result = self.session.exec(statement)
-        
-        updated_count = 0
-        negative_count_found = 0
-        
-        for row in result:
-            source_image_id = row[0]
-            actual_count = row[1]
-            
-            image = self.get(source_image_id)
-            if image:
-                if image.usage_count < 0:
-                    negative_count_found += 1
-                    logger.error(
-                        f"Negative usage_count found for source_image_id={source_image_id}. "
-                        f"Correcting to {actual_count}."
-                    )
-                image.usage_count = actual_count
-                self.session.add(image)
-                updated_count += 1
-        
-        self.session.commit()
-        
+
         return {
-            "total_images": len(all_images),
-            "updated_count": updated_count,
-            "negative_counts_corrected": negative_count_found
+            "total_images": total_images,
+            "updated_count": result.rowcount,
+            "negative_counts_corrected": len(negative_counts)
         }
-
@@ -2,10 +2,12 @@
 Repository for SourceImageTag operations.
 """
 
-from typing import List, Optional
-from sqlmodel import Session, select
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, delete, func, select
 from models import SourceImageTag, Tag
-from .base import Repository
+from .base import STREAM_BATCH_SIZE, Repository, chunked
 
 
 class SourceImageTagRepository(Repository[SourceImageTag]):
@@ -24,81 +26,105 @@ class SourceImageTagRepository(Repository[SourceImageTag]):
         )
         return list(self.session.exec(statement).all())
 
-    def get_source_image_ids_with_tag(self, tag_id: int) -> List[int]:
-        """Get all source image IDs that have a specific tag."""
+    def get_tags_for_source_images(self, source_image_ids: List[int]) -> Dict[int, List[Tag]]:
+        """Get tags for several source images in one join query, keyed by image ID."""
+        tags_by_image: Dict[int, List[Tag]] = defaultdict(list)
+        for ids in chunked(list(dict.fromkeys(source_image_ids))):
+            statement = (
+                select(SourceImageTag.source_image_id, Tag)
+                .join(Tag, Tag.id == SourceImageTag.tag_id)
+                .where(SourceImageTag.source_image_id.in_(ids))
+            )
+            for image_id, tag in self.session.exec(statement):
+                tags_by_image[image_id].append(tag)
+        return {image_id: tags_by_image.get(image_id, []) for image_id in source_image_ids}
+
+    def get_source_image_ids_with_tag(self, tag_id: int) -> Iterator[int]:
+        """
+        Stream all source image IDs that have a specific tag.
+        Rows are fetched in batches, so consume the iterator before the session closes.
+        """
         statement = (
             select(SourceImageTag.source_image_id)
             .where(SourceImageTag.tag_id == tag_id)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
         )
-        return list(self.session.exec(statement).all())
+        yield from self.session.exec(statement)
 
     def get_source_image_ids_with_all_tags(self, tag_ids: List[int]) -> List[int]:
         """Get source image IDs that have ALL specified tags (AND logic)."""
-        if not tag_ids:
+        unique_tag_ids = set(tag_ids)
+        if not unique_tag_ids:
             return []
+        if len(unique_tag_ids) == 1:
+            return list(self.get_source_image_ids_with_tag(tag_ids[0]))
         
-        # Get source images that have each tag
-        # Start with images that have the first tag
+        # Per-tag cardinality from the tag_id index: a tag with no images empties the
+        # intersection, and the rarest tag bounds the rows the grouped query must visit.
+        cardinality_statement = (
+            select(SourceImageTag.tag_id, func.count())
+            .where(SourceImageTag.tag_id.in_(unique_tag_ids))
+            .group_by(SourceImageTag.tag_id)
+            .order_by(func.count())
+        )
+        cardinalities = list(self.session.exec(cardinality_statement).all())
+        if len(cardinalities) < len(unique_tag_ids):
+            return []
+        rarest_tag_id = cardinalities[0][0]
+        
+        candidates = (
+            select(SourceImageTag.source_image_id)
+            .where(SourceImageTag.tag_id == rarest_tag_id)
+        )
+        # One grouped query: candidates whose matching tag rows cover every requested tag
         statement = (
             select(SourceImageTag.source_image_id)
-            .where(SourceImageTag.tag_id == tag_ids[0])
+            .where(SourceImageTag.tag_id.in_(unique_tag_ids))
+            .where(SourceImageTag.source_image_id.in_(candidates))
+            .group_by(SourceImageTag.source_image_id)
+            .having(func.count(func.distinct(SourceImageTag.tag_id)) == len(unique_tag_ids))
         )
-        result_ids = set(self.session.exec(statement).all())
-        
-        # Intersect with images that have each subsequent tag
-        for tag_id in tag_ids[1:]:
-            statement = (
-                select(SourceImageTag.source_image_id)
-                .where(SourceImageTag.tag_id == tag_id)
-            )
-            tag_ids_set = set(self.session.exec(statement).all())
-            result_ids &= tag_ids_set
-        
-        return list(result_ids)
+        return list(self.session.exec(statement).all())
 
     def add_tag_to_source_image(self, source_image_id: int, tag_id: int) -> SourceImageTag:
         """Add a tag to a source image. Returns existing if already exists."""
-        # Check if already exists
+        # Single INSERT ... ON CONFLICT DO NOTHING on the (source_image_id, tag_id) unique constraint
+        statement = (
+            sqlite_insert(SourceImageTag)
+            .values(source_image_id=source_image_id, tag_id=tag_id)
+            .on_conflict_do_nothing(index_elements=["source_image_id", "tag_id"])
+            .returning(SourceImageTag)
+        )
+        association = self.session.exec(statement).scalars().first()
+        if association is not None:
+            return association
+        
+        # Already tagged: nothing was inserted, so return the existing row
         statement = (
             select(SourceImageTag)
             .where(SourceImageTag.source_image_id == source_image_id)
             .where(SourceImageTag.tag_id == tag_id)
         )
-        existing = self.session.exec(statement).first()
-        if existing:
-            return existing
-        
-        # Create new association
-        association = SourceImageTag(
-            source_image_id=source_image_id,
-            tag_id=tag_id
-        )
-        return self.create(association)
+        return self.session.exec(statement).one()
 
     def remove_tag_from_source_image(self, source_image_id: int, tag_id: int) -> bool:
         """Remove a tag from a source image. Returns True if removed, False if not found."""
         statement = (
-            select(SourceImageTag)
+            delete(SourceImageTag)
             .where(SourceImageTag.source_image_id == source_image_id)
             .where(SourceImageTag.tag_id == tag_id)
         )
-        association = self.session.exec(statement).first()
-        if association:
-            self.session.delete(association)
-            self.session.commit()
-            return True
-        return False
+        result = self.session.exec(statement)
+        return result.rowcount > 0
 
     def remove_all_tags_from_source_image(self, source_image_id: int) -> int:
         """Remove all tags from a source image. Returns count of removed tags."""
+        # The session does not need to track the removed rows afterwards
         statement = (
-            select(SourceImageTag)
+            delete(SourceImageTag)
             .where(SourceImageTag.source_image_id == source_image_id)
+            .execution_options(synchronize_session=False)
         )
-        associations = list(self.session.exec(statement).all())
-        count = len(associations)
-        for assoc in associations:
-            self.session.delete(assoc)
-        self.session.commit()
-        return count
+        result = self.session.exec(statement)
+        return result.rowcount
 
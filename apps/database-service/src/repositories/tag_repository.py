@@ -2,10 +2,55 @@
 Repository for Tag operations.
 """
 
-from typing import List, Optional
+import os
+import threading
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+from sqlalchemy import Select, bindparam, event
 from sqlmodel import Session, select
 from models import Tag
-from .base import Repository
+from .base import Repository, chunked
+
+# Seconds a cached tag listing is served before it is reloaded. Tag writes through
+# this repository invalidate it when they commit; the TTL bounds staleness for
+# writes made by other processes.
+TAG_CACHE_TTL = float(os.getenv("TAG_CACHE_TTL", "30"))
+
+# Distinct listings (full list plus search prefixes) kept before the cache is cleared
+TAG_CACHE_MAX_ENTRIES = 64
+
+# Session.info flag for a session holding tag writes that are not committed yet
+_TAGS_CHANGED = "tags_changed"
+
+_cache_lock = threading.Lock()
+_cached_tags: Dict[Hashable, Tuple[float, List[Tag]]] = {}
+# Bumped on every invalidation so a load that raced with a write is not stored
+_cache_version = 0
+
+
+# Built once; only the bound name changes between calls
+_SELECT_BY_NAME = select(Tag).where(Tag.name == bindparam("name"))
+
+
+def invalidate_tag_cache() -> None:
+    """Drop the cached tag listings so the next read queries the database."""
+    global _cache_version
+    with _cache_lock:
+        _cache_version += 1
+        _cached_tags.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_tags_after_commit(session: Session) -> None:
+    """Invalidate the cache once a session that wrote tags has committed."""
+    if session.info.pop(_TAGS_CHANGED, False):
+        invalidate_tag_cache()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_tags_flag_after_rollback(session: Session) -> None:
+    """Rolled-back writes never became visible, so only the flag is cleared."""
+    session.info.pop(_TAGS_CHANGED, None)
 
 
 class TagRepository(Repository[Tag]):
@@ -15,10 +60,82 @@ class TagRepository(Repository[Tag]):
         """Initialize repository."""
         super().__init__(Tag, session)
 
+    def _mark_changed(self) -> None:
+        """Record a tag write so the cache is invalidated on commit."""
+        self.session.info[_TAGS_CHANGED] = True
+        invalidate_tag_cache()
+
+    def create(self, obj: Tag) -> Tag:
+        """Create a new tag."""
+        self._mark_changed()
+        return super().create(obj)
+
+    def bulk_create(self, objs: List[Tag]) -> List[Tag]:
+        """Create multiple tags in a single flush."""
+        self._mark_changed()
+        return super().bulk_create(objs)
+
+    def update(self, obj: Tag) -> Tag:
+        """Update a tag."""
+        self._mark_changed()
+        return super().update(obj)
+
+    def delete(self, id: int) -> bool:
+        """Delete a tag by ID."""
+        self._mark_changed()
+        return super().delete(id)
+
+    def _load_listing(self, statement: Select) -> List[Tag]:
+        """Run a tag column query and build detached Tag copies from the rows."""
+        # Built from plain column values so the copies never expire or lazy-load
+        return [Tag(**row._mapping) for row in self.session.exec(statement)]
+
+    def _cached_listing(self, key: Hashable, statement: Select) -> List[Tag]:
+        """
+        Serve a tag listing from the cache, loading it on a miss.
+
+        Cached tags are detached copies shared between requests; they are for
+        reading and serializing only.
+        """
+        # A session must see its own uncommitted writes, which are never cached
+        if self.session.info.get(_TAGS_CHANGED):
+            return self._load_listing(statement)
+
+        now = time.monotonic()
+        with _cache_lock:
+            entry = _cached_tags.get(key)
+            if entry is not None and now - entry[0] < TAG_CACHE_TTL:
+                return list(entry[1])
+            version = _cache_version
+
+        tags = self._load_listing(statement)
+
+        with _cache_lock:
+            if version == _cache_version:
+                if len(_cached_tags) >= TAG_CACHE_MAX_ENTRIES:
+                    _cached_tags.clear()
+                _cached_tags[key] = (time.monotonic(), tags)
+        return list(tags)
+
     def get_by_name(self, name: str) -> Optional[Tag]:
         """Get tag by name."""
-        statement = select(Tag).where(Tag.name == name)
-        return self.session.exec(statement).first()
+        return self.session.exec(_SELECT_BY_NAME, params={"name": name}).first()
+
+    def get_by_names(self, names: List[str]) -> List[Tag]:
+        """Get the tags matching any of the given names in one query (unknown names are skipped)."""
+        tags: List[Tag] = []
+        for name_chunk in chunked(list(dict.fromkeys(names))):
+            statement = select(Tag).where(Tag.name.in_(name_chunk))
+            tags.extend(self.session.exec(statement).all())
+        return tags
+
+    def get_ids_by_names(self, names: List[str]) -> List[int]:
+        """Get the IDs of the tags matching any of the given names (unknown names are skipped)."""
+        tag_ids: List[int] = []
+        for name_chunk in chunked(list(dict.fromkeys(names))):
+            statement = select(Tag.id).where(Tag.name.in_(name_chunk))
+            tag_ids.extend(self.session.exec(statement).all())
+        return tag_ids
 
     def get_or_create(self, name: str, color: Optional[str] = None) -> Tag:
         """Get existing tag by name or create a new one."""
@@ -30,16 +147,19 @@ class TagRepository(Repository[Tag]):
         return self.create(new_tag)
 
     def search_by_name(self, query: str, limit: int = 20) -> List[Tag]:
-        """Search tags by name prefix (for autocomplete)."""
+        """Search tags by name prefix (for autocomplete), case-insensitively (cached)."""
+        # A NOCASE range is an index seek on ix_tag_name_nocase, unlike ILIKE
+        name = Tag.name.collate("NOCASE")
         statement = (
-            select(Tag)
-            .where(Tag.name.ilike(f"{query}%"))
+            select(Tag.id, Tag.name, Tag.color, Tag.created_at)
+            .where(name >= query)
+            .where(name < query + "\U0010ffff")
+            .order_by(name)
             .limit(limit)
         )
-        return list(self.session.exec(statement).all())
+        return self._cached_listing(("search", query, limit), statement)
 
     def get_all_sorted(self) -> List[Tag]:
-        """Get all tags sorted by name."""
-        statement = select(Tag).order_by(Tag.name)
-        return list(self.session.exec(statement).all())
-
+        """Get all tags sorted by name (cached)."""
+        statement = select(Tag.id, Tag.name, Tag.color, Tag.created_at).order_by(Tag.name)
+        return self._cached_listing(("all",), statement)
@@ -3,9 +3,19 @@ Repository for TVContentMapping operations.
 """
 
 from typing import List, Optional
-from sqlmodel import Session, select
+from sqlalchemy import bindparam
+from sqlmodel import Session, delete, exists, select
 from models import TVContentMapping
-from .base import Repository
+from .base import Repository, chunked
+
+
+# Built once; only the bound values change between calls
+_SELECT_BY_TV_CONTENT_ID = select(TVContentMapping).where(
+    TVContentMapping.tv_content_id == bindparam("tv_content_id")
+)
+_SELECT_BY_GALLERY_IMAGE_ID = select(TVContentMapping).where(
+    TVContentMapping.gallery_image_id == bindparam("gallery_image_id")
+)
 
 
 class TVContentRepository(Repository[TVContentMapping]):
@@ -17,26 +27,32 @@ class TVContentRepository(Repository[TVContentMapping]):
 
     def get_by_tv_content_id(self, tv_content_id: str) -> Optional[TVContentMapping]:
         """Get mapping by TV content ID."""
-        statement = select(TVContentMapping).where(
-            TVContentMapping.tv_content_id == tv_content_id
-        )
-        return self.session.exec(statement).first()
+        return self.session.exec(
+            _SELECT_BY_TV_CONTENT_ID, params={"tv_content_id": tv_content_id}
+        ).first()
+
+    def exists_by_tv_content_id(self, tv_content_id: str) -> bool:
+        """Check whether a mapping exists for a TV content ID without loading it."""
+        statement = select(exists().where(TVContentMapping.tv_content_id == tv_content_id))
+        return self.session.exec(statement).one()
 
     def get_by_gallery_image_id(self, gallery_image_id: int) -> Optional[TVContentMapping]:
         """Get mapping by gallery image ID."""
-        statement = select(TVContentMapping).where(
-            TVContentMapping.gallery_image_id == gallery_image_id
-        )
-        return self.session.exec(statement).first()
+        return self.session.exec(
+            _SELECT_BY_GALLERY_IMAGE_ID, params={"gallery_image_id": gallery_image_id}
+        ).first()
 
     def get_all_by_gallery_image_ids(
         self, gallery_image_ids: List[int]
     ) -> List[TVContentMapping]:
-        """Get all mappings for given gallery image IDs."""
-        statement = select(TVContentMapping).where(
-            TVContentMapping.gallery_image_id.in_(gallery_image_ids)  # type: ignore
-        )
-        return list(self.session.exec(statement).all())
+        """Get all mappings for given gallery image IDs (queried in bounded IN chunks)."""
+        mappings: List[TVContentMapping] = []
+        for ids in chunked(list(dict.fromkeys(gallery_image_ids))):
+            statement = select(TVContentMapping).where(
+                TVContentMapping.gallery_image_id.in_(ids)  # type: ignore
+            )
+            mappings.extend(self.session.exec(statement).all())
+        return mappings
 
     def get_all_app_managed(self) -> List[TVContentMapping]:
         """Get all app-managed mappings (gallery_image_id is not null)."""
@@ -54,10 +70,9 @@ class TVContentRepository(Repository[TVContentMapping]):
 
     def delete_by_tv_content_id(self, tv_content_id: str) -> bool:
         """Delete mapping by TV content ID."""
-        mapping = self.get_by_tv_content_id(tv_content_id)
-        if mapping:
-            self.session.delete(mapping)
-            self.session.commit()
-            return True
-        return False
+        statement = delete(TVContentMapping).where(
+            TVContentMapping.tv_content_id == tv_content_id
+        )
+        result = self.session.exec(statement)
+        return result.rowcount > 0
 
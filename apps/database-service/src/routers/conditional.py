@@ -0,0 +1,119 @@
+"""
+Conditional GET support for listing endpoints.
+
+A listing's ETag hashes the request's query string with two change counters:
+this process's write versions of the tables the listing reads, and a database
+epoch that moves whenever anything commits to the database (this process,
+another worker process, or a script). The epoch comes from PRAGMA data_version
+read on one connection kept outside the pool, so every request compares against
+the same value; checking it costs one PRAGMA, no table reads. Conditional GETs
+need SQLite; other databases get no ETag.
+"""
+
+import hashlib
+import threading
+import uuid
+from typing import Any, Iterable, Optional
+from fastapi import Request, Response
+
+from database import engine
+from repositories.count_cache import invalidate_all_counts, table_version
+from repositories.tag_repository import invalidate_tag_cache
+
+# Write versions restart at zero with the process, so ETags also name the process
+_PROCESS_ID = uuid.uuid4().bytes
+
+# Clients may keep a copy but must revalidate it, so a write is seen on the next fetch
+CACHE_CONTROL = "private, no-cache"
+
+# An in-memory database lives on one connection in this process, so only the
+# table write versions can change it
+_MONITOR_DATA_VERSION = engine.url.database not in (None, "", ":memory:")
+
+_epoch_lock = threading.Lock()
+# DBAPI connection detached from the pool, used only to read PRAGMA data_version
+_monitor_connection: Optional[Any] = None
+_last_data_version: Optional[int] = None
+_database_epoch = 0
+
+
+def _read_data_version() -> int:
+    """Read PRAGMA data_version on the monitor connection, opening it on first use."""
+    global _monitor_connection
+    if _monitor_connection is None:
+        connection = engine.raw_connection()
+        # Detached, so it never holds a pool slot or serves a request
+        connection.detach()
+        _monitor_connection = connection
+    cursor = _monitor_connection.cursor()
+    try:
+        cursor.execute("PRAGMA data_version")
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+
+def _current_database_epoch() -> int:
+    """
+    Return the database epoch, first moving it on if anything has committed
+    since the last check.
+
+    PRAGMA data_version changes whenever a connection other than the reading one
+    commits. The monitor connection never writes, so every commit (from this
+    process's pooled connections or from outside) moves the epoch, once per
+    check however many commits happened in between.
+    """
+    global _last_data_version, _database_epoch
+    if not _MONITOR_DATA_VERSION:
+        return _database_epoch
+    with _epoch_lock:
+        data_version = _read_data_version()
+        if data_version == _last_data_version:
+            return _database_epoch
+        # The first check also moves it, as there is no earlier value to compare
+        _last_data_version = data_version
+        _database_epoch += 1
+        epoch = _database_epoch
+    # Cached counts and tag listings may predate an outside commit; left in place,
+    # they could be served under the new ETag and then kept alive by 304s
+    invalidate_all_counts()
+    invalidate_tag_cache()
+    return epoch
+
+
+def _listing_etag(request: Request, tables: Iterable[str]) -> str:
+    """Build the weak ETag for a listing over the given tables."""
+    digest = hashlib.blake2b(_PROCESS_ID, digest_size=16)
+    digest.update(f"db:{_current_database_epoch()};".encode())
+    for table in tables:
+        digest.update(f"{table}:{table_version(table)};".encode())
+    digest.update(request.url.query.encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def not_modified(
+    request: Request, response: Response, tables: Iterable[str]
+) -> Optional[Response]:
+    """
+    Set ETag and Cache-Control on the response. Returns a 304 response to send
+    instead when If-None-Match already names the current ETag, else None.
+
+    Call it before the listing is read, so the ETag never names newer data than
+    the body it is sent with.
+    """
+    if engine.dialect.name != "sqlite":
+        return None
+    etag = _listing_etag(request, tables)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return None
+    # Weak comparison: W/ prefixes are ignored on both sides
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in candidates or etag.removeprefix("W/") in candidates:
+        return Response(
+            status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+    return None
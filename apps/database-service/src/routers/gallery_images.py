@@ -2,17 +2,20 @@
 API router for GalleryImage endpoints.
 """
 
+import asyncio
 import logging
 import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Any, Dict
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select
-from pydantic import BaseModel
+from sqlmodel import Session, func
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy.orm.attributes import set_committed_value
 
 from database import get_session
-from models import GalleryImage, ImageSlot, Tag, SourceImage, MetadataSnapshot
+from models import GalleryImage, ImageSlot, Tag, EXIFMetadata, MetadataSnapshot
 from repositories import (
     GalleryImageRepository, 
     SourceImageRepository,
@@ -22,13 +25,16 @@ from repositories import (
 
 logger = logging.getLogger(__name__)
 
+# Computed once at import; relative data paths are anchored two levels above it
+_SCRIPT_DIR = Path(__file__).parent.parent.parent.parent.absolute()
 
+
+@lru_cache(maxsize=1)
 def _get_data_path() -> Path:
-    """Get the absolute data directory path."""
+    """Get the absolute data directory path (resolved once per process)."""
     data_path = Path(os.getenv("DATA_PATH", "../../data")).resolve()
-    script_dir = Path(__file__).parent.parent.parent.parent.absolute()
     if not data_path.is_absolute():
-        data_path = script_dir.parent.parent / data_path
+        data_path = _SCRIPT_DIR.parent.parent / data_path
     return data_path
 
 
@@ -48,6 +54,13 @@ def _delete_file_from_disk(filepath: str) -> bool:
         logger.error(f"Failed to delete file {filepath}: {e}")
         return False
 
+
+async def _delete_files_from_disk(filepaths: List[str]) -> List[bool]:
+    """Delete files from disk concurrently on worker threads, keeping the event loop free."""
+    return await asyncio.gather(
+        *(asyncio.to_thread(_delete_file_from_disk, filepath) for filepath in filepaths)
+    )
+
 router = APIRouter(prefix="/gallery-images", tags=["gallery-images"])
 
 
@@ -69,6 +82,8 @@ class GalleryImageCreate(BaseModel):
 
 class GalleryImageWithSlots(BaseModel):
     """Gallery image with slots."""
+    model_config = ConfigDict(from_attributes=True)
+
     id: Optional[int] = None
     filename: str
     filepath: str
@@ -79,123 +94,125 @@ class GalleryImageWithSlots(BaseModel):
     slots: List[ImageSlot] = []
 
 
+def _with_slots(image: GalleryImage, slots: List[ImageSlot]) -> GalleryImageWithSlots:
+    """Build the response from a gallery image and the slots already in hand."""
+    # Attach the slots as the loaded collection so validation does not lazy-load them
+    set_committed_value(image, "slots", slots)
+    return GalleryImageWithSlots.model_validate(image)
+
+
 class PaginatedResponse(BaseModel):
     """Paginated response model."""
     items: List[GalleryImage]
     total: int
     page: int
     pages: int
+    next_cursor: Optional[int] = None  # Pass as ?cursor= to fetch the following page
+    item_tags: Optional[Dict[int, List[Tag]]] = None  # Tags per item id, with include_tags=true
 
 
-def _create_metadata_snapshot(source_image: SourceImage) -> MetadataSnapshot:
-    """Create a MetadataSnapshot from a SourceImage."""
-    exif_metadata = source_image.get_exif_metadata()
+def _create_metadata_snapshot(
+    filename: str,
+    filepath: str,
+    date_taken: Optional[datetime],
+    exif_metadata: Optional[Dict[str, Any]],
+) -> MetadataSnapshot:
+    """Create a MetadataSnapshot from a source image's snapshot columns."""
     return MetadataSnapshot(
-        filename=source_image.filename,
-        filepath=source_image.filepath,
-        date_taken=source_image.date_taken,
-        exif_metadata=exif_metadata,
+        filename=filename,
+        filepath=filepath,
+        date_taken=date_taken,
+        # Stored blobs were validated when written, as in SourceImage.get_exif_metadata
+        exif_metadata=EXIFMetadata.model_construct(**exif_metadata) if exif_metadata is not None else None,
     )
 
 
 @router.get("", response_model=PaginatedResponse)
-async def list_gallery_images(
+def list_gallery_images(
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
     tags: Optional[str] = Query(None, description="Comma-separated list of tag names to filter by"),
-    session: Session = Depends(get_session),
+    cursor: Optional[int] = Query(
+        None, ge=0, description="Keyset pagination: return images after this id (next_cursor of the previous page); replaces page"
+    ),
+    include_tags: bool = Query(
+        False, description="Also return each item's tags in item_tags (one batch query)"
+    ),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """List gallery images with pagination and optional tag filtering."""
     repo = GalleryImageRepository(session)
     skip = (page - 1) * limit
+    tag_ids = None
     
     # Handle tag filtering
     if tags:
         tag_names = [t.strip() for t in tags.split(",") if t.strip()]
         if tag_names:
             tag_repo = TagRepository(session)
-            tag_objs = []
-            for name in tag_names:
-                tag = tag_repo.get_by_name(name)
-                if tag:
-                    tag_objs.append(tag)
-            
-            if tag_objs:
-                tag_ids = [t.id for t in tag_objs]
-                gallery_tag_repo = GalleryImageTagRepository(session)
-                gallery_image_ids = gallery_tag_repo.get_gallery_image_ids_with_all_tags(tag_ids)
-                
-                # If no images match the tags, return empty
-                if not gallery_image_ids:
-                    return PaginatedResponse(
-                        items=[],
-                        total=0,
-                        page=page,
-                        pages=1,
-                    )
-                
-                # Filter by matching IDs
-                statement = (
-                    select(GalleryImage)
-                    .where(GalleryImage.id.in_(gallery_image_ids))
-                    .offset(skip)
-                    .limit(limit)
-                )
-                items = list(session.exec(statement).all())
-                total = len(gallery_image_ids)
-                pages = (total + limit - 1) // limit if total > 0 else 1
-                
-                return PaginatedResponse(
-                    items=items,
-                    total=total,
-                    page=page,
-                    pages=pages,
-                )
-    
-    # No tag filter - return all
-    items = repo.get_all(skip=skip, limit=limit)
-    total = repo.count()
+            # Unknown names are ignored; if none are known, no tag filter applies
+            tag_ids = tag_repo.get_ids_by_names(tag_names) or None
+    
+    # One extra row tells whether another page follows
+    if tag_ids is not None:
+        # Tag match and paging run in SQL; only this page of images is loaded
+        items = repo.get_page_with_all_tags(
+            tag_ids, limit + 1, skip=0 if cursor is not None else skip, after_id=cursor
+        )
+    elif cursor is not None:
+        items = repo.get_page_after(cursor, limit + 1)
+    else:
+        # Same id order as the cursor path, so next_cursor from an offset page is valid
+        items = repo.get_page(skip, limit + 1)
+    
+    has_more = len(items) > limit
+    next_cursor = items[limit - 1].id if has_more else None
+    items = items[:limit]
+    
+    if cursor is None and not has_more and (items or skip == 0):
+        # The last page of an offset listing ends the result, so no COUNT is needed
+        total = skip + len(items)
+    else:
+        total = repo.count_with_all_tags(tag_ids) if tag_ids is not None else repo.count()
     pages = (total + limit - 1) // limit if total > 0 else 1
     
+    # Tags for the whole page come from one join query instead of a request per image
+    item_tags = None
+    if include_tags:
+        item_tags = GalleryImageTagRepository(session).get_tags_for_gallery_images(
+            [item.id for item in items]
+        )
+    
     return PaginatedResponse(
         items=items,
         total=total,
         page=page,
         pages=pages,
+        next_cursor=next_cursor,
+        item_tags=item_tags,
     )
 
 
 @router.get("/{id}", response_model=GalleryImageWithSlots)
-async def get_gallery_image(
+def get_gallery_image(
     id: int,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Get a single gallery image by ID with its slots."""
     repo = GalleryImageRepository(session)
-    image = repo.get(id)
+    # Slots are loaded with the image (one selectin query), ordered by slot number
+    image = repo.get_with_slots(id)
     if not image:
         raise HTTPException(status_code=404, detail="Gallery image not found")
     
-    # Get slots for this image
-    slots = repo.get_slots(id)
-    
-    # Construct response model
-    return GalleryImageWithSlots(
-        id=image.id,
-        filename=image.filename,
-        filepath=image.filepath,
-        template_id=image.template_id,
-        notes=image.notes,
-        created_at=image.created_at,
-        updated_at=image.updated_at,
-        slots=slots,
-    )
+    # Read straight from the ORM object (from_attributes), slots included
+    return GalleryImageWithSlots.model_validate(image)
 
 
 @router.post("", response_model=GalleryImageWithSlots, status_code=201)
-async def create_gallery_image(
+def create_gallery_image(
     request: GalleryImageCreate,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Create a new gallery image with slots."""
     
@@ -218,6 +235,11 @@ async def create_gallery_image(
         # Track source image IDs for usage count updates
         source_image_ids_to_increment = []
         
+        # Load the snapshot columns of every referenced source image in one query
+        snapshot_data = source_repo.get_snapshot_data(
+            [slot.source_image_id for slot in request.slots if slot.source_image_id]
+        )
+        
         # Create slots
         created_slots = []
         for slot_data in request.slots:
@@ -231,45 +253,33 @@ async def create_gallery_image(
             
             # Populate metadata snapshot if source_image_id is set
             if slot_data.source_image_id:
-                source_image = source_repo.get(slot_data.source_image_id)
-                if source_image:
-                    snapshot = _create_metadata_snapshot(source_image)
+                source_data = snapshot_data.get(slot_data.source_image_id)
+                if source_data:
+                    snapshot = _create_metadata_snapshot(*source_data)
                     slot.set_metadata_snapshot(snapshot)
                     source_image_ids_to_increment.append(slot_data.source_image_id)
             
-            session.add(slot)
             created_slots.append(slot)
         
-        session.commit()
-        logger.info("Committed gallery image and slots to database")
-        
-        # Refresh slots to get IDs
-        for slot in created_slots:
-            session.refresh(slot)
+        # One flush inserts every slot; ids and timestamps come back via RETURNING
+        session.add_all(created_slots)
+        session.flush()
+        logger.info("Flushed gallery image and slots to database")
         
         # Increment usage counts
         source_repo.batch_increment_usage(source_image_ids_to_increment)
         
-        return GalleryImageWithSlots(
-            id=created_image.id,
-            filename=created_image.filename,
-            filepath=created_image.filepath,
-            template_id=created_image.template_id,
-            notes=created_image.notes,
-            created_at=created_image.created_at,
-            updated_at=created_image.updated_at,
-            slots=created_slots,
-        )
+        return _with_slots(created_image, created_slots)
     except Exception as e:
         logger.exception(f"Error creating gallery image: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.put("/{id}", response_model=GalleryImageWithSlots)
-async def update_gallery_image(
+def update_gallery_image(
     id: int,
     request: GalleryImageCreate,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Update a gallery image and its slots."""
     repo = GalleryImageRepository(session)
@@ -288,7 +298,9 @@ async def update_gallery_image(
     existing.filepath = request.filepath
     existing.template_id = request.template_id
     existing.notes = request.notes
-    existing.updated_at = datetime.utcnow()
+    # Stamped by the database in the UPDATE itself; assigning it also forces the
+    # UPDATE when only the slots changed
+    existing.updated_at = func.now()
     
     session.add(existing)
     
@@ -299,6 +311,11 @@ async def update_gallery_image(
     # Track new source image IDs
     new_source_ids = set()
     
+    # Load the snapshot columns of every referenced source image in one query
+    snapshot_data = source_repo.get_snapshot_data(
+        [slot.source_image_id for slot in request.slots if slot.source_image_id]
+    )
+    
     # Create new slots
     created_slots = []
     for slot_data in request.slots:
@@ -311,20 +328,17 @@ async def update_gallery_image(
         
         # Populate metadata snapshot if source_image_id is set
         if slot_data.source_image_id:
-            source_image = source_repo.get(slot_data.source_image_id)
-            if source_image:
-                snapshot = _create_metadata_snapshot(source_image)
+            source_data = snapshot_data.get(slot_data.source_image_id)
+            if source_data:
+                snapshot = _create_metadata_snapshot(*source_data)
                 slot.set_metadata_snapshot(snapshot)
                 new_source_ids.add(slot_data.source_image_id)
         
-        session.add(slot)
         created_slots.append(slot)
     
-    session.commit()
-    
-    # Refresh slots to get IDs
-    for slot in created_slots:
-        session.refresh(slot)
+    # One flush inserts every slot; ids and timestamps come back via RETURNING
+    session.add_all(created_slots)
+    session.flush()
     
     # Update usage counts: decrement for removed, increment for added
     ids_to_decrement = list(old_source_ids - new_source_ids)
@@ -333,53 +347,52 @@ async def update_gallery_image(
     source_repo.batch_decrement_usage(ids_to_decrement)
     source_repo.batch_increment_usage(ids_to_increment)
     
-    session.refresh(existing)
-    
-    return GalleryImageWithSlots(
-        id=existing.id,
-        filename=existing.filename,
-        filepath=existing.filepath,
-        template_id=existing.template_id,
-        notes=existing.notes,
-        created_at=existing.created_at,
-        updated_at=existing.updated_at,
-        slots=created_slots,
-    )
+    # No refresh: the fields were just set, and updated_at came back via RETURNING
+    return _with_slots(existing, created_slots)
 
 
-@router.delete("/{id}", status_code=204)
-async def delete_gallery_image(
-    id: int,
-    session: Session = Depends(get_session),
-):
-    """Delete a gallery image, its file from disk, and decrement usage counts."""
+def _delete_gallery_rows(session: Session, ids: List[int]) -> Dict[int, str]:
+    """
+    Delete gallery images and their slots, and decrement source usage counts.
+    Returns the filepath of each image that existed, keyed by ID.
+    """
     repo = GalleryImageRepository(session)
     source_repo = SourceImageRepository(session)
     
-    existing = repo.get(id)
-    if not existing:
-        raise HTTPException(status_code=404, detail="Gallery image not found")
+    # One query validates existence and collects filepaths for every requested image
+    filepaths = repo.get_filepaths(ids)
     
-    # Delete the file from disk first
-    _delete_file_from_disk(existing.filepath)
+    # Delete slots and gallery images with bulk DELETEs (committed with the request transaction)
+    source_image_ids = repo.delete_many_with_slots(list(filepaths))
     
-    # Get slots to track source image IDs
-    slots = repo.get_slots(id)
-    source_image_ids = [slot.source_image_id for slot in slots if slot.source_image_id]
+    # Decrement usage counts for all affected source images
+    source_repo.batch_decrement_usage(source_image_ids)
     
-    # Delete the gallery image (will cascade to slots if configured, or manually delete)
-    for slot in slots:
-        session.delete(slot)
-    session.delete(existing)
-    session.commit()
+    return filepaths
+
+
+@router.delete("/{id}", status_code=204)
+async def delete_gallery_image(
+    id: int,
+    session: Session = Depends(get_session, scope="function"),
+):
+    """Delete a gallery image, its file from disk, and decrement usage counts."""
+    # Database work runs on a worker thread so the synchronous session does not block the event loop
+    filepaths = await asyncio.to_thread(_delete_gallery_rows, session, [id])
+    if id not in filepaths:
+        raise HTTPException(status_code=404, detail="Gallery image not found")
     
-    # Decrement usage counts
-    source_repo.batch_decrement_usage(source_image_ids)
+    # Delete the file from disk (on a worker thread)
+    await asyncio.to_thread(_delete_file_from_disk, filepaths[id])
+
+
+# Largest number of gallery images one delete-multiple request may name
+MAX_DELETE_BATCH = 1000
 
 
 class DeleteMultipleRequest(BaseModel):
     """Request model for deleting multiple gallery images."""
-    ids: List[int]
+    ids: List[int] = Field(..., max_length=MAX_DELETE_BATCH)
 
 
 class DeleteMultipleResponse(BaseModel):
@@ -392,63 +405,37 @@ class DeleteMultipleResponse(BaseModel):
 @router.post("/delete-multiple", response_model=DeleteMultipleResponse)
 async def delete_multiple_gallery_images(
     request: DeleteMultipleRequest,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Delete multiple gallery images, their files from disk, and decrement usage counts."""
-    repo = GalleryImageRepository(session)
-    source_repo = SourceImageRepository(session)
+    # Database work runs on a worker thread so the synchronous session does not block the event loop
+    filepaths = await asyncio.to_thread(_delete_gallery_rows, session, request.ids)
     
-    deleted = 0
-    failed = 0
+    # Duplicate IDs are reported as not found after their first occurrence
     errors: List[str] = []
-    all_source_image_ids: List[int] = []
-    
+    seen: set = set()
     for image_id in request.ids:
-        try:
-            existing = repo.get(image_id)
-            if not existing:
-                failed += 1
-                errors.append(f"Image {image_id} not found")
-                continue
-            
-            # Delete the file from disk
-            _delete_file_from_disk(existing.filepath)
-            
-            # Get slots to track source image IDs
-            slots = repo.get_slots(image_id)
-            source_image_ids = [slot.source_image_id for slot in slots if slot.source_image_id]
-            all_source_image_ids.extend(source_image_ids)
-            
-            # Delete slots and gallery image
-            for slot in slots:
-                session.delete(slot)
-            session.delete(existing)
-            deleted += 1
-            
-        except Exception as e:
-            failed += 1
-            errors.append(f"Failed to delete image {image_id}: {str(e)}")
-            logger.exception(f"Error deleting gallery image {image_id}")
-    
-    # Commit all deletions
-    session.commit()
+        if image_id not in filepaths or image_id in seen:
+            errors.append(f"Image {image_id} not found")
+        seen.add(image_id)
     
-    # Decrement usage counts for all affected source images
-    source_repo.batch_decrement_usage(all_source_image_ids)
+    # Delete the files from disk concurrently
+    await _delete_files_from_disk(list(filepaths.values()))
     
+    deleted = len(filepaths)
+    failed = len(errors)
     return DeleteMultipleResponse(deleted=deleted, failed=failed, errors=errors)
 
 
 # Tag endpoints for gallery images
 @router.get("/{id}/tags", response_model=List[Tag])
-async def get_gallery_image_tags(
+def get_gallery_image_tags(
     id: int,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Get all tags for a gallery image."""
     repo = GalleryImageRepository(session)
-    image = repo.get(id)
-    if not image:
+    if not repo.exists(id):
         raise HTTPException(status_code=404, detail="Gallery image not found")
     
     tag_repo = GalleryImageTagRepository(session)
@@ -462,15 +449,14 @@ class AddTagRequest(BaseModel):
 
 
 @router.post("/{id}/tags", response_model=Tag, status_code=201)
-async def add_tag_to_gallery_image(
+def add_tag_to_gallery_image(
     id: int,
     request: AddTagRequest,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Add a tag to a gallery image. Creates tag if it doesn't exist."""
     repo = GalleryImageRepository(session)
-    image = repo.get(id)
-    if not image:
+    if not repo.exists(id):
         raise HTTPException(status_code=404, detail="Gallery image not found")
     
     # Get or create tag
@@ -485,15 +471,14 @@ async def add_tag_to_gallery_image(
 
 
 @router.delete("/{id}/tags/{tag_id}", status_code=204)
-async def remove_tag_from_gallery_image(
+def remove_tag_from_gallery_image(
     id: int,
     tag_id: int,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Remove a tag from a gallery image."""
     repo = GalleryImageRepository(session)
-    image = repo.get(id)
-    if not image:
+    if not repo.exists(id):
         raise HTTPException(status_code=404, detail="Gallery image not found")
     
     gallery_tag_repo = GalleryImageTagRepository(session)
@@ -2,45 +2,141 @@
 API router for album scanner endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from sqlmodel import Session
 from pydantic import BaseModel
 from pathlib import Path
 import os
 
-from database import get_session
+from database import engine
 from scanner import scan_albums_directory
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/source-images", tags=["source-images"])
 
+# Computed once at import; relative data paths are anchored two levels above it
+_SCRIPT_DIR = Path(__file__).parent.parent.parent.parent.absolute()
+
+# Finished scans kept for status lookups before the oldest is forgotten
+MAX_TRACKED_SCANS = 20
+
+
+class ScanStatus(BaseModel):
+    """Status of a background album scan; counts grow while it runs."""
+    scan_id: str
+    state: str  # "running", "completed" or "failed"
+    scanned: int = 0
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    error: Optional[str] = None
 
-class ScanResponse(BaseModel):
-    """Response model for scan operation."""
-    scanned: int
-    added: int
-    updated: int
-    deleted: int
 
+_scans_lock = threading.Lock()
+_scans: "OrderedDict[str, ScanStatus]" = OrderedDict()
+_running_scan_id: Optional[str] = None
 
-@router.post("/scan", response_model=ScanResponse)
-async def trigger_scan(
-    session: Session = Depends(get_session),
-):
-    """Trigger album directory scan."""
-    # Get paths from environment
+
+def _get_scan_paths() -> tuple:
+    """Return the absolute (albums_path, data_path) from the environment."""
     data_path = Path(os.getenv("DATA_PATH", "../../data")).resolve()
     albums_path = data_path / "albums"
-    
+
     # Ensure absolute paths
-    script_dir = Path(__file__).parent.parent.parent.parent.absolute()
     if not data_path.is_absolute():
-        data_path = script_dir.parent.parent / data_path
+        data_path = _SCRIPT_DIR.parent.parent / data_path
     if not albums_path.is_absolute():
-        albums_path = script_dir.parent.parent / albums_path
-    
+        albums_path = _SCRIPT_DIR.parent.parent / albums_path
+    return albums_path, data_path
+
+
+def _update_scan(scan_id: str, **fields) -> None:
+    """Apply field updates to a tracked scan's status."""
+    with _scans_lock:
+        status = _scans[scan_id]
+        for name, value in fields.items():
+            setattr(status, name, value)
+
+
+def _run_scan(scan_id: str) -> None:
+    """Run a scan in its own session (committed per batch), recording progress as it goes."""
+    global _running_scan_id
     try:
-        result = scan_albums_directory(albums_path, data_path, session)
-        return ScanResponse(**result)
+        albums_path, data_path = _get_scan_paths()
+        with Session(engine) as session:
+            result = scan_albums_directory(
+                albums_path,
+                data_path,
+                session,
+                progress=lambda counts: _update_scan(scan_id, **counts),
+            )
+            session.commit()
+        _update_scan(scan_id, state="completed", **result)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Scan failed: {str(e)}")
+        logger.exception(f"Album scan {scan_id} failed")
+        _update_scan(scan_id, state="failed", error=f"Scan failed: {str(e)}")
+    finally:
+        with _scans_lock:
+            _running_scan_id = None
+
+
+def _claim_scan() -> Tuple[ScanStatus, bool]:
+    """
+    Register a new running scan, unless one is already running.
+    Returns (status, started): the new scan's status, or the running scan's.
+    """
+    global _running_scan_id
+    with _scans_lock:
+        if _running_scan_id is not None:
+            return _scans[_running_scan_id].model_copy(), False
+
+        scan_id = uuid.uuid4().hex
+        _running_scan_id = scan_id
+        _scans[scan_id] = ScanStatus(scan_id=scan_id, state="running")
+        while len(_scans) > MAX_TRACKED_SCANS:
+            _scans.popitem(last=False)
+        return _scans[scan_id].model_copy(), True
+
+
+def run_scan_now() -> Optional[ScanStatus]:
+    """
+    Run a tracked scan in the calling thread (used for the startup scan), so a
+    scan requested meanwhile reports this one instead of running alongside it.
+    Returns the final status, or None if another scan was already running.
+    """
+    status, started = _claim_scan()
+    if not started:
+        return None
+    _run_scan(status.scan_id)
+    with _scans_lock:
+        return _scans[status.scan_id].model_copy()
+
+
+@router.post("/scan", response_model=ScanStatus, status_code=202)
+def trigger_scan(background_tasks: BackgroundTasks):
+    """
+    Start an album directory scan in the background.
+    Poll GET /source-images/scan/{scan_id} for progress. While a scan is
+    running, the running scan's status is returned instead of starting another.
+    """
+    status, started = _claim_scan()
+    if started:
+        background_tasks.add_task(_run_scan, status.scan_id)
+    return status
+
 
+@router.get("/scan/{scan_id}", response_model=ScanStatus)
+def get_scan_status(scan_id: str):
+    """Get the progress or result of an album scan."""
+    with _scans_lock:
+        status = _scans.get(scan_id)
+        if status is None:
+            raise HTTPException(status_code=404, detail="Scan not found")
+        return status.model_copy()
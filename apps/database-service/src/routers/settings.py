@@ -25,8 +25,8 @@ class SettingValue(BaseModel):
 
 
 @router.get("", response_model=SettingsResponse)
-async def get_all_settings(
-    session: Session = Depends(get_session),
+def get_all_settings(
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Get all settings."""
     repo = SettingsRepository(session)
@@ -35,9 +35,9 @@ async def get_all_settings(
 
 
 @router.get("/{key}", response_model=SettingValue)
-async def get_setting(
+def get_setting(
     key: str,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Get a setting by key."""
     repo = SettingsRepository(session)
@@ -48,10 +48,10 @@ async def get_setting(
 
 
 @router.put("/{key}", response_model=Settings)
-async def update_setting(
+def update_setting(
     key: str,
     setting_value: SettingValue,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Update or create a setting."""
     repo = SettingsRepository(session)
@@ -2,17 +2,35 @@
 API router for SourceImage endpoints.
 """
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session
 from pydantic import BaseModel
 
 from database import get_session
-from models import SourceImage, Tag
-from repositories import SourceImageRepository, TagRepository, SourceImageTagRepository
+from models import Album, SourceImage, SourceImageTag, Tag
+from repositories import (
+    AlbumRepository,
+    SourceImageRepository,
+    TagRepository,
+    SourceImageTagRepository,
+)
+from .conditional import not_modified
 
 router = APIRouter(prefix="/source-images", tags=["source-images"])
 
+# Tables a listing can read (album and tag filters, include_tags), for its ETag
+_LISTING_TABLES = (
+    SourceImage.__tablename__,
+    SourceImageTag.__tablename__,
+    Tag.__tablename__,
+    Album.__tablename__,
+)
+
 
 class SourceImageResponse(BaseModel):
     """Source image response model with computed is_used field."""
@@ -28,13 +46,26 @@ class SourceImageResponse(BaseModel):
     updated_at: str
 
 
+class SourceImageUpdate(BaseModel):
+    """Input model for updating source images; only fields sent are written."""
+
+    filename: Optional[str] = None
+    filepath: Optional[str] = None
+    date_taken: Optional[datetime] = None
+    is_deleted: Optional[bool] = None
+    exif_metadata: Optional[Dict[str, Any]] = None
+
+
 class PaginatedResponse(BaseModel):
     """Paginated response model."""
 
     items: List[SourceImageResponse]
-    total: int
+    total: Optional[int] = None  # Only computed with include_total=true
     page: int
-    pages: int
+    pages: Optional[int] = None  # Only computed with include_total=true
+    has_more: bool = False  # Whether another page follows this one
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the following page
+    item_tags: Optional[Dict[int, List[Tag]]] = None  # Tags per item id, with include_tags=true
 
 
 class RecalculateUsageResponse(BaseModel):
@@ -46,8 +77,47 @@ class RecalculateUsageResponse(BaseModel):
     negative_counts_corrected: int
 
 
+def _to_response(image: SourceImage) -> SourceImageResponse:
+    """Build the response for a stored image (trusted row data, so validation is skipped)."""
+    date_taken = image.date_taken
+    created_at = image.created_at
+    updated_at = image.updated_at
+    return SourceImageResponse.model_construct(
+        id=image.id,
+        filename=image.filename,
+        filepath=image.filepath,
+        date_taken=date_taken.isoformat() if date_taken else None,
+        is_deleted=image.is_deleted,
+        usage_count=image.usage_count,
+        is_used=image.is_used,
+        created_at=created_at.isoformat() if created_at else "",
+        updated_at=updated_at.isoformat() if updated_at else "",
+    )
+
+
+def _encode_cursor(cursor: Tuple[Any, int]) -> str:
+    """Encode a (sort value, id) keyset cursor as an opaque URL-safe token."""
+    value, id = cursor
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([value, id]).encode()).decode()
+
+
+def _decode_cursor(token: str, sort_by: str) -> Tuple[Any, int]:
+    """Decode a token from _encode_cursor; raises 400 if it is malformed."""
+    try:
+        value, id = json.loads(base64.urlsafe_b64decode(token.encode()))
+        if value is not None and sort_by in ("date_taken", "created_at"):
+            value = datetime.fromisoformat(value)
+        return value, int(id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("", response_model=PaginatedResponse)
-async def list_source_images(
+def list_source_images(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
     used: Optional[bool] = Query(
@@ -58,7 +128,7 @@ async def list_source_images(
     ),
     album: Optional[str] = Query(
         None,
-        description="Filter by album name (matches filepath starting with albums/{album}/)",
+        description="Filter by album name (images under albums/{album}/)",
     ),
     sort_by: Optional[str] = Query(
         "date_taken",
@@ -67,7 +137,18 @@ async def list_source_images(
     sort_order: Optional[str] = Query(
         "desc", description="Sort direction: desc (default), asc"
     ),
-    session: Session = Depends(get_session),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset pagination: next_cursor of the previous page (same filters and sort); replaces page",
+    ),
+    include_tags: bool = Query(
+        False, description="Also return each item's tags in item_tags (one batch query)"
+    ),
+    include_total: bool = Query(
+        False,
+        description="Also return total and pages (may cost a COUNT query); use has_more to page otherwise",
+    ),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """List source images with pagination and optional filtering."""
     import logging
@@ -75,12 +156,26 @@ async def list_source_images(
 
     logger = logging.getLogger(__name__)
 
+    # Nothing the listing reads has changed since the client's copy
+    cached = not_modified(request, response, _LISTING_TABLES)
+    if cached is not None:
+        return cached
+
     try:
         repo = SourceImageRepository(session)
         skip = (page - 1) * limit
 
-        # Build filepath prefix for album filtering
-        filepath_prefix = f"albums/{album}/" if album else None
+        # Resolve the album name once; the listing filters on the indexed album_id
+        album_id = None
+        if album:
+            album_id = AlbumRepository(session).get_id_by_name(album)
+            if album_id is None:
+                return PaginatedResponse(
+                    items=[],
+                    total=0 if include_total else None,
+                    page=page,
+                    pages=1 if include_total else None,
+                )
 
         logger.info(
             f"[source-images] Listing images: page={page}, limit={limit}, album={album}, sort_by={sort_by}, sort_order={sort_order}"
@@ -99,14 +194,10 @@ async def list_source_images(
             tag_names = [t.strip() for t in tags.split(",") if t.strip()]
             if tag_names:
                 tag_repo = TagRepository(session)
-                tag_objs = []
-                for name in tag_names:
-                    tag = tag_repo.get_by_name(name)
-                    if tag:
-                        tag_objs.append(tag)
-
-                if tag_objs:
-                    tag_ids = [t.id for t in tag_objs]
+                # One IN query resolves every tag name
+                tag_ids = tag_repo.get_ids_by_names(tag_names)
+
+                if tag_ids:
                     source_tag_repo = SourceImageTagRepository(session)
                     source_image_ids = (
                         source_tag_repo.get_source_image_ids_with_all_tags(tag_ids)
@@ -116,52 +207,65 @@ async def list_source_images(
                     if not source_image_ids:
                         return PaginatedResponse(
                             items=[],
-                            total=0,
+                            total=0 if include_total else None,
                             page=page,
-                            pages=1,
+                            pages=1 if include_total else None,
                         )
 
+        # One extra row tells whether another page follows
         items = repo.get_all_not_deleted_filtered(
-            skip=skip,
-            limit=limit,
+            skip=0 if cursor else skip,
+            limit=limit + 1,
             used=used,
             source_image_ids=source_image_ids,
-            filepath_prefix=filepath_prefix,
+            album_id=album_id,
             order_by=sort_by,
             order_direction=sort_order,
+            cursor=_decode_cursor(cursor, sort_by) if cursor else None,
         )
+        next_cursor = None
+        has_more = len(items) > limit
+        if has_more:
+            items = items[:limit]
+            next_cursor = _encode_cursor(repo.page_cursor(items, sort_by))
 
         logger.info(f"[source-images] Found {len(items)} items")
 
-        total = repo.count_not_deleted_filtered(
-            used=used,
-            source_image_ids=source_image_ids,
-            filepath_prefix=filepath_prefix,
-        )
-        pages = (total + limit - 1) // limit if total > 0 else 1
+        total = None
+        pages = None
+        if include_total:
+            if not cursor and not has_more and (items or skip == 0):
+                # The last page of an offset listing ends the result, so no COUNT is needed
+                total = skip + len(items)
+            else:
+                total = repo.count_not_deleted_filtered(
+                    used=used,
+                    source_image_ids=source_image_ids,
+                    album_id=album_id,
+                )
+            pages = (total + limit - 1) // limit if total > 0 else 1
 
         # Convert to response model with is_used computed
-        response_items = [
-            SourceImageResponse(
-                id=item.id,
-                filename=item.filename,
-                filepath=item.filepath,
-                date_taken=item.date_taken.isoformat() if item.date_taken else None,
-                is_deleted=item.is_deleted,
-                usage_count=item.usage_count,
-                is_used=item.is_used,
-                created_at=item.created_at.isoformat() if item.created_at else "",
-                updated_at=item.updated_at.isoformat() if item.updated_at else "",
+        response_items = [_to_response(item) for item in items]
+
+        # Tags for the whole page come from one join query instead of a request per image
+        item_tags = None
+        if include_tags:
+            item_tags = SourceImageTagRepository(session).get_tags_for_source_images(
+                [item.id for item in items]
             )
-            for item in items
-        ]
 
-        return PaginatedResponse(
+        return PaginatedResponse.model_construct(
             items=response_items,
             total=total,
             page=page,
             pages=pages,
+            has_more=has_more,
+            next_cursor=next_cursor,
+            item_tags=item_tags,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[source-images] Error listing images: {e}")
         logger.error(f"[source-images] Traceback: {traceback.format_exc()}")
@@ -169,9 +273,9 @@ async def list_source_images(
 
 
 @router.get("/{id}", response_model=SourceImageResponse)
-async def get_source_image(
+def get_source_image(
     id: int,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Get a single source image by ID."""
     repo = SourceImageRepository(session)
@@ -179,23 +283,13 @@ async def get_source_image(
     if not image:
         raise HTTPException(status_code=404, detail="Source image not found")
 
-    return SourceImageResponse(
-        id=image.id,
-        filename=image.filename,
-        filepath=image.filepath,
-        date_taken=image.date_taken.isoformat() if image.date_taken else None,
-        is_deleted=image.is_deleted,
-        usage_count=image.usage_count,
-        is_used=image.is_used,
-        created_at=image.created_at.isoformat(),
-        updated_at=image.updated_at.isoformat(),
-    )
+    return _to_response(image)
 
 
 @router.post("", response_model=SourceImage, status_code=201)
-async def create_source_image(
+def create_source_image(
     image: SourceImage,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Create a new source image record."""
     repo = SourceImageRepository(session)
@@ -207,31 +301,36 @@ async def create_source_image(
         existing.date_taken = image.date_taken
         existing.is_deleted = False
         return repo.update(existing)
+    image.album_id = AlbumRepository(session).get_id_for_filepath(image.filepath)
     return repo.create(image)
 
 
 @router.put("/{id}", response_model=SourceImage)
-async def update_source_image(
+@router.patch("/{id}", response_model=SourceImage)
+def update_source_image(
     id: int,
-    image: SourceImage,
-    session: Session = Depends(get_session),
+    data: SourceImageUpdate,
+    session: Session = Depends(get_session, scope="function"),
 ):
-    """Update a source image."""
+    """Update a source image. Only the fields present in the body are changed."""
     repo = SourceImageRepository(session)
     existing = repo.get(id)
     if not existing:
         raise HTTPException(status_code=404, detail="Source image not found")
 
-    # Update fields (excluding usage_count which is managed internally)
-    for field, value in image.model_dump(exclude={"id", "usage_count"}).items():
+    # Update only provided fields (usage_count and timestamps are managed internally)
+    changes = data.model_dump(exclude_unset=True)
+    for field, value in changes.items():
         setattr(existing, field, value)
+    if "filepath" in changes:
+        existing.album_id = AlbumRepository(session).get_id_for_filepath(existing.filepath)
 
     return repo.update(existing)
 
 
 @router.post("/recalculate-usage", response_model=RecalculateUsageResponse)
-async def recalculate_usage_counts(
-    session: Session = Depends(get_session),
+def recalculate_usage_counts(
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Recalculate all usage counts from actual ImageSlot references."""
     repo = SourceImageRepository(session)
@@ -247,14 +346,13 @@ async def recalculate_usage_counts(
 
 # Tag endpoints for source images
 @router.get("/{id}/tags", response_model=List[Tag])
-async def get_source_image_tags(
+def get_source_image_tags(
     id: int,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Get all tags for a source image."""
     repo = SourceImageRepository(session)
-    image = repo.get(id)
-    if not image:
+    if not repo.exists(id):
         raise HTTPException(status_code=404, detail="Source image not found")
 
     tag_repo = SourceImageTagRepository(session)
@@ -269,15 +367,14 @@ class AddTagRequest(BaseModel):
 
 
 @router.post("/{id}/tags", response_model=Tag, status_code=201)
-async def add_tag_to_source_image(
+def add_tag_to_source_image(
     id: int,
     request: AddTagRequest,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Add a tag to a source image. Creates tag if it doesn't exist."""
     repo = SourceImageRepository(session)
-    image = repo.get(id)
-    if not image:
+    if not repo.exists(id):
         raise HTTPException(status_code=404, detail="Source image not found")
 
     # Get or create tag
@@ -292,15 +389,14 @@ async def add_tag_to_source_image(
 
 
 @router.delete("/{id}/tags/{tag_id}", status_code=204)
-async def remove_tag_from_source_image(
+def remove_tag_from_source_image(
     id: int,
     tag_id: int,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Remove a tag from a source image."""
     repo = SourceImageRepository(session)
-    image = repo.get(id)
-    if not image:
+    if not repo.exists(id):
         raise HTTPException(status_code=404, detail="Source image not found")
 
     source_tag_repo = SourceImageTagRepository(session)
@@ -3,13 +3,14 @@ API router for Tag endpoints.
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session
 from pydantic import BaseModel
 
 from database import get_session
 from models import Tag
 from repositories import TagRepository
+from .conditional import not_modified
 
 router = APIRouter(prefix="/tags", tags=["tags"])
 
@@ -27,11 +28,17 @@ class TagUpdate(BaseModel):
 
 
 @router.get("", response_model=List[Tag])
-async def list_tags(
+def list_tags(
+    request: Request,
+    response: Response,
     search: Optional[str] = Query(None, description="Search tags by name prefix"),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """List all tags, optionally filtered by name search."""
+    cached = not_modified(request, response, (Tag.__tablename__,))
+    if cached is not None:
+        return cached
+
     repo = TagRepository(session)
     
     if search:
@@ -41,9 +48,9 @@ async def list_tags(
 
 
 @router.get("/{id}", response_model=Tag)
-async def get_tag(
+def get_tag(
     id: int,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Get a single tag by ID."""
     repo = TagRepository(session)
@@ -54,9 +61,9 @@ async def get_tag(
 
 
 @router.post("", response_model=Tag, status_code=201)
-async def create_tag(
+def create_tag(
     request: TagCreate,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Create a new tag or return existing if name already exists."""
     repo = TagRepository(session)
@@ -71,10 +78,10 @@ async def create_tag(
 
 
 @router.put("/{id}", response_model=Tag)
-async def update_tag(
+def update_tag(
     id: int,
     request: TagUpdate,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Update a tag."""
     repo = TagRepository(session)
@@ -3,14 +3,15 @@ API router for TVContentMapping endpoints.
 """
 
 from datetime import datetime
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from database import get_session
 from models import TVContentMapping
 from repositories import TVContentRepository
+from .conditional import not_modified
 
 router = APIRouter(prefix="/tv-content", tags=["tv-content"])
 
@@ -54,6 +55,15 @@ class TVContentUpdate(BaseModel):
     content_type: Optional[str] = None
 
 
+# Most gallery image ids accepted by one batch lookup
+MAX_LOOKUP_BATCH = 1000
+
+
+class GalleryImageBatchRequest(BaseModel):
+    """Request model for looking up mappings of several gallery images."""
+    ids: List[int] = Field(..., max_length=MAX_LOOKUP_BATCH)
+
+
 class RefreshRequest(BaseModel):
     """Request model for TV state refresh."""
     tv_content_ids: List[str]
@@ -67,16 +77,26 @@ class RefreshResponse(BaseModel):
 
 
 @router.get("", response_model=PaginatedResponse)
-async def list_tv_content(
+def list_tv_content(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(100, ge=1, le=1000),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """List all TV content mappings with pagination."""
+    cached = not_modified(request, response, (TVContentMapping.__tablename__,))
+    if cached is not None:
+        return cached
+
     repo = TVContentRepository(session)
     skip = (page - 1) * limit
     items = repo.get_all(skip=skip, limit=limit)
-    total = repo.count()
+    if len(items) < limit and (items or skip == 0):
+        # A short page is the last one, so its rows give the total without a COUNT
+        total = skip + len(items)
+    else:
+        total = repo.count()
     pages = (total + limit - 1) // limit if total > 0 else 1
     
     return PaginatedResponse(
@@ -88,9 +108,9 @@ async def list_tv_content(
 
 
 @router.get("/{id}", response_model=TVContentMapping)
-async def get_tv_content(
+def get_tv_content(
     id: int,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Get a single TV content mapping by ID."""
     repo = TVContentRepository(session)
@@ -101,9 +121,9 @@ async def get_tv_content(
 
 
 @router.get("/by-tv-id/{tv_content_id}", response_model=TVContentMapping)
-async def get_tv_content_by_tv_id(
+def get_tv_content_by_tv_id(
     tv_content_id: str,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Get TV content mapping by TV content ID."""
     repo = TVContentRepository(session)
@@ -114,25 +134,43 @@ async def get_tv_content_by_tv_id(
 
 
 @router.get("/by-gallery-image/{gallery_image_id}", response_model=Optional[TVContentMapping])
-async def get_tv_content_by_gallery_image(
+def get_tv_content_by_gallery_image(
     gallery_image_id: int,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Get TV content mapping by gallery image ID."""
     repo = TVContentRepository(session)
     return repo.get_by_gallery_image_id(gallery_image_id)
 
 
+@router.post(
+    "/by-gallery-image/batch", response_model=Dict[int, TVContentMapping]
+)
+def get_tv_content_by_gallery_images(
+    data: GalleryImageBatchRequest,
+    session: Session = Depends(get_session, scope="function"),
+):
+    """
+    Get TV content mappings for several gallery image IDs in one request, keyed
+    by gallery image ID. IDs without a mapping are left out.
+    """
+    repo = TVContentRepository(session)
+    mappings: Dict[int, TVContentMapping] = {}
+    for mapping in repo.get_all_by_gallery_image_ids(data.ids):
+        # As with the single lookup, one mapping per gallery image
+        mappings.setdefault(mapping.gallery_image_id, mapping)
+    return mappings
+
+
 @router.post("", response_model=TVContentMapping, status_code=201)
-async def create_tv_content(
+def create_tv_content(
     data: TVContentCreate,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Create a new TV content mapping."""
     repo = TVContentRepository(session)
     # Check if tv_content_id already exists
-    existing = repo.get_by_tv_content_id(data.tv_content_id)
-    if existing:
+    if repo.exists_by_tv_content_id(data.tv_content_id):
         raise HTTPException(status_code=400, detail="TV content ID already exists")
     
     # Create TVContentMapping from input data
@@ -152,10 +190,11 @@ async def create_tv_content(
 
 
 @router.put("/{id}", response_model=TVContentMapping)
-async def update_tv_content(
+@router.patch("/{id}", response_model=TVContentMapping)
+def update_tv_content(
     id: int,
     data: TVContentUpdate,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Update a TV content mapping."""
     repo = TVContentRepository(session)
@@ -172,9 +211,9 @@ async def update_tv_content(
 
 
 @router.delete("/{id}", status_code=204)
-async def delete_tv_content(
+def delete_tv_content(
     id: int,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Delete a TV content mapping."""
     repo = TVContentRepository(session)
@@ -183,9 +222,9 @@ async def delete_tv_content(
 
 
 @router.delete("/by-tv-id/{tv_content_id}", status_code=204)
-async def delete_tv_content_by_tv_id(
+def delete_tv_content_by_tv_id(
     tv_content_id: str,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope="function"),
 ):
     """Delete TV content mapping by TV content ID."""
     repo = TVContentRepository(session)
@@ -3,22 +3,81 @@ Album directory scanner for populating SourceImage records.
 """
 
 import os
+import sys
 import logging
+import multiprocessing
+import struct
+import zlib
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
-from sqlmodel import Session
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+from sqlmodel import Session, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from PIL import Image
-from PIL.ExifTags import TAGS, GPSTAGS
+from PIL import ExifTags
 
 from models import SourceImage, EXIFMetadata
-from repositories import SourceImageRepository
+from repositories.album_repository import AlbumRepository, album_name_from_filepath
+from repositories.base import chunked
 
 logger = logging.getLogger(__name__)
 
 # Supported image extensions
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
 
+# The same without the dot, matched against name.rpartition(".") during the walk
+IMAGE_EXT_NOPREFIX = frozenset(ext[1:] for ext in IMAGE_EXTENSIONS)
+
+# JPEG markers that stand alone without a length field (TEM and RST0-RST7)
+_JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+
+# Bytes fetched from the start of a JPEG in one read. Cameras write EXIF right
+# after SOI (and at most an APP0), so small segments come back from this read and
+# a larger one (up to 64 KB with its thumbnail) needs just one more.
+_JPEG_HEAD_BYTES = 16 * 1024
+
+# PNG file signature, and the text chunk keyword ImageMagick stores EXIF under
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_RAW_EXIF_KEYWORD = b"Raw profile type exif\x00"
+
+# IFD0 entries pointing at the Exif and GPS IFDs
+_EXIF_IFD_POINTER = int(ExifTags.IFD.Exif)
+_GPS_IFD_POINTER = int(ExifTags.IFD.GPSInfo)
+
+# GPS tags combined into coordinates, altitude and time
+_GPS_LATITUDE_REF = int(ExifTags.GPS.GPSLatitudeRef)
+_GPS_LATITUDE = int(ExifTags.GPS.GPSLatitude)
+_GPS_LONGITUDE_REF = int(ExifTags.GPS.GPSLongitudeRef)
+_GPS_LONGITUDE = int(ExifTags.GPS.GPSLongitude)
+_GPS_ALTITUDE_REF = int(ExifTags.GPS.GPSAltitudeRef)
+_GPS_ALTITUDE = int(ExifTags.GPS.GPSAltitude)
+_GPS_TIMESTAMP = int(ExifTags.GPS.GPSTimeStamp)
+
+# TIFF field types: struct code and byte size of one value. ASCII (2) and
+# UNDEFINED (7) are read as raw bytes; rationals are two integers; 13 is an
+# IFD offset, which some writers use for the Exif and GPS pointers.
+_TIFF_FIELD_TYPES = {
+    1: ("B", 1), 2: ("s", 1), 3: ("H", 2), 4: ("L", 4), 5: ("L", 8),
+    6: ("b", 1), 7: ("s", 1), 8: ("h", 2), 9: ("l", 4), 10: ("l", 8),
+    11: ("f", 4), 12: ("d", 8), 13: ("L", 4),
+}
+
+# Number of processed files (or missing rows marked deleted) per scan transaction.
+# Each batch is committed on its own, so SQLite's write lock and the WAL growth
+# are bounded by a batch rather than by the whole albums directory.
+SCAN_BATCH_SIZE = 500
+
+# Processes reading EXIF during a scan. Parsing the EXIF IFDs is pure Python and
+# holds the GIL, so only separate processes spread it over the cores. With one
+# core the files are read in the scanning process itself.
+EXIF_WORKERS = os.cpu_count() or 1
+
+# Fewer files than this to read in a batch are read in-process; starting the
+# worker processes costs more than reading a handful of files
+EXIF_POOL_MIN_FILES = 100
+
 
 def _convert_to_float(value: Any) -> Optional[float]:
     """Convert various EXIF value types to float."""
@@ -60,13 +119,31 @@ def _convert_exif_date(value: Any) -> Optional[str]:
         if value is None:
             return None
         dt_str = str(value)
-        # Parse EXIF datetime format: "YYYY:MM:DD HH:MM:SS"
-        dt = datetime.strptime(dt_str, "%Y:%m:%d %H:%M:%S")
+        # Parse EXIF datetime format: "YYYY:MM:DD HH:MM:SS". The fixed-width layout
+        # cameras write is sliced directly, which is several times faster than strptime.
+        if (
+            len(dt_str) == 19
+            and dt_str[4] == ":" and dt_str[7] == ":" and dt_str[10] == " "
+            and dt_str[13] == ":" and dt_str[16] == ":"
+        ):
+            dt = datetime(
+                int(dt_str[0:4]), int(dt_str[5:7]), int(dt_str[8:10]),
+                int(dt_str[11:13]), int(dt_str[14:16]), int(dt_str[17:19]),
+            )
+        else:
+            dt = datetime.strptime(dt_str, "%Y:%m:%d %H:%M:%S")
         return dt.isoformat()
     except (ValueError, AttributeError):
         return None
 
 
+def _dms_component(value: Any) -> float:
+    """One degrees/minutes/seconds value as float; a (num, 0) rational counts as 0."""
+    if isinstance(value, tuple) and len(value) == 2:
+        return float(value[0]) / float(value[1]) if value[1] != 0 else 0
+    return float(value)
+
+
 def _dms_to_decimal(dms: tuple, ref: str) -> Optional[float]:
     """
     Convert GPS coordinates from degrees/minutes/seconds to decimal degrees.
@@ -79,18 +156,13 @@ def _dms_to_decimal(dms: tuple, ref: str) -> Optional[float]:
         Decimal degrees (negative for S and W)
     """
     try:
-        if not dms or len(dms) < 3:
-            return None
-        
-        # Extract values, handling both tuple (rational) and float formats
-        def get_value(v):
-            if isinstance(v, tuple) and len(v) == 2:
-                return float(v[0]) / float(v[1]) if v[1] != 0 else 0
-            return float(v)
-        
-        degrees = get_value(dms[0])
-        minutes = get_value(dms[1])
-        seconds = get_value(dms[2])
+        degrees, minutes, seconds = dms[0], dms[1], dms[2]
+        # The IFD reader returns rationals as floats, so per-value conversion is
+        # only needed for the rare zero-denominator tuple or other input types
+        if not (type(degrees) is type(minutes) is type(seconds) is float):
+            degrees = _dms_component(degrees)
+            minutes = _dms_component(minutes)
+            seconds = _dms_component(seconds)
         
         decimal = degrees + minutes / 60 + seconds / 3600
         
@@ -102,6 +174,277 @@ def _dms_to_decimal(dms: tuple, ref: str) -> Optional[float]:
         return None
 
 
+def _as_str(value: Any) -> str:
+    """Convert an EXIF text value to str, dropping NUL padding."""
+    return str(value).strip('\x00')
+
+
+def _first_int(value: Any) -> Optional[int]:
+    """Convert an EXIF value to int, taking the first entry of a multi-value tag."""
+    if isinstance(value, tuple):
+        return _convert_to_int(value[0])
+    return _convert_to_int(value)
+
+
+def _decode_comment(value: Any) -> str:
+    """Decode a UserComment as UTF-8, falling back to latin-1."""
+    if isinstance(value, bytes):
+        try:
+            return value.decode('utf-8').strip('\x00')
+        except UnicodeDecodeError:
+            return value.decode('latin-1').strip('\x00')
+    return str(value).strip('\x00')
+
+
+# EXIF tag id (IFD0 or Exif IFD) -> (EXIFMetadata field, converter), for tags
+# that map to one field
+EXIF_TAG_TABLE: Dict[int, Tuple[str, Callable[[Any], Any]]] = {
+    # Camera/Device Information
+    0x010F: ("make", _as_str),  # Make
+    0x0110: ("model", _as_str),  # Model
+    0x0131: ("software", _as_str),  # Software
+    0xA433: ("lens_make", _as_str),  # LensMake
+    0xA434: ("lens_model", _as_str),  # LensModel
+    # Date/Time Information
+    0x9003: ("date_time_original", _convert_exif_date),  # DateTimeOriginal
+    0x9004: ("date_time_digitized", _convert_exif_date),  # DateTimeDigitized
+    0x0132: ("date_time", _convert_exif_date),  # DateTime
+    0x9011: ("offset_time_original", str),  # OffsetTimeOriginal
+    # Exposure Settings
+    0x829A: ("exposure_time", _convert_to_float),  # ExposureTime
+    0x829D: ("f_number", _convert_to_float),  # FNumber
+    0x8827: ("iso_speed", _first_int),  # ISOSpeedRatings
+    0x8822: ("exposure_program", _convert_to_int),  # ExposureProgram
+    0x9204: ("exposure_bias", _convert_to_float),  # ExposureBiasValue
+    0xA402: ("exposure_mode", _convert_to_int),  # ExposureMode
+    0x9207: ("metering_mode", _convert_to_int),  # MeteringMode
+    0x9209: ("flash", _convert_to_int),  # Flash
+    0xA403: ("white_balance", _convert_to_int),  # WhiteBalance
+    # Lens/Focus Information
+    0x920A: ("focal_length", _convert_to_float),  # FocalLength
+    0xA405: ("focal_length_35mm", _convert_to_int),  # FocalLengthIn35mmFilm
+    0x9205: ("max_aperture", _convert_to_float),  # MaxApertureValue
+    0x9206: ("subject_distance", _convert_to_float),  # SubjectDistance
+    # Image Properties
+    0x0112: ("orientation", _convert_to_int),  # Orientation
+    0xA002: ("image_width", _convert_to_int),  # ExifImageWidth
+    0xA003: ("image_height", _convert_to_int),  # ExifImageHeight
+    0xA001: ("color_space", _convert_to_int),  # ColorSpace
+    0x011A: ("x_resolution", _convert_to_float),  # XResolution
+    0x011B: ("y_resolution", _convert_to_float),  # YResolution
+    # Scene Information
+    0xA406: ("scene_capture_type", _convert_to_int),  # SceneCaptureType
+    0x9208: ("light_source", _convert_to_int),  # LightSource
+    0xA408: ("contrast", _convert_to_int),  # Contrast
+    0xA409: ("saturation", _convert_to_int),  # Saturation
+    0xA40A: ("sharpness", _convert_to_int),  # Sharpness
+    # Other Information
+    0x010E: ("image_description", _as_str),  # ImageDescription
+    0x013B: ("artist", _as_str),  # Artist
+    0x8298: ("copyright", _as_str),  # Copyright
+    0x9286: ("user_comment", _decode_comment),  # UserComment
+}
+
+# GPS tag id -> (field, converter) for GPS tags that map to one field; coordinates,
+# altitude and time combine several tags and are handled in extract_full_exif_metadata
+GPS_TAG_TABLE: Dict[int, Tuple[str, Callable[[Any], Any]]] = {
+    29: ("gps_datestamp", str),  # GPSDateStamp
+    17: ("gps_img_direction", _convert_to_float),  # GPSImgDirection
+}
+
+# Tags the JPEG IFD reader decodes; everything else is skipped unread
+_EXIF_TAG_IDS = frozenset(EXIF_TAG_TABLE)
+_GPS_TAG_IDS = frozenset(GPS_TAG_TABLE) | {
+    _GPS_LATITUDE_REF, _GPS_LATITUDE, _GPS_LONGITUDE_REF, _GPS_LONGITUDE,
+    _GPS_ALTITUDE_REF, _GPS_ALTITUDE, _GPS_TIMESTAMP,
+}
+
+
+def _read_jpeg_exif_segment(filepath: Path) -> Optional[bytes]:
+    """
+    Return the EXIF APP1 segment of a JPEG file, or None if it has none.
+
+    The head of the file is fetched with a single unbuffered read and the marker
+    segments are walked in memory; nothing is decoded and no PIL image is created.
+    """
+    with open(filepath, "rb", buffering=0) as f:
+        data = f.read(_JPEG_HEAD_BYTES)
+        if not data.startswith(b"\xff\xd8"):
+            return None
+        base = 0  # File offset of data[0]
+        pos = 2
+        while True:
+            if pos + 4 > len(data):
+                # Large segments in front of EXIF: continue from a fresh read
+                base += pos
+                f.seek(base)
+                data = f.read(_JPEG_HEAD_BYTES)
+                pos = 0
+                if len(data) < 4:
+                    return None
+            if data[pos] != 0xFF:
+                return None
+            code = data[pos + 1]
+            if code == 0xFF:
+                # Markers may be preceded by any number of 0xFF fill bytes
+                pos += 1
+                continue
+            if code in (0xD9, 0xDA):
+                # End of image or start of scan: EXIF always comes before these
+                return None
+            if code in _JPEG_STANDALONE_MARKERS:
+                pos += 2
+                continue
+            length = int.from_bytes(data[pos + 2:pos + 4], "big") - 2
+            if length < 0:
+                return None
+            pos += 4
+            if code == 0xE1:
+                if pos + length <= len(data):
+                    segment = data[pos:pos + length]
+                else:
+                    f.seek(base + pos)
+                    segment = f.read(length)
+                if segment.startswith(b"Exif\x00\x00"):
+                    return segment
+                # APP1 also carries XMP; keep looking
+            pos += length
+
+
+def _read_tiff_value(data: bytes, offset: int, field_type: int, count: int, order: str) -> Any:
+    """
+    Decode one IFD entry's value the way PIL's TiffImagePlugin presents it:
+    ASCII as str, UNDEFINED and BYTE values as bytes, rationals as floats
+    ((num, den) tuples when den is 0), and several values as a tuple.
+    """
+    code = _TIFF_FIELD_TYPES[field_type][0]
+    if field_type == 2:
+        return data[offset:offset + count].rstrip(b"\x00").decode("latin-1", "replace")
+    if field_type in (1, 7):
+        return data[offset:offset + count]
+    if field_type in (5, 10):
+        numbers = struct.unpack_from(f"{order}{2 * count}{code}", data, offset)
+        values = tuple(
+            numbers[i] / numbers[i + 1] if numbers[i + 1] else (numbers[i], numbers[i + 1])
+            for i in range(0, 2 * count, 2)
+        )
+    else:
+        values = struct.unpack_from(f"{order}{count}{code}", data, offset)
+    return values[0] if count == 1 else values
+
+
+def _read_png_exif_segment(filepath: Path) -> Optional[bytes]:
+    """
+    Return the EXIF of a PNG file as an APP1-style segment ("Exif\\0\\0" and the
+    TIFF data), or None if it has none.
+
+    Only chunk headers are read and other chunks are skipped with a seek, so the
+    image data is never decompressed. As with PIL, EXIF comes from an eXIf chunk
+    (before or after the image data) or an ImageMagick "Raw profile type exif"
+    text chunk.
+    """
+    with open(filepath, "rb") as f:
+        if f.read(8) != _PNG_SIGNATURE:
+            return None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            length, chunk_type = struct.unpack(">I4s", header)
+            if chunk_type == b"eXIf":
+                tiff = f.read(length)
+            elif chunk_type in (b"tEXt", b"zTXt") and length > len(_PNG_RAW_EXIF_KEYWORD):
+                text = f.read(length)
+                f.seek(4, os.SEEK_CUR)  # CRC
+                if not text.startswith(_PNG_RAW_EXIF_KEYWORD):
+                    continue
+                text = text[len(_PNG_RAW_EXIF_KEYWORD):]
+                if chunk_type == b"zTXt":
+                    text = zlib.decompress(text[1:])  # After the compression method byte
+                # "\n<name>\n<length>\n" followed by hex lines
+                tiff = bytes.fromhex("".join(text.decode("latin-1").split("\n")[3:]))
+            elif chunk_type == b"IEND":
+                return None
+            else:
+                f.seek(length + 4, os.SEEK_CUR)  # Data and CRC
+                continue
+            while tiff.startswith(b"Exif\x00\x00"):
+                tiff = tiff[6:]
+            return b"Exif\x00\x00" + tiff
+
+
+def _read_ifd(data: bytes, offset: int, order: str, wanted: frozenset) -> Dict[int, Any]:
+    """Read the wanted tags of the IFD at offset in a TIFF block; other entries are skipped."""
+    tags: Dict[int, Any] = {}
+    end = len(data)
+    if offset < 8 or offset + 2 > end:
+        return tags
+    (entry_count,) = struct.unpack_from(order + "H", data, offset)
+    entry = offset + 2
+    entry_format = order + "HHL"
+    for _ in range(entry_count):
+        if entry + 12 > end:
+            break
+        tag, field_type, count = struct.unpack_from(entry_format, data, entry)
+        if tag in wanted and field_type in _TIFF_FIELD_TYPES:
+            length = _TIFF_FIELD_TYPES[field_type][1] * count
+            if length <= 4:
+                value_offset = entry + 8
+            else:
+                (value_offset,) = struct.unpack_from(order + "L", data, entry + 8)
+            if count and value_offset + length <= end:
+                tags[tag] = _read_tiff_value(data, value_offset, field_type, count, order)
+        entry += 12
+    return tags
+
+
+def _parse_exif_segment(segment: bytes) -> Optional[Dict[int, Any]]:
+    """
+    Parse an APP1 Exif segment with struct, reading only the tags in
+    _EXIF_TAG_IDS and _GPS_TAG_IDS; no PIL objects are created.
+    """
+    data = segment[6:]  # Skip the "Exif\0\0" header; offsets are relative to the TIFF header
+    if data[:4] == b"II*\x00":
+        order = "<"
+    elif data[:4] == b"MM\x00*":
+        order = ">"
+    else:
+        return None
+    (ifd0_offset,) = struct.unpack_from(order + "L", data, 4)
+    tags = _read_ifd(data, ifd0_offset, order, _EXIF_TAG_IDS | {_EXIF_IFD_POINTER, _GPS_IFD_POINTER})
+    exif_offset = tags.pop(_EXIF_IFD_POINTER, None)
+    gps_offset = tags.pop(_GPS_IFD_POINTER, None)
+    if isinstance(exif_offset, int):
+        tags.update(_read_ifd(data, exif_offset, order, _EXIF_TAG_IDS))
+    if isinstance(gps_offset, int):
+        gps = _read_ifd(data, gps_offset, order, _GPS_TAG_IDS)
+        if gps:
+            tags[_GPS_IFD_POINTER] = gps
+    return tags
+
+
+def _read_exif_tags(filepath: Path) -> Optional[Dict[int, Any]]:
+    """
+    Read the IFD0, Exif and GPS tags of an image into one dict keyed by tag id,
+    with the GPS tags nested under GPSInfo (the layout of PIL's _getexif).
+    """
+    suffix = filepath.suffix.lower()
+    if suffix in (".jpg", ".jpeg"):
+        segment = _read_jpeg_exif_segment(filepath)
+    elif suffix == ".png":
+        segment = _read_png_exif_segment(filepath)
+    elif suffix == ".bmp":
+        # BMP has no EXIF container
+        return None
+    else:
+        with Image.open(filepath) as img:
+            return img._getexif()
+
+    if segment is None:
+        return None
+    return _parse_exif_segment(segment)
+
+
 def extract_full_exif_metadata(filepath: Path) -> EXIFMetadata:
     """
     Extract all available EXIF metadata from an image file.
@@ -115,336 +458,77 @@ def extract_full_exif_metadata(filepath: Path) -> EXIFMetadata:
     metadata = EXIFMetadata()
     
     try:
-        with Image.open(filepath) as img:
-            exif = img._getexif()
-            if exif is None:
-                logger.debug(f"No EXIF data in {filepath}")
-                return metadata
-            
-            # Map tag IDs to names
-            exif_data: Dict[str, Any] = {}
-            gps_data: Dict[str, Any] = {}
-            
-            for tag_id, value in exif.items():
-                tag = TAGS.get(tag_id, tag_id)
-                
-                if tag == "GPSInfo":
-                    # Process GPS data separately
-                    if isinstance(value, dict):
-                        for gps_tag_id, gps_value in value.items():
-                            gps_tag = GPSTAGS.get(gps_tag_id, gps_tag_id)
-                            gps_data[gps_tag] = gps_value
-                else:
-                    exif_data[tag] = value
-            
-            # Camera/Device Information
-            try:
-                if "Make" in exif_data:
-                    metadata.make = str(exif_data["Make"]).strip('\x00')
-            except Exception:
-                pass
-            
-            try:
-                if "Model" in exif_data:
-                    metadata.model = str(exif_data["Model"]).strip('\x00')
-            except Exception:
-                pass
-            
-            try:
-                if "Software" in exif_data:
-                    metadata.software = str(exif_data["Software"]).strip('\x00')
-            except Exception:
-                pass
-            
-            try:
-                if "LensMake" in exif_data:
-                    metadata.lens_make = str(exif_data["LensMake"]).strip('\x00')
-            except Exception:
-                pass
-            
-            try:
-                if "LensModel" in exif_data:
-                    metadata.lens_model = str(exif_data["LensModel"]).strip('\x00')
-            except Exception:
-                pass
-            
-            # Date/Time Information
-            try:
-                if "DateTimeOriginal" in exif_data:
-                    metadata.date_time_original = _convert_exif_date(exif_data["DateTimeOriginal"])
-            except Exception:
-                pass
-            
-            try:
-                if "DateTimeDigitized" in exif_data:
-                    metadata.date_time_digitized = _convert_exif_date(exif_data["DateTimeDigitized"])
-            except Exception:
-                pass
-            
-            try:
-                if "DateTime" in exif_data:
-                    metadata.date_time = _convert_exif_date(exif_data["DateTime"])
-            except Exception:
-                pass
-            
-            try:
-                if "OffsetTimeOriginal" in exif_data:
-                    metadata.offset_time_original = str(exif_data["OffsetTimeOriginal"])
-            except Exception:
-                pass
-            
-            # Exposure Settings
-            try:
-                if "ExposureTime" in exif_data:
-                    metadata.exposure_time = _convert_to_float(exif_data["ExposureTime"])
-            except Exception:
-                pass
-            
-            try:
-                if "FNumber" in exif_data:
-                    metadata.f_number = _convert_to_float(exif_data["FNumber"])
-            except Exception:
-                pass
-            
-            try:
-                if "ISOSpeedRatings" in exif_data:
-                    val = exif_data["ISOSpeedRatings"]
-                    if isinstance(val, tuple):
-                        metadata.iso_speed = _convert_to_int(val[0])
-                    else:
-                        metadata.iso_speed = _convert_to_int(val)
-            except Exception:
-                pass
-            
-            try:
-                if "ExposureProgram" in exif_data:
-                    metadata.exposure_program = _convert_to_int(exif_data["ExposureProgram"])
-            except Exception:
-                pass
-            
-            try:
-                if "ExposureBiasValue" in exif_data:
-                    metadata.exposure_bias = _convert_to_float(exif_data["ExposureBiasValue"])
-            except Exception:
-                pass
-            
-            try:
-                if "ExposureMode" in exif_data:
-                    metadata.exposure_mode = _convert_to_int(exif_data["ExposureMode"])
-            except Exception:
-                pass
-            
-            try:
-                if "MeteringMode" in exif_data:
-                    metadata.metering_mode = _convert_to_int(exif_data["MeteringMode"])
-            except Exception:
-                pass
-            
-            try:
-                if "Flash" in exif_data:
-                    metadata.flash = _convert_to_int(exif_data["Flash"])
-            except Exception:
-                pass
-            
-            try:
-                if "WhiteBalance" in exif_data:
-                    metadata.white_balance = _convert_to_int(exif_data["WhiteBalance"])
-            except Exception:
-                pass
-            
-            # Lens/Focus Information
-            try:
-                if "FocalLength" in exif_data:
-                    metadata.focal_length = _convert_to_float(exif_data["FocalLength"])
-            except Exception:
-                pass
-            
-            try:
-                if "FocalLengthIn35mmFilm" in exif_data:
-                    metadata.focal_length_35mm = _convert_to_int(exif_data["FocalLengthIn35mmFilm"])
-            except Exception:
-                pass
-            
-            try:
-                if "MaxApertureValue" in exif_data:
-                    metadata.max_aperture = _convert_to_float(exif_data["MaxApertureValue"])
-            except Exception:
-                pass
-            
-            try:
-                if "SubjectDistance" in exif_data:
-                    metadata.subject_distance = _convert_to_float(exif_data["SubjectDistance"])
-            except Exception:
-                pass
-            
-            # Image Properties
-            try:
-                if "Orientation" in exif_data:
-                    metadata.orientation = _convert_to_int(exif_data["Orientation"])
-            except Exception:
-                pass
-            
-            try:
-                if "ExifImageWidth" in exif_data:
-                    metadata.image_width = _convert_to_int(exif_data["ExifImageWidth"])
-            except Exception:
-                pass
-            
-            try:
-                if "ExifImageHeight" in exif_data:
-                    metadata.image_height = _convert_to_int(exif_data["ExifImageHeight"])
-            except Exception:
-                pass
-            
-            try:
-                if "ColorSpace" in exif_data:
-                    metadata.color_space = _convert_to_int(exif_data["ColorSpace"])
-            except Exception:
-                pass
-            
-            try:
-                if "XResolution" in exif_data:
-                    metadata.x_resolution = _convert_to_float(exif_data["XResolution"])
-            except Exception:
-                pass
-            
-            try:
-                if "YResolution" in exif_data:
-                    metadata.y_resolution = _convert_to_float(exif_data["YResolution"])
-            except Exception:
-                pass
-            
-            # GPS Information
-            try:
-                if "GPSLatitude" in gps_data and "GPSLatitudeRef" in gps_data:
-                    metadata.gps_latitude = _dms_to_decimal(
-                        gps_data["GPSLatitude"], 
-                        gps_data["GPSLatitudeRef"]
-                    )
-            except Exception:
-                pass
-            
-            try:
-                if "GPSLongitude" in gps_data and "GPSLongitudeRef" in gps_data:
-                    metadata.gps_longitude = _dms_to_decimal(
-                        gps_data["GPSLongitude"], 
-                        gps_data["GPSLongitudeRef"]
-                    )
-            except Exception:
-                pass
-            
-            try:
-                if "GPSAltitude" in gps_data:
-                    alt = _convert_to_float(gps_data["GPSAltitude"])
-                    if alt is not None and "GPSAltitudeRef" in gps_data:
-                        # GPSAltitudeRef: 0 = above sea level, 1 = below sea level
-                        if gps_data["GPSAltitudeRef"] == 1:
-                            alt = -alt
-                    metadata.gps_altitude = alt
-            except Exception:
-                pass
-            
-            try:
-                if "GPSTimeStamp" in gps_data:
-                    ts = gps_data["GPSTimeStamp"]
-                    if isinstance(ts, tuple) and len(ts) >= 3:
-                        h = _convert_to_int(ts[0]) or 0
-                        m = _convert_to_int(ts[1]) or 0
-                        s = _convert_to_float(ts[2]) or 0
-                        metadata.gps_timestamp = f"{h:02d}:{m:02d}:{s:05.2f}"
-            except Exception:
-                pass
-            
-            try:
-                if "GPSDateStamp" in gps_data:
-                    metadata.gps_datestamp = str(gps_data["GPSDateStamp"])
-            except Exception:
-                pass
-            
-            try:
-                if "GPSImgDirection" in gps_data:
-                    metadata.gps_img_direction = _convert_to_float(gps_data["GPSImgDirection"])
-            except Exception:
-                pass
-            
-            # Scene Information
-            try:
-                if "SceneCaptureType" in exif_data:
-                    metadata.scene_capture_type = _convert_to_int(exif_data["SceneCaptureType"])
-            except Exception:
-                pass
-            
-            try:
-                if "LightSource" in exif_data:
-                    metadata.light_source = _convert_to_int(exif_data["LightSource"])
-            except Exception:
-                pass
-            
-            try:
-                if "Contrast" in exif_data:
-                    metadata.contrast = _convert_to_int(exif_data["Contrast"])
-            except Exception:
-                pass
-            
-            try:
-                if "Saturation" in exif_data:
-                    metadata.saturation = _convert_to_int(exif_data["Saturation"])
-            except Exception:
-                pass
-            
-            try:
-                if "Sharpness" in exif_data:
-                    metadata.sharpness = _convert_to_int(exif_data["Sharpness"])
-            except Exception:
-                pass
-            
-            # Other Information
-            try:
-                if "ImageDescription" in exif_data:
-                    metadata.image_description = str(exif_data["ImageDescription"]).strip('\x00')
-            except Exception:
-                pass
-            
-            try:
-                if "Artist" in exif_data:
-                    metadata.artist = str(exif_data["Artist"]).strip('\x00')
-            except Exception:
-                pass
-            
-            try:
-                if "Copyright" in exif_data:
-                    metadata.copyright = str(exif_data["Copyright"]).strip('\x00')
-            except Exception:
-                pass
-            
-            try:
-                if "UserComment" in exif_data:
-                    comment = exif_data["UserComment"]
-                    if isinstance(comment, bytes):
-                        # Try to decode as UTF-8, fallback to latin-1
-                        try:
-                            metadata.user_comment = comment.decode('utf-8').strip('\x00')
-                        except UnicodeDecodeError:
-                            metadata.user_comment = comment.decode('latin-1').strip('\x00')
-                    else:
-                        metadata.user_comment = str(comment).strip('\x00')
-            except Exception:
-                pass
-    
+        exif = _read_exif_tags(filepath)
+        if not exif:
+            logger.debug(f"No EXIF data in {filepath}")
+            return metadata
+        
+        # GPS tags sit in their own IFD, nested under the GPSInfo tag
+        gps_data = exif.get(_GPS_IFD_POINTER)
+        if not isinstance(gps_data, dict):
+            gps_data = {}
+        
+        # Plain tags: one lookup by tag id and one conversion each; a value that
+        # fails to convert leaves its field unset
+        for tags, table in ((exif, EXIF_TAG_TABLE), (gps_data, GPS_TAG_TABLE)):
+            for tag_id, value in tags.items():
+                entry = table.get(tag_id)
+                if entry is not None and value is not None:
+                    try:
+                        setattr(metadata, entry[0], entry[1](value))
+                    except Exception:
+                        pass
+        
+        # GPS values built from several tags
+        try:
+            if _GPS_LATITUDE in gps_data and _GPS_LATITUDE_REF in gps_data:
+                metadata.gps_latitude = _dms_to_decimal(
+                    gps_data[_GPS_LATITUDE], 
+                    gps_data[_GPS_LATITUDE_REF]
+                )
+        except Exception:
+            pass
+        
+        try:
+            if _GPS_LONGITUDE in gps_data and _GPS_LONGITUDE_REF in gps_data:
+                metadata.gps_longitude = _dms_to_decimal(
+                    gps_data[_GPS_LONGITUDE], 
+                    gps_data[_GPS_LONGITUDE_REF]
+                )
+        except Exception:
+            pass
+        
+        try:
+            if _GPS_ALTITUDE in gps_data:
+                alt = _convert_to_float(gps_data[_GPS_ALTITUDE])
+                if alt is not None and _GPS_ALTITUDE_REF in gps_data:
+                    # GPSAltitudeRef: 0 = above sea level, 1 = below sea level.
+                    # It is a BYTE, which the readers return as bytes
+                    if gps_data[_GPS_ALTITUDE_REF] in (1, b"\x01"):
+                        alt = -alt
+                metadata.gps_altitude = alt
+        except Exception:
+            pass
+        
+        try:
+            if _GPS_TIMESTAMP in gps_data:
+                ts = gps_data[_GPS_TIMESTAMP]
+                if isinstance(ts, tuple) and len(ts) >= 3:
+                    h = _convert_to_int(ts[0]) or 0
+                    m = _convert_to_int(ts[1]) or 0
+                    s = _convert_to_float(ts[2]) or 0
+                    metadata.gps_timestamp = f"{h:02d}:{m:02d}:{s:05.2f}"
+        except Exception:
+            pass
+
     except Exception as e:
         logger.debug(f"Failed to extract EXIF from {filepath}: {e}")
     
     return metadata
 
 
-def extract_exif_date(filepath: Path) -> datetime | None:
-    """
-    Extract date_taken from EXIF data.
-    Uses extract_full_exif_metadata internally for consistency.
-    """
-    metadata = extract_full_exif_metadata(filepath)
-    
-    # Try DateTimeOriginal first, then DateTimeDigitized, then DateTime
+def _date_taken_from_metadata(metadata: EXIFMetadata) -> datetime | None:
+    """Pick date_taken from DateTimeOriginal, then DateTimeDigitized, then DateTime."""
     for date_field in [metadata.date_time_original, metadata.date_time_digitized, metadata.date_time]:
         if date_field:
             try:
@@ -455,112 +539,268 @@ def extract_exif_date(filepath: Path) -> datetime | None:
     return None
 
 
+def extract_exif_date(filepath: Path) -> datetime | None:
+    """
+    Extract date_taken from EXIF data.
+    Uses extract_full_exif_metadata internally for consistency.
+    """
+    return _date_taken_from_metadata(extract_full_exif_metadata(filepath))
+
+
+def _read_scan_metadata(filepath: Path) -> Tuple[Dict[str, Any], datetime | None]:
+    """
+    Extract the stored EXIF dict and date_taken for one file. Runs in the scan
+    worker processes, so it returns plain values that are cheap to pickle.
+    """
+    metadata = extract_full_exif_metadata(filepath)
+    return metadata.to_stored_dict(), _date_taken_from_metadata(metadata)
+
+
+def _build_scan_upsert():
+    """INSERT ... ON CONFLICT(id) DO UPDATE for rows written by a scan."""
+    statement = sqlite_insert(SourceImage)
+    return statement.on_conflict_do_update(
+        index_elements=["id"],
+        set_={
+            "is_deleted": statement.excluded.is_deleted,
+            "date_taken": statement.excluded.date_taken,
+            "exif_metadata": statement.excluded.exif_metadata,
+            "file_mtime": statement.excluded.file_mtime,
+            "file_size": statement.excluded.file_size,
+            "album_id": statement.excluded.album_id,
+            "updated_at": func.now(),
+        },
+    )
+
+
+# Built once and run with a list of parameter sets, so every batch reuses one
+# compiled statement and the rows go to the driver's executemany
+_SCAN_UPSERT = _build_scan_upsert()
+
+
+def _flush_scan_batch(session: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Write a batch of new and rescanned source images with one executemany of
+    INSERT ... ON CONFLICT and clear the list.
+
+    Rows for existing images carry their id and update that row in place; new
+    images have id None and get a fresh rowid. filepath has no unique index, so
+    the primary key is the conflict target.
+    """
+    if not rows:
+        return
+    session.exec(_SCAN_UPSERT, params=rows)
+    rows.clear()
+
+
+def _iter_image_entries(root: Path) -> Iterator[os.DirEntry]:
+    """
+    Yield a DirEntry for every image file under root, depth first.
+
+    Hidden directories (names starting with ".") are not descended into, and
+    symlinked directories are not followed, as with os.walk's defaults. Each
+    entry's is_dir/is_file/stat results are cached on the entry.
+    """
+    stack = [str(root)]
+    # Bound once as locals; the loop below runs for every directory entry
+    push = stack.append
+    extensions = IMAGE_EXT_NOPREFIX
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith("."):
+                            push(entry.path)
+                    elif entry.is_file():
+                        stem, _, extension = entry.name.rpartition(".")
+                        if stem and extension.lower() in extensions:
+                            yield entry
+        except OSError as e:
+            logger.warning(f"Cannot read directory {directory}: {e}")
+
+
 def scan_albums_directory(
     albums_path: Path,
     data_path: Path,
     session: Session,
+    progress: Optional[Callable[[Dict[str, int]], None]] = None,
 ) -> Dict[str, int]:
     """
     Scan albums directory and sync with SourceImage table.
 
+    Writes are committed batch by batch (see SCAN_BATCH_SIZE). An interrupted
+    scan keeps the batches already written; the next scan finishes the rest.
+
+    Args:
+        progress: Optional callback receiving the running counts after each batch
+
     Returns:
         Dict with counts: {"scanned": int, "added": int, "updated": int, "deleted": int}
     """
-    repo = SourceImageRepository(session)
-
     scanned = 0
     added = 0
     updated = 0
     deleted = 0
 
-    # Get all existing source images
-    existing_images: Dict[str, SourceImage] = {}
-    for image in repo.get_all(skip=0, limit=10000):  # Get all
-        existing_images[image.filepath] = image
-
     # Walk albums directory
     if not albums_path.exists():
         logger.warning(f"Albums directory does not exist: {albums_path}")
         return {"scanned": 0, "added": 0, "updated": 0, "deleted": 0}
 
-    # Track which filepaths we've seen
-    seen_filepaths = set()
-
-    for root, dirs, files in os.walk(albums_path):
-        for filename in files:
-            filepath = Path(root) / filename
-
-            # Check if it's an image
-            if filepath.suffix.lower() not in IMAGE_EXTENSIONS:
-                continue
-
-            scanned += 1
-
-            # Get relative path from data directory
-            try:
-                relative_path = filepath.relative_to(data_path)
-                filepath_str = str(relative_path).replace("\\", "/")
-            except ValueError:
-                # File is not under data_path, skip it
-                logger.warning(
-                    f"File {filepath} is not under data directory {data_path}"
-                )
-                continue
-
-            seen_filepaths.add(filepath_str)
+    # Collect the image files on disk first as (path, relative filepath, filename,
+    # mtime, size), so the database is only asked about files that exist. Paths
+    # stay strings here; a Path is only built for files whose EXIF is read.
+    data_prefix = os.path.join(str(data_path), "")
+    prefix_length = len(data_prefix)
+    files_on_disk: List[Tuple[str, str, str, float, int]] = []
+    # Per-file lookups bound once as locals
+    add_file = files_on_disk.append
+    intern = sys.intern
+    for entry in _iter_image_entries(albums_path):
+        scanned += 1
+        path = entry.path
+
+        # Get relative path from data directory (both come from normalized Paths,
+        # so a string prefix test matches Path.relative_to)
+        if not path.startswith(data_prefix):
+            # File is not under data_path, skip it
+            logger.warning(
+                f"File {path} is not under data directory {data_path}"
+            )
+            continue
+        # Interned so the lookup dict and seen set share one string per path
+        filepath_str = intern(path[prefix_length:].replace("\\", "/"))
+
+        try:
+            stat = entry.stat()
+        except OSError:
+            # Removed between listing and stat
+            continue
+
+        add_file((path, filepath_str, entry.name, stat.st_mtime, stat.st_size))
+
+    seen_filepaths = {item[1] for item in files_on_disk}
+
+    # Existing rows for the files on disk, keyed by filepath. Only the columns the
+    # scan needs are selected, so no ORM objects or EXIF blobs are loaded.
+    existing_images: Dict[str, Tuple[int, bool, Optional[float], Optional[int]]] = {}
+    for batch in chunked(list(seen_filepaths)):
+        statement = select(
+            SourceImage.id,
+            SourceImage.filepath,
+            SourceImage.is_deleted,
+            SourceImage.file_mtime,
+            SourceImage.file_size,
+        ).where(SourceImage.filepath.in_(batch))
+        for image_id, image_filepath, image_is_deleted, image_mtime, image_size in session.exec(statement):
+            existing_images[sys.intern(image_filepath)] = (image_id, image_is_deleted, image_mtime, image_size)
+
+    # Album ids for every album on disk, created as needed, so rows carry album_id
+    album_ids = AlbumRepository(session).get_or_create_ids(
+        name
+        for name in map(album_name_from_filepath, seen_filepaths)
+        if name is not None
+    )
 
-            # Extract full EXIF metadata
-            exif_metadata = extract_full_exif_metadata(filepath)
-            
-            # Extract date_taken from EXIF metadata
-            date_taken = None
-            for date_field in [exif_metadata.date_time_original, exif_metadata.date_time_digitized, exif_metadata.date_time]:
-                if date_field:
-                    try:
-                        date_taken = datetime.fromisoformat(date_field)
-                        break
-                    except (ValueError, AttributeError):
-                        continue
-
-            # Check if record exists
-            if filepath_str in existing_images:
-                # Update existing record
-                existing = existing_images[filepath_str]
-                if existing.is_deleted:
-                    existing.is_deleted = False
+    # New and changed records are upserted and committed batch by batch
+    pending_rows: List[Dict[str, Any]] = []
+
+    get_existing = existing_images.get
+    executor: Optional[ProcessPoolExecutor] = None
+    with ExitStack() as stack:
+        for batch in chunked(files_on_disk, SCAN_BATCH_SIZE):
+            to_extract: List[Tuple[str, str, str, float, int, Optional[int]]] = []
+            restored_ids: List[int] = []
+
+            for filepath, filepath_str, filename, mtime, size in batch:
+                # Check if record exists
+                existing = get_existing(filepath_str)
+                if existing is None:
+                    added += 1
+                    to_extract.append((filepath, filepath_str, filename, mtime, size, None))
+                    continue
+
+                image_id, image_is_deleted, image_mtime, image_size = existing
+                if image_is_deleted:
                     added += 1  # Count as added if it was deleted
                 else:
                     updated += 1
 
-                # Update metadata if changed
-                if existing.date_taken != date_taken:
-                    existing.date_taken = date_taken
-                
-                # Update EXIF metadata
-                existing.set_exif_metadata(exif_metadata)
-
-                existing.updated_at = datetime.utcnow()
-                repo.update(existing)
+                if image_mtime == mtime and image_size == size:
+                    # Unchanged since its EXIF was last read; only restore it if needed
+                    if image_is_deleted:
+                        restored_ids.append(image_id)
+                else:
+                    to_extract.append((filepath, filepath_str, filename, mtime, size, image_id))
+
+            paths = [Path(item[0]) for item in to_extract]
+            if executor is not None or (EXIF_WORKERS > 1 and len(paths) >= EXIF_POOL_MIN_FILES):
+                if executor is None:
+                    # Started on first use, so a rescan with few changed files starts
+                    # no processes. Spawned rather than forked from the threaded server.
+                    executor = stack.enter_context(ProcessPoolExecutor(
+                        max_workers=EXIF_WORKERS,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    ))
+                # Results come back in submission order
+                results = executor.map(
+                    _read_scan_metadata,
+                    paths,
+                    chunksize=max(1, len(paths) // (4 * EXIF_WORKERS)),
+                )
             else:
-                # Create new record
-                new_image = SourceImage(
-                    filename=filename,
-                    filepath=filepath_str,
-                    date_taken=date_taken,
-                    is_deleted=False,
+                results = map(_read_scan_metadata, paths)
+
+            for (filepath, filepath_str, filename, mtime, size, image_id), (exif_metadata, date_taken) in zip(
+                to_extract, results
+            ):
+                pending_rows.append({
+                    "id": image_id,
+                    "filename": filename,
+                    "filepath": filepath_str,
+                    "date_taken": date_taken,
+                    "is_deleted": False,
+                    "exif_metadata": exif_metadata,
+                    "file_mtime": mtime,
+                    "file_size": size,
+                    "album_id": album_ids.get(album_name_from_filepath(filepath_str)),
+                })
+
+            _flush_scan_batch(session, pending_rows)
+            if restored_ids:
+                session.exec(
+                    update(SourceImage)
+                    .where(SourceImage.id.in_(restored_ids))
+                    .values(is_deleted=False)
                 )
-                new_image.set_exif_metadata(exif_metadata)
-                repo.create(new_image)
-                added += 1
-
-    # Mark missing files as deleted (but don't delete if referenced)
-    for filepath_str, image in existing_images.items():
-        if filepath_str not in seen_filepaths and not image.is_deleted:
-            # Check if referenced in ImageSlot (would need to query, but for now just mark deleted)
-            image.is_deleted = True
-            image.updated_at = datetime.utcnow()
-            repo.update(image)
-            deleted += 1
+            session.commit()
+            if progress is not None:
+                progress({"scanned": scanned, "added": added, "updated": updated, "deleted": 0})
+
+    # Mark missing files as deleted (but don't delete if referenced). Active rows
+    # are streamed as (id, filepath) pairs and compared against the files on disk;
+    # a NOT IN over every seen path would exceed SQLite's bound-parameter limit.
+    statement = (
+        select(SourceImage.id, SourceImage.filepath)
+        .where(SourceImage.is_deleted == False)
+        .execution_options(yield_per=SCAN_BATCH_SIZE)
+    )
+    missing_ids = [
+        image_id
+        for image_id, image_filepath in session.exec(statement)
+        if image_filepath not in seen_filepaths
+    ]
+    for batch_ids in chunked(missing_ids, SCAN_BATCH_SIZE):
+        # Check if referenced in ImageSlot (would need to query, but for now just mark deleted)
+        session.exec(
+            update(SourceImage)
+            .where(SourceImage.id.in_(batch_ids))
+            .values(is_deleted=True)
+        )
+        session.commit()
+    deleted = len(missing_ids)
 
     logger.info(
         f"Album scan complete: {scanned} scanned, {added} added, "
@@ -0,0 +1,57 @@
+"""
+Shared fixtures: a throwaway SQLite database and data directory, set up before the
+service modules are imported (database.py reads DATABASE_URL at import time).
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="frametv-tests-"))
+DATA_PATH = _TMP_DIR / "data"
+(DATA_PATH / "albums").mkdir(parents=True)
+
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP_DIR / 'test.db'}"
+os.environ["DATA_PATH"] = str(DATA_PATH)
+os.environ["MIGRATION_MODE"] = "skip"
+
+# The service modules import each other as top-level modules from src/
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlmodel import Session, SQLModel  # noqa: E402
+
+from database import engine  # noqa: E402
+from repositories.count_cache import invalidate_all_counts  # noqa: E402
+from repositories.settings_repository import invalidate_settings_cache  # noqa: E402
+from repositories.tag_repository import invalidate_tag_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def empty_database():
+    """Give every test empty tables and empty in-process caches."""
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    invalidate_all_counts()
+    invalidate_tag_cache()
+    invalidate_settings_cache()
+    yield
+
+
+@pytest.fixture
+def session():
+    """A session on the test database."""
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def client():
+    """A test client running the service lifespan (migrations skipped)."""
+    from main import app
+
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,86 @@
+"""
+Tests for the in-process caches: COUNT(*) results, tag listings and settings.
+"""
+
+from sqlmodel import Session
+
+from database import engine
+from models import SourceImage, Tag
+from repositories import SettingsRepository, SourceImageRepository, TagRepository
+
+
+def count_images():
+    with Session(engine) as session:
+        return SourceImageRepository(session).count_not_deleted_filtered()
+
+
+def test_count_cache_invalidated_on_commit(session):
+    """A cached count is dropped once another session commits a write to the table."""
+    assert count_images() == 0
+    session.add(SourceImage(filename="a.jpg", filepath="albums/trip/a.jpg"))
+    session.flush()
+    # Uncommitted rows are counted by the writing session only, and never cached
+    assert SourceImageRepository(session).count_not_deleted_filtered() == 1
+    assert count_images() == 0
+
+    session.commit()
+    assert count_images() == 1
+
+
+def test_count_cache_not_invalidated_by_rollback(session):
+    """Rolled-back writes leave the cached count correct."""
+    assert count_images() == 0
+    session.add(SourceImage(filename="a.jpg", filepath="albums/trip/a.jpg"))
+    session.flush()
+    session.rollback()
+    assert count_images() == 0
+
+
+def test_tag_cache(session):
+    """Tag listings are served from the cache until a tag write commits."""
+    repo = TagRepository(session)
+    assert repo.get_all_sorted() == []
+
+    with Session(engine) as writer:
+        writer_repo = TagRepository(writer)
+        writer_repo.create(Tag(name="landscape"))
+        # The writer sees its own uncommitted tag; other sessions do not
+        assert [tag.name for tag in writer_repo.get_all_sorted()] == ["landscape"]
+        assert repo.get_all_sorted() == []
+        writer.commit()
+
+    assert [tag.name for tag in repo.get_all_sorted()] == ["landscape"]
+    assert [tag.name for tag in repo.search_by_name("land")] == ["landscape"]
+
+
+def test_settings_cache_invalidated_on_commit(session):
+    """A committed setting is seen by the next read from any session."""
+    repo = SettingsRepository(session)
+    assert repo.get_value("theme", "light") == "light"
+
+    with Session(engine) as writer:
+        SettingsRepository(writer).set_value("theme", "dark")
+        assert repo.get_value("theme", "light") == "light"
+        writer.commit()
+
+    assert repo.get_value("theme", "light") == "dark"
+
+
+def test_settings_stored_null_is_not_the_default(session):
+    """A key stored with a null value returns None, not the default."""
+    repo = SettingsRepository(session)
+    repo.set_value("slideshow", None)
+    session.commit()
+    assert repo.get_value("slideshow", "default") is None
+    assert repo.get_value("missing", "default") == "default"
+
+
+def test_settings_cache_is_not_shared_with_callers(session):
+    """Changing a returned value, however deeply, does not change the cache."""
+    repo = SettingsRepository(session)
+    repo.set_value("slideshow", {"albums": ["trip"]})
+    session.commit()
+
+    repo.get_value("slideshow")["albums"].append("home")
+    repo.get_all_dict()["slideshow"]["albums"].append("work")
+    assert repo.get_value("slideshow") == {"albums": ["trip"]}
@@ -0,0 +1,85 @@
+"""
+Tests for conditional GETs on the listing endpoints (routers/conditional.py).
+"""
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from database import engine
+from models import SourceImage
+
+
+@pytest.fixture
+def images(session):
+    """A few source images."""
+    images = [
+        SourceImage(filename=f"{i}.jpg", filepath=f"albums/trip/{i}.jpg", date_taken=datetime(2024, 1, i + 1))
+        for i in range(3)
+    ]
+    session.add_all(images)
+    session.commit()
+    return images
+
+
+def ids(response):
+    return [item["id"] for item in response.json()["items"]]
+
+
+def commit_outside(sql, *params):
+    """Commit a statement on a connection of its own, as another process would."""
+    connection = sqlite3.connect(engine.url.database)
+    with connection:
+        connection.execute(sql, params)
+    connection.close()
+
+
+def test_not_modified_until_a_write(client, images, session):
+    """A repeated listing is a 304 until the images change, in or outside this process."""
+    response = client.get("/source-images")
+    etag = response.headers["etag"]
+    assert client.get("/source-images", headers={"If-None-Match": etag}).status_code == 304
+
+    # A write through the service
+    assert client.patch(f"/source-images/{images[0].id}", json={"is_deleted": True}).status_code == 200
+    response = client.get("/source-images", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert client.get("/source-images", headers={"If-None-Match": etag}).status_code == 304
+
+    # A commit by another process
+    commit_outside("UPDATE source_images SET is_deleted = 1 WHERE id = ?", images[1].id)
+    response = client.get("/source-images", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert images[1].id not in ids(response)
+
+
+def test_tag_listing_sees_commits_from_other_connections(client):
+    """A tag committed outside the service shows up in the next conditional listing."""
+    response = client.get("/tags")
+    assert response.json() == []
+
+    commit_outside("INSERT INTO tags (name) VALUES ('landscape')")
+
+    response = client.get("/tags", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 200
+    assert [tag["name"] for tag in response.json()] == ["landscape"]
+
+
+def test_etag_settles_after_a_write(client, images):
+    """One write changes the ETag once, whichever pooled connections later requests use."""
+    # Put several connections in the pool
+    held = [engine.connect() for _ in range(5)]
+    for connection in held:
+        connection.close()
+
+    assert client.patch(f"/source-images/{images[0].id}", json={"filename": "renamed.jpg"}).status_code == 200
+    etag = client.get("/source-images").headers["etag"]
+    # Keep more and more connections checked out, so each request runs on another one
+    held = []
+    for _ in range(5):
+        assert client.get("/source-images", headers={"If-None-Match": etag}).status_code == 304
+        held.append(engine.connect())
+    for connection in held:
+        connection.close()
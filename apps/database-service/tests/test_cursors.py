@@ -0,0 +1,120 @@
+"""
+Tests for paging the /source-images and /gallery-images listings.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from models import GalleryImage, SourceImage
+
+# Ties and missing dates, so the id tie-breaker and NULL ordering are both exercised
+DATES = [
+    datetime(2024, 1, 3),
+    datetime(2024, 1, 1),
+    None,
+    datetime(2024, 1, 2),
+    datetime(2024, 1, 2),
+    None,
+    datetime(2024, 1, 5),
+    datetime(2024, 1, 2),
+]
+
+
+@pytest.fixture
+def images(session):
+    """Source images with repeated and missing dates; one deleted."""
+    images = [
+        SourceImage(filename=f"{name}.jpg", filepath=f"albums/trip/{name}.jpg", date_taken=date_taken)
+        for name, date_taken in zip("hcafbgde", DATES)
+    ]
+    images.append(SourceImage(filename="deleted.jpg", filepath="albums/trip/deleted.jpg", is_deleted=True))
+    session.add_all(images)
+    session.commit()
+    return images
+
+
+def ids(response):
+    return [item["id"] for item in response.json()["items"]]
+
+
+@pytest.mark.parametrize("sort_by", ["date_taken", "filename", "created_at"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_cursor_pages_match_offset_pages(client, images, sort_by, sort_order):
+    """Following next_cursor visits the same rows, in the same order, as page numbers."""
+    params = {"sort_by": sort_by, "sort_order": sort_order, "limit": 3}
+    offset_ids = []
+    for page in (1, 2, 3):
+        offset_ids += ids(client.get("/source-images", params={**params, "page": page}))
+
+    cursor_ids = []
+    response = client.get("/source-images", params=params)
+    while True:
+        cursor_ids += ids(response)
+        next_cursor = response.json()["next_cursor"]
+        if next_cursor is None:
+            assert not response.json()["has_more"]
+            break
+        response = client.get("/source-images", params={**params, "cursor": next_cursor})
+
+    assert cursor_ids == offset_ids
+    assert sorted(cursor_ids) == sorted(image.id for image in images if not image.is_deleted)
+
+
+def test_full_listing_order(client, images):
+    """Newest first, ties broken by id, images without a date last."""
+    response = client.get("/source-images", params={"limit": 100})
+    by_id = {image.id: image for image in images}
+    dates = [by_id[id].date_taken for id in ids(response)]
+    dated = [date for date in dates if date is not None]
+    assert dated == sorted(dated, reverse=True)
+    assert dates[len(dated):] == [None, None]
+
+
+def test_invalid_cursor(client, images):
+    """A cursor that does not decode is rejected."""
+    assert client.get("/source-images", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+@pytest.mark.parametrize("tags", [None, "landscape"])
+def test_gallery_cursor_pages_match_offset_pages(client, session, tags):
+    """Gallery cursors and offset pages share one id order, with and without a tag filter."""
+    session.add_all(
+        GalleryImage(filename=f"{i}.jpg", filepath=f"gallery/{i}.jpg", template_id="single")
+        for i in range(7)
+    )
+    session.commit()
+    if tags:
+        # Tag all but one image, so the filter has something to leave out
+        for gallery_image_id in range(2, 8):
+            response = client.post(f"/gallery-images/{gallery_image_id}/tags", json={"tag_name": tags})
+            assert response.status_code == 201
+    params = {"limit": 3, **({"tags": tags} if tags else {})}
+
+    offset_ids = []
+    for page in (1, 2, 3):
+        offset_ids += ids(client.get("/gallery-images", params={**params, "page": page}))
+
+    # Start from an offset page, then follow the cursors
+    response = client.get("/gallery-images", params={**params, "page": 1})
+    cursor_ids = []
+    while True:
+        cursor_ids += ids(response)
+        next_cursor = response.json()["next_cursor"]
+        if next_cursor is None:
+            break
+        response = client.get("/gallery-images", params={**params, "cursor": next_cursor})
+
+    assert cursor_ids == offset_ids == sorted(offset_ids)
+    assert len(cursor_ids) == (6 if tags else 7)
+
+
+def test_include_total(client, images):
+    """The total is only computed on request; has_more tells whether a page follows."""
+    body = client.get("/source-images", params={"limit": 3}).json()
+    assert (body["total"], body["pages"], body["has_more"]) == (None, None, True)
+    body = client.get("/source-images", params={"limit": 3, "include_total": True}).json()
+    assert (body["total"], body["pages"], body["has_more"]) == (8, 3, True)
+    # The last page gives the total without a COUNT
+    body = client.get("/source-images", params={"limit": 3, "page": 3, "include_total": True}).json()
+    assert (body["total"], body["pages"], body["has_more"]) == (8, 3, False)
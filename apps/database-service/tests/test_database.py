@@ -0,0 +1,76 @@
+"""
+Tests for get_session: one transaction per request.
+"""
+
+import pytest
+from sqlmodel import Session, select
+
+from database import engine, get_session
+from models import SourceImage, Tag
+from repositories import SourceImageTagRepository, TagRepository
+
+
+def tag_names():
+    with Session(engine) as session:
+        return [tag.name for tag in session.exec(select(Tag))]
+
+
+def test_commits_when_the_endpoint_returns():
+    """Writes that were only flushed are committed once the request completes."""
+    sessions = get_session()
+    session = next(sessions)
+    TagRepository(session).create(Tag(name="landscape"))
+    assert tag_names() == []
+
+    with pytest.raises(StopIteration):
+        next(sessions)
+    assert tag_names() == ["landscape"]
+
+
+def test_rolls_back_when_the_endpoint_raises():
+    """Nothing from a failed request is written, including earlier flushed writes."""
+    sessions = get_session()
+    session = next(sessions)
+    TagRepository(session).create(Tag(name="landscape"))
+
+    with pytest.raises(ValueError):
+        sessions.throw(ValueError("failed"))
+    assert tag_names() == []
+
+
+def test_failed_request_leaves_no_partial_writes(client, session, monkeypatch):
+    """A request that fails after a write does not keep that write."""
+    image = SourceImage(filename="a.jpg", filepath="albums/trip/a.jpg")
+    session.add(image)
+    session.commit()
+
+    def fail(self, source_image_id, tag_id):
+        raise RuntimeError("failed")
+
+    # The tag is created before tagging the image fails
+    monkeypatch.setattr(SourceImageTagRepository, "add_tag_to_source_image", fail)
+    with pytest.raises(RuntimeError):
+        client.post(f"/source-images/{image.id}/tags", json={"tag_name": "landscape"})
+    assert tag_names() == []
+
+
+def test_response_waits_for_the_commit(monkeypatch):
+    """A commit that fails turns the response into an error, not a success for lost data."""
+    from fastapi.testclient import TestClient
+    from main import app
+
+    def fail(self):
+        raise RuntimeError("commit failed")
+
+    with TestClient(app, raise_server_exceptions=False) as client:
+        with monkeypatch.context() as patch:
+            patch.setattr(Session, "commit", fail)
+            assert client.post("/tags", json={"name": "landscape"}).status_code == 500
+        assert client.get("/tags").json() == []
+
+
+def test_write_is_visible_to_the_next_request(client):
+    """A response is only sent once its writes are committed."""
+    tag = client.post("/tags", json={"name": "landscape"}).json()
+    assert [t["name"] for t in client.get("/tags").json()] == ["landscape"]
+    assert client.get(f"/tags/{tag['id']}").json()["name"] == "landscape"
@@ -0,0 +1,329 @@
+"""
+Tests for the struct-based EXIF reader in scanner.py.
+
+Fixtures are written with PIL, and the results are compared with PIL's own
+_getexif reader, which the scanner used before.
+"""
+
+import struct
+import zlib
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from PIL.TiffImagePlugin import IFDRational
+
+import scanner
+from scanner import (
+    _parse_exif_segment,
+    _read_ifd,
+    _read_jpeg_exif_segment,
+    _read_png_exif_segment,
+    extract_full_exif_metadata,
+)
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def make_exif(endian: str = "<", gps: bool = True) -> Image.Exif:
+    """EXIF with IFD0, Exif IFD and (optionally) GPS tags of every value type the scanner reads."""
+    exif = Image.Exif()
+    exif.endian = endian
+    exif[0x010F] = "Canon"
+    exif[0x0110] = "EOS R5"
+    exif[0x0132] = "2024:01:02 03:04:05"
+    exif[0x0112] = 6
+    exif_ifd = exif.get_ifd(0x8769)
+    exif_ifd[0x9003] = "2024:01:02 03:04:05"
+    exif_ifd[0x829A] = IFDRational(1, 250)
+    exif_ifd[0x829D] = IFDRational(28, 10)
+    exif_ifd[0x8827] = 200
+    exif_ifd[0x920A] = IFDRational(50, 1)
+    if gps:
+        gps_ifd = exif.get_ifd(0x8825)
+        gps_ifd[1] = "N"
+        gps_ifd[2] = (IFDRational(40, 1), IFDRational(26, 1), IFDRational(4600, 100))
+        gps_ifd[3] = "W"
+        gps_ifd[4] = (IFDRational(79, 1), IFDRational(58, 1), IFDRational(5600, 100))
+        gps_ifd[5] = b"\x01"
+        gps_ifd[6] = IFDRational(120, 1)
+        gps_ifd[7] = (IFDRational(14, 1), IFDRational(30, 1), IFDRational(1525, 100))
+    return exif
+
+
+def png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Serialize one PNG chunk with its CRC."""
+    return struct.pack(">I4s", len(data), chunk_type) + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+
+def png_chunks(data: bytes) -> list:
+    """Split a PNG file into (type, data) chunks."""
+    chunks = []
+    pos = len(PNG_SIGNATURE)
+    while pos < len(data):
+        length, chunk_type = struct.unpack(">I4s", data[pos:pos + 8])
+        chunks.append((chunk_type, data[pos + 8:pos + 8 + length]))
+        pos += 12 + length
+    return chunks
+
+
+def write_png(path: Path, chunks: list) -> None:
+    """Write a PNG file from (type, data) chunks."""
+    path.write_bytes(PNG_SIGNATURE + b"".join(png_chunk(t, d) for t, d in chunks))
+
+
+def raw_profile(exif: Image.Exif) -> bytes:
+    """ImageMagick "Raw profile type exif" text: name, length, then hex lines."""
+    raw = exif.tobytes()
+    hex_data = raw.hex()
+    lines = "\n".join(hex_data[i:i + 72] for i in range(0, len(hex_data), 72))
+    return f"\nexif\n{len(raw):8d}\n{lines}\n".encode()
+
+
+def jpeg_with_segment_first(path: Path, marker: int, payload: bytes) -> None:
+    """Rewrite a JPEG with an extra marker segment right after SOI."""
+    data = path.read_bytes()
+    segment = struct.pack(">BBH", 0xFF, marker, len(payload) + 2) + payload
+    path.write_bytes(data[:2] + segment + data[2:])
+
+
+def _jpeg(path: Path) -> None:
+    Image.new("RGB", (64, 48), "red").save(path, exif=make_exif())
+
+
+def _jpeg_big_endian(path: Path) -> None:
+    Image.new("RGB", (64, 48)).save(path, exif=make_exif(">"))
+
+
+def _jpeg_without_gps(path: Path) -> None:
+    Image.new("RGB", (64, 48)).save(path, exif=make_exif(gps=False))
+
+
+def _jpeg_large_segment_before_exif(path: Path) -> None:
+    # Larger than the first read of the file head, so the walk continues from a new read
+    _jpeg(path)
+    jpeg_with_segment_first(path, 0xE2, b"ICC_PROFILE\x00" + bytes(60000))
+
+
+def _jpeg_xmp_before_exif(path: Path) -> None:
+    _jpeg(path)
+    jpeg_with_segment_first(path, 0xE1, b"http://ns.adobe.com/xap/1.0/\x00<x:xmpmeta/>")
+
+
+def _jpeg_fill_bytes(path: Path) -> None:
+    _jpeg(path)
+    data = path.read_bytes()
+    path.write_bytes(data[:2] + b"\xff\xff\xff" + data[2:])
+
+
+def _jpeg_no_exif(path: Path) -> None:
+    Image.new("RGB", (64, 48)).save(path)
+
+
+def _png_exif_before_idat(path: Path) -> None:
+    Image.new("RGB", (64, 48)).save(path, exif=make_exif())
+
+
+def _png_exif_after_idat(path: Path) -> None:
+    _png_no_exif(path)
+    chunks = png_chunks(path.read_bytes())
+    write_png(path, chunks[:-1] + [(b"eXIf", make_exif().tobytes()[6:])] + chunks[-1:])
+
+
+def _png_raw_profile_text(path: Path) -> None:
+    _png_no_exif(path)
+    chunks = png_chunks(path.read_bytes())
+    text = b"Raw profile type exif\x00" + raw_profile(make_exif())
+    write_png(path, chunks[:1] + [(b"tEXt", text)] + chunks[1:])
+
+
+def _png_raw_profile_ztxt(path: Path) -> None:
+    _png_no_exif(path)
+    chunks = png_chunks(path.read_bytes())
+    text = b"Raw profile type exif\x00\x00" + zlib.compress(raw_profile(make_exif()))
+    write_png(path, chunks[:1] + [(b"zTXt", text)] + chunks[1:])
+
+
+def _png_other_text(path: Path) -> None:
+    _png_no_exif(path)
+    chunks = png_chunks(path.read_bytes())
+    text = b"Comment\x00a comment that is longer than the raw profile keyword"
+    write_png(path, chunks[:1] + [(b"tEXt", text)] + chunks[1:])
+
+
+def _png_no_exif(path: Path) -> None:
+    Image.new("RGB", (64, 48)).save(path)
+
+
+def _bmp(path: Path) -> None:
+    Image.new("RGB", (64, 48)).save(path)
+
+
+FIXTURES = {
+    "jpeg.jpg": _jpeg,
+    "jpeg-big-endian.jpg": _jpeg_big_endian,
+    "jpeg-without-gps.jpeg": _jpeg_without_gps,
+    "jpeg-large-segment-before-exif.jpg": _jpeg_large_segment_before_exif,
+    "jpeg-xmp-before-exif.jpg": _jpeg_xmp_before_exif,
+    "jpeg-fill-bytes.jpg": _jpeg_fill_bytes,
+    "jpeg-no-exif.jpg": _jpeg_no_exif,
+    "png-exif-before-idat.png": _png_exif_before_idat,
+    "png-exif-after-idat.png": _png_exif_after_idat,
+    "png-raw-profile-text.png": _png_raw_profile_text,
+    "png-raw-profile-ztxt.png": _png_raw_profile_ztxt,
+    "png-other-text.png": _png_other_text,
+    "png-no-exif.png": _png_no_exif,
+    "bmp.bmp": _bmp,
+}
+
+WITH_EXIF = [name for name in FIXTURES if "no-exif" not in name and "other-text" not in name and name != "bmp.bmp"]
+
+
+@pytest.fixture
+def fixture_path(request, tmp_path):
+    """Write the named fixture image and return its path."""
+    path = tmp_path / request.param
+    FIXTURES[request.param](path)
+    return path
+
+
+def pil_metadata(path: Path, monkeypatch) -> dict:
+    """The stored EXIF dict built from PIL's _getexif instead of the struct reader."""
+    def read_with_pil(filepath: Path):
+        with Image.open(filepath) as img:
+            return img._getexif()
+
+    with monkeypatch.context() as patch:
+        patch.setattr(scanner, "_read_exif_tags", read_with_pil)
+        return extract_full_exif_metadata(path).to_stored_dict()
+
+
+@pytest.mark.parametrize("fixture_path", list(FIXTURES), indirect=True)
+def test_metadata_matches_pil(fixture_path, monkeypatch):
+    """Every fixture yields the same stored metadata as PIL's reader."""
+    assert extract_full_exif_metadata(fixture_path).to_stored_dict() == pil_metadata(fixture_path, monkeypatch)
+
+
+@pytest.mark.parametrize("fixture_path", WITH_EXIF, indirect=True)
+def test_metadata_values(fixture_path):
+    """Values from every IFD are converted, including the GPS composites."""
+    metadata = extract_full_exif_metadata(fixture_path)
+    assert metadata.make == "Canon"
+    assert metadata.model == "EOS R5"
+    assert metadata.date_time_original == "2024-01-02T03:04:05"
+    assert metadata.f_number == pytest.approx(2.8)
+    assert metadata.iso_speed == 200
+    if "without-gps" in fixture_path.name:
+        assert metadata.gps_latitude is None
+    else:
+        assert metadata.gps_latitude == pytest.approx(40 + 26 / 60 + 46 / 3600)
+        assert metadata.gps_longitude == pytest.approx(-(79 + 58 / 60 + 56 / 3600))
+        assert metadata.gps_altitude == pytest.approx(-120.0)
+        assert metadata.gps_timestamp == "14:30:15.25"
+
+
+@pytest.mark.parametrize(
+    "fixture_path",
+    [name for name in FIXTURES if name.endswith((".jpg", ".jpeg"))],
+    indirect=True,
+)
+def test_read_jpeg_exif_segment(fixture_path):
+    """The APP1 Exif segment is found behind other segments, or None without one."""
+    segment = _read_jpeg_exif_segment(fixture_path)
+    if "no-exif" in fixture_path.name:
+        assert segment is None
+    else:
+        with Image.open(fixture_path) as img:
+            assert segment == img.info["exif"]
+
+
+@pytest.mark.parametrize(
+    "fixture_path",
+    [name for name in FIXTURES if name.endswith(".png")],
+    indirect=True,
+)
+def test_read_png_exif_segment(fixture_path):
+    """EXIF comes from eXIf or raw profile chunks, returned with the APP1 header."""
+    segment = _read_png_exif_segment(fixture_path)
+    if fixture_path.name in WITH_EXIF:
+        assert segment == make_exif().tobytes()
+    else:
+        assert segment is None
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["jpeg.jpg", "png-exif-before-idat.png", "png-exif-after-idat.png"],
+)
+@pytest.mark.parametrize("keep", [0, 2, 8, 20, 60, 200])
+def test_truncated_files_do_not_raise(tmp_path, name, keep):
+    """A file cut short at any point leaves the metadata empty or partial, without raising."""
+    path = tmp_path / name
+    FIXTURES[name](path)
+    path.write_bytes(path.read_bytes()[:keep])
+    metadata = extract_full_exif_metadata(path)
+    assert isinstance(metadata.to_stored_dict(), dict)
+
+
+def test_corrupt_jpeg_marker(tmp_path):
+    """A JPEG whose marker stream breaks before APP1 has no EXIF."""
+    path = tmp_path / "corrupt.jpg"
+    _jpeg(path)
+    data = path.read_bytes()
+    path.write_bytes(data[:2] + b"\x00\x00" + data[2:])
+    assert _read_jpeg_exif_segment(path) is None
+    assert extract_full_exif_metadata(path).to_stored_dict() == {}
+
+
+def test_parse_exif_segment_byte_orders():
+    """Little- and big-endian TIFF data parse to the same tags."""
+    little = _parse_exif_segment(make_exif("<").tobytes())
+    big = _parse_exif_segment(make_exif(">").tobytes())
+    assert little == big
+    assert little[0x010F] == "Canon"
+    assert little[0x829A] == pytest.approx(1 / 250)
+    assert little[0x8825][1] == "N"
+    assert little[0x8825][5] == b"\x01"
+
+
+def test_parse_exif_segment_rejects_unknown_byte_order():
+    """Data that is not a TIFF header is not EXIF."""
+    assert _parse_exif_segment(b"Exif\x00\x00XX\x00*\x08\x00\x00\x00") is None
+
+
+def _tiff(entries: list, order: str = "<") -> bytes:
+    """A TIFF header and one IFD at offset 8 with (tag, type, count, value field) entries."""
+    data = (b"II*\x00" if order == "<" else b"MM\x00*") + struct.pack(order + "L", 8)
+    data += struct.pack(order + "H", len(entries))
+    for tag, field_type, count, value in entries:
+        data += struct.pack(order + "HHL", tag, field_type, count) + value
+    return data + struct.pack(order + "L", 0)
+
+
+def test_read_ifd_inline_and_offset_values():
+    """Values of up to four bytes sit in the entry; longer ones are read at their offset."""
+    data = _tiff([
+        (0x0112, 3, 1, struct.pack("<HH", 6, 0)),
+        (0x829A, 5, 1, struct.pack("<L", 8 + 2 + 3 * 12 + 4)),
+        (0x9999, 3, 1, struct.pack("<HH", 1, 0)),
+    ]) + struct.pack("<LL", 1, 250)
+    tags = _read_ifd(data, 8, "<", frozenset({0x0112, 0x829A}))
+    assert tags == {0x0112: 6, 0x829A: 1 / 250}
+
+
+def test_read_ifd_skips_out_of_range_values():
+    """Entries pointing past the data, and entries past the end, are skipped."""
+    data = _tiff([
+        (0x010F, 2, 10, struct.pack("<L", 5000)),
+        (0x0112, 3, 1, struct.pack("<HH", 6, 0)),
+    ])
+    assert _read_ifd(data, 8, "<", frozenset({0x010F, 0x0112})) == {0x0112: 6}
+    assert _read_ifd(data[:8 + 2 + 12], 8, "<", frozenset({0x010F, 0x0112})) == {}
+    assert _read_ifd(data, len(data), "<", frozenset({0x0112})) == {}
+    assert _read_ifd(data, 4, "<", frozenset({0x0112})) == {}
+
+
+def test_read_ifd_zero_denominator():
+    """A rational with a zero denominator is kept as a (num, den) tuple, like PIL."""
+    data = _tiff([(0x829D, 5, 1, struct.pack("<L", 8 + 2 + 12 + 4))]) + struct.pack("<LL", 5, 0)
+    assert _read_ifd(data, 8, "<", frozenset({0x829D})) == {0x829D: (5, 0)}
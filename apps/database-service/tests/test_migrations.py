@@ -0,0 +1,69 @@
+"""
+Tests for the Alembic migrations against a database whose tables were created from
+the current models, as on startup (create_db_and_tables runs before the migrations).
+"""
+
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
+
+from database import engine
+
+SERVICE_ROOT = Path(__file__).parent.parent
+
+
+def alembic_config() -> Config:
+    config = Config(str(SERVICE_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(SERVICE_ROOT / "alembic"))
+    return config
+
+
+def current_revision() -> str:
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT version_num FROM alembic_version")).scalar_one()
+
+
+def upgrade(from_revision: str, to_revision: str) -> None:
+    """Stamp the database at from_revision and upgrade it to to_revision."""
+    config = alembic_config()
+    command.stamp(config, from_revision, purge=True)
+    command.upgrade(config, to_revision)
+    assert current_revision() == to_revision
+
+
+def source_image_columns() -> set:
+    return {column["name"] for column in inspect(engine).get_columns("source_images")}
+
+
+def test_file_mtime_column_already_present():
+    """008 skips adding file_mtime when the table already has it."""
+    assert "file_mtime" in source_image_columns()
+    upgrade("007_add_tv_content_app_managed_index", "008_add_source_image_file_mtime")
+
+
+def test_albums_table_already_present():
+    """010 skips the albums table, its name index and album_id when they already exist."""
+    upgrade("009_add_source_sort_indexes", "010_add_albums")
+    assert "album_id" in source_image_columns()
+    assert "ix_albums_name" in {index["name"] for index in inspect(engine).get_indexes("albums")}
+
+
+def test_is_used_column_already_present():
+    """011 skips adding is_used when the table already has it."""
+    upgrade("010_add_albums", "011_add_source_is_used_column")
+    assert "is_used" in source_image_columns()
+
+
+def test_file_size_column_already_present():
+    """012 skips adding file_size when the table already has it."""
+    upgrade("011_add_source_is_used_column", "012_add_source_image_file_size")
+    assert "file_size" in source_image_columns()
+
+
+def test_upgrade_to_head_is_repeatable():
+    """From before the column migrations to head, and again on the next startup."""
+    upgrade("007_add_tv_content_app_managed_index", "012_add_source_image_file_size")
+    command.upgrade(alembic_config(), "head")
+    assert current_revision() == "012_add_source_image_file_size"
@@ -0,0 +1,109 @@
+"""
+Tests for scan_albums_directory: a scan round trip over a temporary data directory.
+"""
+
+import os
+
+import pytest
+from PIL import Image
+from sqlmodel import select
+
+from models import Album, SourceImage
+from scanner import scan_albums_directory
+
+
+def write_image(path, make: str) -> None:
+    """Write a JPEG whose EXIF Make is make."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    exif = Image.Exif()
+    exif[0x010F] = make
+    exif.get_ifd(0x8769)[0x9003] = "2024:01:02 03:04:05"
+    Image.new("RGB", (32, 24)).save(path, exif=exif)
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    """A data directory with two images in one album."""
+    write_image(tmp_path / "albums" / "trip" / "a.jpg", "Canon")
+    write_image(tmp_path / "albums" / "trip" / "b.jpg", "Nikon")
+    return tmp_path
+
+
+def scan(data_path, session):
+    return scan_albums_directory(data_path / "albums", data_path, session)
+
+
+def rows(session):
+    """Source image rows keyed by filepath."""
+    session.expire_all()
+    return {image.filepath: image for image in session.exec(select(SourceImage))}
+
+
+def test_scan_adds_new_files(data_path, session):
+    """New files are inserted with their EXIF, file stats and album."""
+    assert scan(data_path, session) == {"scanned": 2, "added": 2, "updated": 0, "deleted": 0}
+
+    images = rows(session)
+    assert set(images) == {"albums/trip/a.jpg", "albums/trip/b.jpg"}
+    image = images["albums/trip/a.jpg"]
+    stat = os.stat(data_path / image.filepath)
+    assert image.filename == "a.jpg"
+    assert image.exif_metadata["make"] == "Canon"
+    assert image.date_taken.isoformat() == "2024-01-02T03:04:05"
+    assert image.file_mtime == stat.st_mtime
+    assert image.file_size == stat.st_size
+    album = session.exec(select(Album).where(Album.name == "trip")).one()
+    assert image.album_id == album.id
+
+
+def test_rescan_skips_unchanged_files(data_path, session, monkeypatch):
+    """Files whose mtime and size are unchanged are not read again."""
+    scan(data_path, session)
+    before = {path: image.updated_at for path, image in rows(session).items()}
+
+    def fail(filepath):
+        raise AssertionError(f"unchanged file was re-read: {filepath}")
+
+    monkeypatch.setattr("scanner._read_scan_metadata", fail)
+    assert scan(data_path, session) == {"scanned": 2, "added": 0, "updated": 2, "deleted": 0}
+    assert {path: image.updated_at for path, image in rows(session).items()} == before
+
+
+def test_rescan_rereads_changed_files(data_path, session):
+    """A file with a new mtime has its EXIF and stats read again."""
+    scan(data_path, session)
+    path = data_path / "albums" / "trip" / "a.jpg"
+    write_image(path, "Sony")
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    scan(data_path, session)
+    image = rows(session)["albums/trip/a.jpg"]
+    assert image.exif_metadata["make"] == "Sony"
+    assert image.file_mtime == stat.st_mtime + 10
+    assert image.file_size == path.stat().st_size
+    assert rows(session)["albums/trip/b.jpg"].exif_metadata["make"] == "Nikon"
+
+
+def test_rescan_marks_missing_files_deleted_and_restores_them(data_path, session):
+    """Removed files are soft-deleted; a file that comes back is restored."""
+    scan(data_path, session)
+    path = data_path / "albums" / "trip" / "b.jpg"
+    content = path.read_bytes()
+    stat = path.stat()
+    path.unlink()
+
+    assert scan(data_path, session) == {"scanned": 1, "added": 0, "updated": 1, "deleted": 1}
+    images = rows(session)
+    assert images["albums/trip/b.jpg"].is_deleted
+    assert not images["albums/trip/a.jpg"].is_deleted
+
+    path.write_bytes(content)
+    os.utime(path, (stat.st_atime, stat.st_mtime))
+    assert scan(data_path, session) == {"scanned": 2, "added": 1, "updated": 1, "deleted": 0}
+    assert not rows(session)["albums/trip/b.jpg"].is_deleted
+
+
+def test_scan_missing_albums_directory(tmp_path, session):
+    """A data directory without albums/ scans nothing."""
+    assert scan(tmp_path, session) == {"scanned": 0, "added": 0, "updated": 0, "deleted": 0}
@@ -0,0 +1,39 @@
+"""
+Tests for tracked album scans (routers/scanner.py), including the startup scan.
+"""
+
+import threading
+
+import routers.scanner
+from routers.scanner import run_scan_now
+
+
+def test_scan_requested_during_startup_scan_reports_it(client, monkeypatch):
+    """While the startup scan runs, POST /source-images/scan returns it instead of starting another."""
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_scan(albums_path, data_path, session, progress=None):
+        calls.append(albums_path)
+        started.set()
+        release.wait(5)
+        return {"scanned": 0, "added": 0, "updated": 0, "deleted": 0}
+
+    monkeypatch.setattr(routers.scanner, "scan_albums_directory", slow_scan)
+    results = []
+    startup = threading.Thread(target=lambda: results.append(run_scan_now()))
+    startup.start()
+    assert started.wait(5)
+
+    response = client.post("/source-images/scan")
+    assert response.json()["state"] == "running"
+    # A second startup run does not start another scan either
+    assert run_scan_now() is None
+
+    release.set()
+    startup.join(5)
+    assert len(calls) == 1
+    assert results[0].scan_id == response.json()["scan_id"]
+    assert results[0].state == "completed"
+    assert client.get(f"/source-images/scan/{results[0].scan_id}").json()["state"] == "completed"
@@ -0,0 +1,29 @@
+"""
+Tests for SourceImageRepository.recalculate_all_usage_counts.
+"""
+
+import sqlite3
+
+from database import engine
+from models import SourceImage
+from repositories import SourceImageRepository
+
+
+def test_reports_the_current_total(session):
+    """The total is counted in the reconciling transaction, not taken from the count cache."""
+    session.add(SourceImage(filename="a.jpg", filepath="albums/trip/a.jpg"))
+    session.commit()
+    repo = SourceImageRepository(session)
+    assert repo.count() == 1
+    session.commit()
+
+    # Another process adds an image, which this process's count cache cannot see
+    connection = sqlite3.connect(engine.url.database)
+    with connection:
+        connection.execute(
+            "INSERT INTO source_images (filename, filepath, is_deleted, usage_count) VALUES ('b.jpg', 'albums/trip/b.jpg', 0, -1)"
+        )
+    connection.close()
+
+    result = repo.recalculate_all_usage_counts()
+    assert result == {"total_images": 2, "updated_count": 1, "negative_counts_corrected": 1}
@@ -2,8 +2,10 @@
 Client for communicating with Database Service.
 """
 
+import asyncio
 import os
 import logging
+import weakref
 from typing import List, Dict, Any, Optional
 import httpx
 
@@ -11,18 +13,53 @@ logger = logging.getLogger(__name__)
 
 DATABASE_SERVICE_URL = os.getenv("DATABASE_SERVICE_URL", "http://localhost:8001")
 
+# Connection pool and timeouts of the shared HTTP clients. A sync can issue
+# many lookups at once, so the pool allows that many concurrent connections.
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=3.0)
+
+# Most gallery image IDs the database service accepts in one batch lookup
+TV_CONTENT_LOOKUP_BATCH = 1000
+
+# One pooled AsyncClient per event loop and base URL, shared by every
+# DatabaseClient so requests reuse keep-alive connections. Keyed by loop because
+# a client's connections belong to the loop that opened them.
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_shared_client(base_url: str) -> httpx.AsyncClient:
+    """Return the running loop's pooled client for base_url, creating it on first use."""
+    clients = _shared_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(base_url)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT
+        )
+        clients[base_url] = client
+    return client
+
+
+async def close_shared_clients() -> None:
+    """Close the running loop's pooled clients (on shutdown or at the end of a script)."""
+    for client in _shared_clients.pop(asyncio.get_running_loop(), {}).values():
+        await client.aclose()
+
 
 class DatabaseClient:
     """Client for Database Service API."""
 
     def __init__(self, base_url: str = DATABASE_SERVICE_URL):
-        """Initialize database client."""
+        """Initialize database client on the shared connection pool (needs a running loop)."""
         self.base_url = base_url.rstrip("/")
-        self.client = httpx.AsyncClient(base_url=base_url, timeout=30.0)
+        self.client = _get_shared_client(self.base_url)
 
     async def close(self):
-        """Close HTTP client."""
-        await self.client.aclose()
+        """
+        Release the client. The pooled connections are shared with other
+        instances and stay open; close_shared_clients closes them.
+        """
 
     async def get_tv_content_mappings(
         self, page: int = 1, limit: int = 1000
@@ -50,6 +87,28 @@ class DatabaseClient:
         except httpx.HTTPStatusError:
             return None
 
+    async def get_tv_content_by_gallery_image_ids(
+        self, gallery_image_ids: List[int]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Get TV content mappings for several gallery image IDs, keyed by gallery
+        image ID (IDs without a mapping are left out). One request per
+        TV_CONTENT_LOOKUP_BATCH IDs instead of one per ID.
+        """
+        mappings: Dict[int, Dict[str, Any]] = {}
+        ids = list(dict.fromkeys(gallery_image_ids))
+        for start in range(0, len(ids), TV_CONTENT_LOOKUP_BATCH):
+            response = await self.client.post(
+                "/tv-content/by-gallery-image/batch",
+                json={"ids": ids[start:start + TV_CONTENT_LOOKUP_BATCH]},
+            )
+            response.raise_for_status()
+            mappings.update(
+                (int(gallery_image_id), mapping)
+                for gallery_image_id, mapping in response.json().items()
+            )
+        return mappings
+
     async def get_tv_content_by_tv_id(
         self, tv_content_id: str
     ) -> Optional[Dict[str, Any]]:
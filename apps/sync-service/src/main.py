@@ -5,6 +5,7 @@ FastAPI sync service for syncing images to Samsung Frame TV.
 import json
 import logging
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -27,7 +28,7 @@ if os.getenv("MOCK_TV", "").lower() == "true":
         "TV mocking enabled via MOCK_TV environment variable"
     )
 
-from database_client import DatabaseClient  # noqa: E402
+from database_client import DatabaseClient, close_shared_clients  # noqa: E402
 from samsungtvws.async_art import SamsungTVAsyncArt  # noqa: E402
 from tv_refresh import (
     get_data_dir,
@@ -50,8 +51,16 @@ logger = logging.getLogger(__name__)
 # Get port from environment variable or use default
 PORT = int(os.getenv("SYNC_SERVICE_PORT", "8000"))
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Close the pooled database service connections on shutdown."""
+    yield
+    await close_shared_clients()
+
+
 # Create FastAPI app
-app = FastAPI(title="Frame TV Sync Service", version="1.0.0")
+app = FastAPI(title="Frame TV Sync Service", version="1.0.0", lifespan=lifespan)
 
 # Configure CORS to allow requests from Next.js app (typically on localhost:3000)
 app.add_middleware(
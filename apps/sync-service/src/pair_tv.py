@@ -16,7 +16,7 @@ from typing import Optional
 import aiohttp
 import typer
 from samsungtvws.encrypted.authenticator import SamsungTVEncryptedWSAsyncAuthenticator
-from database_client import DatabaseClient
+from database_client import DatabaseClient, close_shared_clients
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -42,7 +42,8 @@ async def async_main(ip: Optional[str], port: int):
             try:
                 tv_ip = await db_client.get_setting("tv_ip_address")
             finally:
-                await db_client.close()
+                # The only database request of the script
+                await close_shared_clients()
         except Exception as e:
             logger.warning(f"Failed to load settings from database: {e}")
             tv_ip = None
@@ -108,12 +108,13 @@ async def sync_add_mode(
         if not gallery_images:
             return (False, [], failed, len(gallery_image_ids), 0)
 
-        # Check which images are already on TV
-        images_to_upload = []
-        for image in gallery_images:
-            mapping = await db_client.get_tv_content_by_gallery_image_id(image["id"])
-            if not mapping:
-                images_to_upload.append(image)
+        # Check which images are already on TV (one lookup for all of them)
+        mappings = await db_client.get_tv_content_by_gallery_image_ids(
+            [image["id"] for image in gallery_images]
+        )
+        images_to_upload = [
+            image for image in gallery_images if image["id"] not in mappings
+        ]
 
         if not images_to_upload:
             logger.info("All selected images are already on TV")
@@ -404,12 +405,13 @@ async def sync_add_mode_stream(
             }
             return
 
-        # Check which images are already on TV
-        images_to_upload = []
-        for image in gallery_images:
-            mapping = await db_client.get_tv_content_by_gallery_image_id(image["id"])
-            if not mapping:
-                images_to_upload.append(image)
+        # Check which images are already on TV (one lookup for all of them)
+        mappings = await db_client.get_tv_content_by_gallery_image_ids(
+            [image["id"] for image in gallery_images]
+        )
+        images_to_upload = [
+            image for image in gallery_images if image["id"] not in mappings
+        ]
 
         if not images_to_upload:
             logger.info("All selected images are already on TV")
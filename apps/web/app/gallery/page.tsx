@@ -61,6 +61,7 @@ interface GalleryResponse {
   total: number;
   page: number;
   pages: number;
+  item_tags?: Record<number, Tag[]> | null;
 }
 
 interface TVContentMapping {
@@ -139,6 +140,7 @@ export default function GalleryPage() {
             : undefined;
         const data = (await galleryImagesApi.list(pageNum, 50, {
           tags: tagsParam,
+          includeTags: true,
         })) as GalleryResponse;
 
         if (append) {
@@ -152,32 +154,14 @@ export default function GalleryPage() {
         setPage(pageNum);
         pageRef.current = pageNum;
 
-        // Load tags for each image using functional update
-        // First, prepare the tag map structure
-        setImageTags((prevTags) => {
-          const newImageTags = append
-            ? new Map(prevTags)
-            : new Map<number, Tag[]>();
-          return newImageTags;
-        });
-
-        // Load tags asynchronously and update state
-        const tagPromises = data.items.map(async (image) => {
-          try {
-            const tags = await galleryImagesApi.getTags(image.id);
-            return { imageId: image.id, tags };
-          } catch {
-            return { imageId: image.id, tags: [] };
-          }
-        });
-
-        const tagResults = await Promise.all(tagPromises);
+        // Tags for the whole page arrive with the listing in one batch query
+        const pageTags = data.item_tags ?? {};
         setImageTags((prevTags) => {
           const newTags = append ? new Map(prevTags) : new Map<number, Tag[]>();
-          tagResults.forEach(({ imageId, tags }) => {
+          data.items.forEach((image) => {
             // Only update if we don't already have tags for this image (when appending)
-            if (!append || !newTags.has(imageId)) {
-              newTags.set(imageId, tags);
+            if (!append || !newTags.has(image.id)) {
+              newTags.set(image.id, pageTags[image.id] ?? []);
             }
           });
           return newTags;
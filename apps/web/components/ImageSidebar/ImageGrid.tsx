@@ -97,7 +97,7 @@ export function ImageGrid({ containerWidth }: ImageGridProps) {
       if (result.items.length > 0) {
         addImages(result.items);
         setCurrentPage(result.page);
-        setHasMore(result.page < result.pages);
+        setHasMore(result.has_more);
       } else {
         setHasMore(false);
       }
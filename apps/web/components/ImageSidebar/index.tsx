@@ -115,7 +115,7 @@ function SidebarHeader() {
         });
 
         setImages(result.items);
-        setHasMore(result.page < result.pages);
+        setHasMore(result.has_more);
         setCurrentPage(result.page);
         setScrollPosition(0); // Reset scroll to top
       } catch (error) {
@@ -343,14 +343,13 @@ function SidebarContent({ width }: { width: number }) {
         console.log("[ImageSidebar] Fetch successful:", {
           itemCount: result.items.length,
           page: result.page,
-          pages: result.pages,
-          total: result.total,
+          hasMore: result.has_more,
         });
 
         // Only update state if this effect instance is still valid
         if (!isCancelled) {
           setImages(result.items);
-          setHasMore(result.page < result.pages);
+          setHasMore(result.has_more);
           setCurrentPage(result.page);
           setScrollPosition(0); // Reset scroll to top when filters change
         }
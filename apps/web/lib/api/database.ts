@@ -85,9 +85,26 @@ export interface SourceImageResponse {
  */
 export interface PaginatedSourceImages {
   items: SourceImageResponse[];
-  total: number;
+  // total and pages are only returned with includeTotal
+  total?: number | null;
   page: number;
-  pages: number;
+  pages?: number | null;
+  has_more: boolean;
+  next_cursor?: string | null;
+  item_tags?: Record<number, Tag[]> | null;
+}
+
+/**
+ * Background album scan status
+ */
+export interface ScanStatus {
+  scan_id: string;
+  state: "running" | "completed" | "failed";
+  scanned: number;
+  added: number;
+  updated: number;
+  deleted: number;
+  error?: string | null;
 }
 
 /**
@@ -102,6 +119,9 @@ export const sourceImagesApi = {
     sortBy?: "date_taken" | "filename" | "created_at";
     used?: boolean;
     tags?: string;
+    cursor?: string;
+    includeTags?: boolean;
+    includeTotal?: boolean;
   } = {}): Promise<PaginatedSourceImages> => {
     const searchParams = new URLSearchParams();
     searchParams.set("page", String(params.page ?? 1));
@@ -111,6 +131,9 @@ export const sourceImagesApi = {
     if (params.sortBy) searchParams.set("sort_by", params.sortBy);
     if (params.used !== undefined) searchParams.set("used", String(params.used));
     if (params.tags) searchParams.set("tags", params.tags);
+    if (params.cursor) searchParams.set("cursor", params.cursor);
+    if (params.includeTags) searchParams.set("include_tags", "true");
+    if (params.includeTotal) searchParams.set("include_total", "true");
     return apiFetch<PaginatedSourceImages>(`/source-images?${searchParams.toString()}`);
   },
   get: async (id: number): Promise<SourceImageResponse> => {
@@ -124,15 +147,19 @@ export const sourceImagesApi = {
   },
   update: async (id: number, data: any) => {
     return apiFetch(`/source-images/${id}`, {
-      method: "PUT",
+      method: "PATCH",
       body: JSON.stringify(data),
     });
   },
-  scan: async () => {
+  // Starts a background scan; poll getScanStatus with the returned scan_id
+  scan: async (): Promise<ScanStatus> => {
     return apiFetch(`/source-images/scan`, {
       method: "POST",
     });
   },
+  getScanStatus: async (scanId: string): Promise<ScanStatus> => {
+    return apiFetch(`/source-images/scan/${scanId}`);
+  },
   recalculateUsageCounts: async () => {
     return apiFetch<{ success: boolean; total_images: number; updated_count: number; negative_counts_corrected: number }>(
       `/source-images/recalculate-usage`,
@@ -164,9 +191,11 @@ export const sourceImagesApi = {
  * Gallery Images API
  */
 export const galleryImagesApi = {
-  list: async (page: number = 1, limit: number = 50, options?: { tags?: string }) => {
+  list: async (page: number = 1, limit: number = 50, options?: { tags?: string; cursor?: number; includeTags?: boolean }) => {
     const params = new URLSearchParams({ page: String(page), limit: String(limit) });
     if (options?.tags) params.set("tags", options.tags);
+    if (options?.cursor !== undefined) params.set("cursor", String(options.cursor));
+    if (options?.includeTags) params.set("include_tags", "true");
     return apiFetch(`/gallery-images?${params.toString()}`);
   },
   get: async (id: number) => {
@@ -190,10 +219,22 @@ export const galleryImagesApi = {
     });
   },
   deleteMultiple: async (ids: number[]): Promise<{ deleted: number; failed: number; errors: string[] }> => {
-    return apiFetch(`/gallery-images/delete-multiple`, {
-      method: "POST",
-      body: JSON.stringify({ ids }),
-    });
+    // The endpoint accepts at most MAX_DELETE_BATCH ids per request
+    const MAX_DELETE_BATCH = 1000;
+    const result = { deleted: 0, failed: 0, errors: [] as string[] };
+    for (let start = 0; start < ids.length; start += MAX_DELETE_BATCH) {
+      const batch: { deleted: number; failed: number; errors: string[] } = await apiFetch(
+        `/gallery-images/delete-multiple`,
+        {
+          method: "POST",
+          body: JSON.stringify({ ids: ids.slice(start, start + MAX_DELETE_BATCH) }),
+        }
+      );
+      result.deleted += batch.deleted;
+      result.failed += batch.failed;
+      result.errors.push(...batch.errors);
+    }
+    return result;
   },
   // Tag methods
   getTags: async (id: number): Promise<Tag[]> => {
@@ -236,7 +277,7 @@ export const tvContentApi = {
   },
   update: async (id: number, data: any) => {
     return apiFetch(`/tv-content/${id}`, {
-      method: "PUT",
+      method: "PATCH",
       body: JSON.stringify(data),
     });
   },
@@ -42,14 +42,18 @@ export interface paths {
         get: operations["get_source_image_source_images__id__get"];
         /**
          * Update Source Image
-         * @description Update a source image.
+         * @description Update a source image. Only the fields present in the body are changed.
          */
         put: operations["update_source_image_source_images__id__put"];
         post?: never;
         delete?: never;
         options?: never;
         head?: never;
-        patch?: never;
+        /**
+         * Update Source Image
+         * @description Update a source image. Only the fields present in the body are changed.
+         */
+        patch: operations["update_source_image_source_images__id__patch"];
         trace?: never;
     };
     "/source-images/recalculate-usage": {
@@ -127,7 +131,9 @@ export interface paths {
         put?: never;
         /**
          * Trigger Scan
-         * @description Trigger album directory scan.
+         * @description Start an album directory scan in the background.
+         *     Poll GET /source-images/scan/{scan_id} for progress. While a scan is
+         *     running, the running scan's status is returned instead of starting another.
          */
         post: operations["trigger_scan_source_images_scan_post"];
         delete?: never;
@@ -136,6 +142,26 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/source-images/scan/{scan_id}": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get Scan Status
+         * @description Get the progress or result of an album scan.
+         */
+        get: operations["get_scan_status_source_images_scan__scan_id__get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/gallery-images": {
         parameters: {
             query?: never;
@@ -281,7 +307,11 @@ export interface paths {
         delete: operations["delete_tv_content_tv_content__id__delete"];
         options?: never;
         head?: never;
-        patch?: never;
+        /**
+         * Update Tv Content
+         * @description Update a TV content mapping.
+         */
+        patch: operations["update_tv_content_tv_content__id__patch"];
         trace?: never;
     };
     "/tv-content/by-tv-id/{tv_content_id}": {
@@ -626,18 +656,36 @@ export interface components {
             negative_counts_corrected: number;
         };
         /**
-         * ScanResponse
-         * @description Response model for scan operation.
+         * ScanStatus
+         * @description Status of a background album scan; counts grow while it runs.
          */
-        ScanResponse: {
-            /** Scanned */
+        ScanStatus: {
+            /** Scan Id */
+            scan_id: string;
+            /** State */
+            state: string;
+            /**
+             * Scanned
+             * @default 0
+             */
             scanned: number;
-            /** Added */
+            /**
+             * Added
+             * @default 0
+             */
             added: number;
-            /** Updated */
+            /**
+             * Updated
+             * @default 0
+             */
             updated: number;
-            /** Deleted */
+            /**
+             * Deleted
+             * @default 0
+             */
             deleted: number;
+            /** Error */
+            error?: string | null;
         };
         /**
          * SettingValue
@@ -714,6 +762,24 @@ export interface components {
              */
             updated_at?: string;
         };
+        /**
+         * SourceImageUpdate
+         * @description Input model for updating source images; only fields sent are written.
+         */
+        SourceImageUpdate: {
+            /** Filename */
+            filename?: string | null;
+            /** Filepath */
+            filepath?: string | null;
+            /** Date Taken */
+            date_taken?: string | null;
+            /** Is Deleted */
+            is_deleted?: boolean | null;
+            /** Exif Metadata */
+            exif_metadata?: {
+                [key: string]: unknown;
+            } | null;
+        };
         /**
          * SourceImageResponse
          * @description Source image response model with computed is_used field.
@@ -831,6 +897,12 @@ export interface components {
             page: number;
             /** Pages */
             pages: number;
+            /** Next Cursor */
+            next_cursor?: number | null;
+            /** Item Tags */
+            item_tags?: {
+                [key: string]: components["schemas"]["Tag"][];
+            } | null;
         };
         /**
          * PaginatedResponse
@@ -840,11 +912,22 @@ export interface components {
             /** Items */
             items: components["schemas"]["SourceImageResponse"][];
             /** Total */
-            total: number;
+            total?: number | null;
             /** Page */
             page: number;
             /** Pages */
-            pages: number;
+            pages?: number | null;
+            /**
+             * Has More
+             * @default false
+             */
+            has_more: boolean;
+            /** Next Cursor */
+            next_cursor?: string | null;
+            /** Item Tags */
+            item_tags?: {
+                [key: string]: components["schemas"]["Tag"][];
+            } | null;
         };
         /**
          * PaginatedResponse
@@ -878,6 +961,12 @@ export interface operations {
                 used?: boolean | null;
                 /** @description Comma-separated list of tag names to filter by */
                 tags?: string | null;
+                /** @description Keyset pagination: next_cursor of the previous page (same filters and sort); replaces page */
+                cursor?: string | null;
+                /** @description Also return each item's tags in item_tags (one batch query) */
+                include_tags?: boolean;
+                /** @description Also return total and pages (may cost a COUNT query); use has_more to page otherwise */
+                include_total?: boolean;
             };
             header?: never;
             path?: never;
@@ -980,7 +1069,42 @@ export interface operations {
         };
         requestBody: {
             content: {
-                "application/json": components["schemas"]["SourceImage"];
+                "application/json": components["schemas"]["SourceImageUpdate"];
+            };
+        };
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["SourceImage"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    update_source_image_source_images__id__patch: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path: {
+                id: number;
+            };
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["SourceImageUpdate"];
             };
         };
         responses: {
@@ -1128,6 +1252,28 @@ export interface operations {
             cookie?: never;
         };
         requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            202: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["ScanStatus"];
+                };
+            };
+        };
+    };
+    get_scan_status_source_images_scan__scan_id__get: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path: {
+                scan_id: string;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
         responses: {
             /** @description Successful Response */
             200: {
@@ -1135,7 +1281,16 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["ScanResponse"];
+                    "application/json": components["schemas"]["ScanStatus"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
                 };
             };
         };
@@ -1147,6 +1302,10 @@ export interface operations {
                 limit?: number;
                 /** @description Comma-separated list of tag names to filter by */
                 tags?: string | null;
+                /** @description Keyset pagination: return images after this id (next_cursor of the previous page); replaces page */
+                cursor?: number | null;
+                /** @description Also return each item's tags in item_tags (one batch query) */
+                include_tags?: boolean;
             };
             header?: never;
             path?: never;
@@ -1529,6 +1688,41 @@ export interface operations {
             };
         };
     };
+    update_tv_content_tv_content__id__patch: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path: {
+                id: number;
+            };
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["TVContentMapping"];
+            };
+        };
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["TVContentMapping"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     delete_tv_content_tv_content__id__delete: {
         parameters: {
             query?: never;